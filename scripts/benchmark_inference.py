@@ -0,0 +1,162 @@
+"""
+Сравнение скорости YOLO (ONNX) на cv2.dnn и ONNX Runtime.
+
+    python scripts/benchmark_inference.py [--model resources/best.onnx] [--video видео.mp4]
+                                          [--threads 1,2,4] [--quantize]
+
+Для каждого runtime, варианта весов (fp32 и лежащие рядом best.fp16.onnx,
+best.int8.onnx) и числа потоков измеряются три режима детектора:
+весь кадр, окно вокруг объекта (ROI) и пачка кадров. Колонка "IoU" -
+совпадение лучшей детекции с cv2.dnn на fp32 (насколько квантование
+меняет результат).
+
+С --quantize варианты весов сначала создаются: INT8 - динамическим
+квантованием onnxruntime, FP16 - через onnxconverter-common (если установлен).
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import get_resource_path
+from src.cv.onnx_detector import (PRECISIONS, RUNTIME_ONNXRUNTIME, RUNTIMES, ONNXTracker, bbox_iou_many,
+                                  model_variant, ort)
+
+# Кадров на режим (после прогрева)
+DEFAULT_FRAMES = 50
+WARMUP_FRAMES = 3
+BATCH_SIZE = 8
+
+
+def quantize(model_path: Path):
+    """best.int8.onnx и best.fp16.onnx рядом с моделью"""
+    int8_path = model_path.with_suffix(".int8.onnx")
+    if ort is None:
+        print("onnxruntime не установлен: INT8 пропущен")
+    else:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(str(model_path), str(int8_path), weight_type=QuantType.QUInt8)
+        print(f"INT8: {int8_path}")
+
+    try:
+        import onnx
+        from onnxconverter_common import float16
+    except ImportError:
+        print("onnx / onnxconverter-common не установлены: FP16 пропущен")
+        return
+    fp16_path = model_path.with_suffix(".fp16.onnx")
+    # Вход и выход остаются float32: детектор подает тот же blob
+    model = float16.convert_float_to_float16(onnx.load(str(model_path)), keep_io_types=True)
+    onnx.save(model, str(fp16_path))
+    print(f"FP16: {fp16_path}")
+
+
+def load_frames(video_path, count: int):
+    if not video_path:
+        rng = np.random.default_rng(0)
+        return [rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8) for _ in range(count)]
+    cap = cv2.VideoCapture(str(video_path))
+    frames = []
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def measure(detector: ONNXTracker, frames):
+    """мс на кадр: весь кадр, ROI, пачка; лучшие детекции по кадрам"""
+    h, w = frames[0].shape[:2]
+    side = min(h, w, 320)
+    roi = ((w - side) // 2, (h - side) // 2, side, side)
+    for frame in frames[:WARMUP_FRAMES]:
+        detector.detect_all(frame)
+        detector.detect_roi(frame, roi)
+
+    started = time.perf_counter()
+    top = []
+    for frame in frames:
+        boxes, _ = detector.detect_all(frame)
+        top.append(boxes[0] if len(boxes) else None)
+    full = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for frame in frames:
+        detector.detect_roi(frame, roi)
+    roi_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(0, len(frames), BATCH_SIZE):
+        detector.detect_batch(frames[i:i + BATCH_SIZE])
+    batch = time.perf_counter() - started
+
+    n = len(frames) / 1000
+    return (full / n, roi_time / n, batch / n), top
+
+
+def agreement(top, reference) -> float:
+    values = []
+    for box, ref in zip(top, reference):
+        if box is None or ref is None:
+            values.append(float(box is None and ref is None))
+        else:
+            values.append(float(bbox_iou_many(ref, box[None])[0]))
+    return float(np.mean(values)) if values else 0.0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Скорость YOLO: cv2.dnn против ONNX Runtime")
+    parser.add_argument("--model", default=str(get_resource_path("best.onnx")), help="ONNX-модель")
+    parser.add_argument("--video", default=None, help="кадры из видео (по умолчанию - шум 1280x720)")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="кадров на режим")
+    parser.add_argument("--threads", default="0",
+                        help="потоков ONNX Runtime через запятую, например 1,2,4 (0 - как у OpenCV)")
+    parser.add_argument("--quantize", action="store_true", help="создать варианты весов INT8 и FP16")
+    args = parser.parse_args(argv)
+
+    model_path = Path(args.model)
+    if not model_path.exists():
+        parser.error(f"модель не найдена: {model_path}")
+    if args.quantize:
+        quantize(model_path)
+
+    frames = load_frames(args.video, args.frames)
+    if not frames:
+        parser.error("не удалось прочитать кадры")
+    threads = [int(t) for t in args.threads.split(",")]
+
+    print(f"{'runtime':<12}{'веса':<6}{'потоки':>7}{'кадр, мс':>10}{'ROI, мс':>9}{'пачка, мс':>11}{'IoU':>6}")
+    reference = None
+    for runtime in RUNTIMES:
+        if runtime == RUNTIME_ONNXRUNTIME and ort is None:
+            print("onnxruntime не установлен")
+            continue
+        for precision in PRECISIONS:
+            path = model_variant(model_path, precision)
+            if precision != "fp32" and path == str(model_path):
+                continue
+            # Потоки cv2.dnn задаются только для всего OpenCV, поэтому для него - один замер
+            for thread_count in (threads if runtime == RUNTIME_ONNXRUNTIME else [0]):
+                try:
+                    detector = ONNXTracker(path, runtime=runtime, threads=thread_count)
+                    times, top = measure(detector, frames)
+                except Exception as e:
+                    print(f"{runtime:<12}{precision:<6}{thread_count:>7}  ошибка: {e}")
+                    continue
+                if reference is None:
+                    reference = top
+                shown = thread_count or cv2.getNumThreads()
+                print(f"{runtime:<12}{precision:<6}{shown:>7}"
+                      f"{times[0]:>10.1f}{times[1]:>9.1f}{times[2]:>11.1f}{agreement(top, reference):>6.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
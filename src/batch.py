@@ -0,0 +1,212 @@
+"""
+Пакетный трекинг проекта без интерфейса.
+
+    python -m src.batch <папка проекта> [--model yolo|csrt|kcf|...] [--bbox x,y,w,h]
+                        [--video имя.mp4 ...] [--overwrite] [--workers N]
+
+С --workers видео распределяются по процессам через очередь заданий
+в .morris/jobs; повторный запуск после сбоя продолжает незавершенные.
+С --animals N трекается N животных (YOLO), каждое - отдельным треком.
+С --chunks N каждое видео делится на N кусков, которые трекаются параллельно
+(для длинных видео с одним животным).
+С --motion-gate кадры, на которых животное не двигается, не идут в трекер.
+С --runtime onnxruntime YOLO выполняется в ONNX Runtime (--threads потоков),
+с --precision int8|fp16 - на облегченных весах, если они лежат рядом с моделью.
+"""
+import argparse
+import sys
+
+from src.core.project import Project
+from src.core.tracker import DEFAULT_BATCH_SIZE
+from src.cv.motion_gate import MOTION_THRESHOLD
+from src.cv.onnx_detector import PRECISIONS, RUNTIMES
+from src.cv.tracker_registry import available_backends
+from src.services.batch_tracking_service import BatchTrackingService
+from src.services.tracking_scheduler import TrackingJob, TrackingScheduler
+
+
+def parse_bbox(value: str) -> tuple:
+    try:
+        bbox = tuple(int(float(v)) for v in value.split(","))
+    except ValueError:
+        bbox = ()
+    if len(bbox) != 4 or bbox[2] <= 0 or bbox[3] <= 0:
+        raise argparse.ArgumentTypeError("ожидается x,y,w,h")
+    return bbox
+
+
+def print_progress(video_name: str, frame_idx: int, total_frames: int):
+    print(f"\r  {video_name}: {frame_idx}/{total_frames}", end="", flush=True)
+
+
+def print_chunk(chunk_idx: int, chunks: int, data: dict):
+    if data:
+        print(f"  кусок {chunk_idx + 1}/{chunks}: кадры {min(data)}-{max(data)}")
+    else:
+        print(f"  кусок {chunk_idx + 1}/{chunks}: объект не найден")
+
+
+def format_segments(segments, limit: int = 10) -> str:
+    """Первые limit отрезков кадров, например: 10-24, 80-95 и еще 3"""
+    text = ", ".join(f"{start}-{end}" for start, end in segments[:limit])
+    more = len(segments) - limit
+    return text + (f" и еще {more}" if more > 0 else "")
+
+
+def print_job(job: TrackingJob):
+    if job.status == TrackingJob.RUNNING:
+        print(f"  {job.video_name}: {job.frame}/{job.total_frames}, {job.fps:.1f} кадр/с")
+    elif job.status == TrackingJob.DONE:
+        line = f"  {job.video_name}: готово, {job.frame + 1}/{job.total_frames} кадров, {job.fps:.1f} кадр/с"
+        if job.lost_at is not None:
+            line += f", объект потерян на кадре {job.lost_at}"
+        if job.low_confidence:
+            line += f", участков с низкой уверенностью: {len(job.low_confidence)}"
+        print(line)
+    elif job.status == TrackingJob.SKIPPED:
+        print(f"  {job.video_name}: пропущено (уже размечено)")
+    elif job.status == TrackingJob.FAILED:
+        print(f"  {job.video_name}: ошибка: {job.error}")
+
+
+def motion_threshold(args):
+    """--motion-gate включает MotionGate с порогом по умолчанию, иначе - из настроек проекта"""
+    return MOTION_THRESHOLD if args.motion_gate else None
+
+
+def inference(project: Project, args) -> tuple:
+    """Настройки прохода сети YOLO из проекта; заданные в командной строке - важнее"""
+    runtime, threads, precision = project.inference
+    return (args.runtime or runtime, threads if args.threads is None else args.threads,
+            args.precision or precision)
+
+
+def run_scheduled(project: Project, args) -> int:
+    scheduler = TrackingScheduler(
+        project,
+        workers=args.workers,
+        model_type=args.model,
+        model_path=args.model_path,
+        seed_bbox=args.bbox,
+        overwrite=args.overwrite,
+        batch_size=args.batch_size,
+        use_roi=not args.full_frame,
+        scale=args.scale,
+        max_side=args.max_side,
+        max_gap=args.fill_gaps,
+        motion_threshold=motion_threshold(args),
+        inference=inference(project, args),
+    )
+    scheduler.enqueue(args.videos)
+    jobs = scheduler.run(print_job)
+    return 1 if any(job.status == TrackingJob.FAILED for job in jobs) else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Пакетный трекинг всех видео проекта")
+    parser.add_argument("project", help="папка проекта")
+    parser.add_argument("--model", default="yolo", choices=[b.name for b in available_backends()],
+                        help="трекер (по умолчанию yolo)")
+    parser.add_argument("--model-path", default=None, help="путь к ONNX-модели")
+    parser.add_argument("--bbox", type=parse_bbox, default=None,
+                        help="начальный bbox на первом кадре: x,y,w,h")
+    parser.add_argument("--video", action="append", dest="videos",
+                        help="обработать только это видео (можно несколько раз)")
+    parser.add_argument("--overwrite", action="store_true",
+                        help="перетрекать видео, уже отмеченные как размеченные")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="число процессов (0 - по числу ядер)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"кадров за один проход YOLO (по умолчанию {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--full-frame", action="store_true",
+                        help="YOLO: искать по всему кадру (пачками), а не в окне вокруг прошлого bbox")
+    parser.add_argument("--scale", type=float, default=None,
+                        help="масштаб кадра для трекера, например 0.5 (по умолчанию - из настроек проекта)")
+    parser.add_argument("--max-side", type=int, default=None,
+                        help="уменьшать кадр для трекера до длинной стороны N px")
+    parser.add_argument("--fill-gaps", type=int, default=None, metavar="N",
+                        help="заполнять пропуски трека до N кадров интерполяцией (0 - нет; "
+                             "по умолчанию - из настроек проекта)")
+    parser.add_argument("--motion-gate", action="store_true",
+                        help="не вызывать трекер на кадрах, где в окне объекта нет движения")
+    parser.add_argument("--runtime", default=None, choices=RUNTIMES,
+                        help="YOLO: чем выполнять сеть - cv2.dnn или onnxruntime (по умолчанию - из настроек проекта)")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="YOLO (onnxruntime): потоков на проход сети (0 - как у OpenCV)")
+    parser.add_argument("--precision", default=None, choices=PRECISIONS,
+                        help="YOLO: веса fp16/int8 (best.fp16.onnx, best.int8.onnx рядом с моделью), если есть")
+    parser.add_argument("--animals", type=int, default=None,
+                        help="трекать N животных одной детекцией YOLO (каждое - свой трек в .mor)")
+    parser.add_argument("--chunks", type=int, default=None,
+                        help="трекать каждое видео параллельно по N кускам")
+    args = parser.parse_args(argv)
+    if args.scale is not None and not 0 < args.scale <= 1:
+        parser.error("--scale: ожидается число от 0 до 1")
+    if args.fill_gaps is not None and args.fill_gaps < 0:
+        parser.error("--fill-gaps: ожидается N >= 0")
+    if args.threads is not None and args.threads < 0:
+        parser.error("--threads: ожидается N >= 0")
+
+    if args.animals is not None and (args.animals < 1 or args.chunks or args.workers is not None):
+        parser.error("--animals: ожидается N >= 1, без --chunks и --workers")
+
+    project = Project(args.project)
+    if args.workers is not None and not args.chunks:
+        return run_scheduled(project, args)
+
+    service = BatchTrackingService(
+        project,
+        model_type=args.model,
+        model_path=args.model_path,
+        seed_bbox=args.bbox,
+        overwrite=args.overwrite,
+        batch_size=args.batch_size,
+        use_roi=not args.full_frame,
+        scale=args.scale,
+        max_side=args.max_side,
+        max_gap=args.fill_gaps,
+        motion_threshold=motion_threshold(args),
+        inference=inference(project, args),
+        progress_callback=print_progress,
+    )
+
+    failed = 0
+    for video in project.videos:
+        if args.videos and video.path.name not in args.videos:
+            continue
+
+        print(f"{video.path.name}...")
+        if args.animals:
+            result = service.track_video_multi(video, args.animals, [args.bbox] if args.bbox else None)
+        elif args.chunks:
+            result = service.track_video_chunked(video, args.chunks, args.workers, print_chunk)
+        else:
+            result = service.track_video(video)
+        print("\r" + " " * 60 + "\r", end="")
+
+        if result.skipped:
+            print("  пропущено (уже размечено)")
+        elif result.error:
+            failed += 1
+            print(f"  ошибка: {result.error}")
+        else:
+            status = "готово" if result.is_finished else "частично"
+            line = (f"  {status}: {result.tracked_frames}/{result.total_frames} кадров, "
+                    f"{result.fps:.1f} кадр/с")
+            if result.lost_at is not None:
+                line += f", объект потерян на кадре {result.lost_at}"
+            print(line)
+            if result.low_confidence and not result.tracks:
+                print(f"    низкая уверенность: {format_segments(result.low_confidence)}")
+            for name, frames in result.tracks.items():
+                line = f"    {name}: {frames} кадров"
+                segments = result.tracks_low_confidence.get(name)
+                if segments:
+                    line += f", низкая уверенность: {format_segments(segments)}"
+                print(line)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1 @@
-from src.core.video import Video, VideoExtension
+from src.core.video import Video, VideoExtension, VideoInfo, VideoReaderPool, KeyframeIndex, reader_pool
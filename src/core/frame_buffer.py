@@ -0,0 +1,325 @@
+import collections
+import threading
+from typing import Callable, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.core.video import KeyframeIndex
+
+
+class FrameCache:
+    """
+    LRU-кеш декодированных кадров вокруг текущей позиции.
+    Ограничен и количеством кадров, и объемом памяти.
+    Кадры в кеше не изменяются после добавления.
+    """
+
+    def __init__(self, max_frames: int = 32, max_bytes: int = 256 * 1024 * 1024):
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self._frames = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, frame_index: int) -> Optional[np.ndarray]:
+        with self._lock:
+            frame = self._frames.get(frame_index)
+            if frame is not None:
+                self._frames.move_to_end(frame_index)
+            return frame
+
+    def put(self, frame_index: int, frame: np.ndarray):
+        with self._lock:
+            old = self._frames.pop(frame_index, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._frames[frame_index] = frame
+            self._bytes += frame.nbytes
+
+            while self._frames and (len(self._frames) > self.max_frames or self._bytes > self.max_bytes):
+                _, evicted = self._frames.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def __contains__(self, frame_index: int) -> bool:
+        with self._lock:
+            return frame_index in self._frames
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+
+
+class DecodeAheadReader:
+    """
+    Декодирует кадры в отдельном потоке заранее, в кольцевой буфер.
+
+    Буфер состоит из capacity заранее выделенных кадров; декодер пишет
+    прямо в них (cap.read(image=...)), поэтому при воспроизведении
+    не выделяется память под каждый кадр.
+    Потребитель (VideoThread) забирает кадры через read(). Кадр,
+    выданный read(), принадлежит потребителю до следующего вызова read().
+
+    Все обращения к захвату (чтение, перемотка) идут через поток декодера.
+    seek() не блокирует: позиционирование выполняет декодер. Если задан
+    индекс ключевых кадров, перемотка точная: захват ставится на ключевой
+    кадр и декодирует вперед до нужного, а перемотка вперед в пределах
+    текущей группы кадров вообще обходится без позиционирования.
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, capacity: int = 8,
+                 frame_shape: Optional[Tuple[int, int, int]] = None):
+        self._cap = cap
+        self._capacity = max(2, capacity)
+        self._keyframes: Optional[KeyframeIndex] = None
+
+        if frame_shape and frame_shape[0] > 0 and frame_shape[1] > 0:
+            self._frames = [np.empty(frame_shape, dtype=np.uint8) for _ in range(self._capacity)]
+        else:
+            # Размер неизвестен - буферы создаст первый cap.read()
+            self._frames = [None] * self._capacity
+
+        self._free = collections.deque(range(self._capacity))
+        self._ready = collections.deque()  # (slot | None, frame_idx), None = конец файла
+        self._held = None
+        self._cond = threading.Condition()
+
+        # Позиция, с которой будет читать потребитель, и "поколение" буфера:
+        # каждое seek() увеличивает поколение, кадры старого поколения выбрасываются
+        self._next_index = max(0, int(cap.get(cv2.CAP_PROP_POS_FRAMES)))
+        self._generation = 0
+        self._seek_target = None
+        self._range_job = None
+
+        # Состояние захвата (меняется только потоком декодера)
+        self._decode_pos = self._next_index
+
+        self._producer_eof = False
+        self._running = False
+        self._thread = None
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def buffered_count(self) -> int:
+        with self._cond:
+            return sum(1 for slot, _ in self._ready if slot is not None)
+
+    def set_keyframe_index(self, index: Optional[KeyframeIndex]):
+        self._keyframes = index
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="DecodeAheadReader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def read(self) -> Tuple[bool, int, Optional[np.ndarray]]:
+        """
+        Следующий кадр из буфера.
+        :return: (success, frame_idx, frame). success=False - конец файла или остановка.
+        """
+        with self._cond:
+            self._release_held_locked()
+
+            while not self._ready:
+                if not self._running or (self._producer_eof and self._seek_target is None):
+                    return False, self._next_index, None
+                self._cond.wait()
+
+            slot, frame_idx = self._ready.popleft()
+            self._cond.notify_all()
+
+            if slot is None:
+                return False, frame_idx, None
+
+            self._held = slot
+            self._next_index = frame_idx + 1
+            return True, frame_idx, self._frames[slot]
+
+    def read_batch(self, count: int) -> List[Tuple[int, np.ndarray]]:
+        """
+        До count следующих кадров подряд (меньше - в конце файла).
+        Кадры - отдельные массивы: их можно держать всю пачку.
+        """
+        batch = []
+        while len(batch) < count:
+            ret, frame_idx, frame = self.read()
+            if not ret:
+                break
+            batch.append((frame_idx, frame.copy()))
+        return batch
+
+    def decode_range(self, start: int, end: int) -> List[Tuple[int, np.ndarray]]:
+        """
+        Синхронно декодирует кадры [start, end] одним проходом вперед
+        (для воспроизведения назад). Кадры - отдельные массивы, их можно хранить.
+        После вызова буфер продолжает заполняться с кадра end + 1.
+        """
+        with self._cond:
+            job = self._submit_range_locked(start, end, None)
+            while job["frames"] is None and self._running:
+                self._cond.wait()
+        return job["frames"] or []
+
+    def decode_range_async(self, start: int, end: int,
+                           callback: Callable[[List[Tuple[int, np.ndarray]]], None]):
+        """
+        То же, что decode_range(), но без ожидания: задание ставится в очередь
+        декодера, а callback(frames) вызывается из потока декодера, когда все
+        кадры готовы. Если задание отменила перемотка, callback не вызывается.
+        """
+        with self._cond:
+            self._submit_range_locked(start, end, callback)
+
+    def seek(self, frame_index: int):
+        """Сбрасывает буфер; следующий read() вернет кадр frame_index"""
+        frame_index = max(0, int(frame_index))
+        with self._cond:
+            self._drop_ready_locked()
+            self._generation += 1
+            self._seek_target = frame_index
+            if self._range_job is not None:
+                # Незапущенное задание отменяется
+                self._range_job["frames"] = []
+                self._range_job = None
+            self._next_index = frame_index
+            self._producer_eof = False
+            self._cond.notify_all()
+
+    # --- Поток декодера ---
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while (self._running and self._seek_target is None and self._range_job is None
+                       and (not self._free or self._producer_eof)):
+                    self._cond.wait()
+                if not self._running:
+                    return
+
+                job = self._range_job
+                self._range_job = None
+                generation = self._generation
+                target = self._seek_target
+                self._seek_target = None
+
+                if target is None and job is None:
+                    slot = self._free.popleft()
+                else:
+                    slot = None
+
+            if job is not None:
+                self._decode_job(job, generation)
+                continue
+
+            if target is not None:
+                self._position(target, generation)
+                continue
+
+            buf = self._frames[slot]
+            if buf is not None:
+                ret, frame = self._cap.read(buf)
+            else:
+                ret, frame = self._cap.read()
+            frame_idx = self._decode_pos
+            if ret:
+                self._decode_pos += 1
+
+            with self._cond:
+                if generation != self._generation:
+                    # Пока декодировали, произошла перемотка
+                    self._free.append(slot)
+                elif ret:
+                    # read() мог выделить новый массив (другое разрешение)
+                    self._frames[slot] = frame
+                    self._ready.append((slot, frame_idx))
+                else:
+                    self._free.append(slot)
+                    self._ready.append((None, frame_idx))
+                    self._producer_eof = True
+                self._cond.notify_all()
+
+    def _decode_job(self, job: dict, generation: int):
+        frames = []
+        self._position(job["start"], generation)
+        while self._decode_pos <= job["end"] and generation == self._generation:
+            ret, frame = self._cap.read()
+            if not ret:
+                break
+            frames.append((self._decode_pos, frame))
+            self._decode_pos += 1
+
+        with self._cond:
+            job["frames"] = frames
+            completed = generation == self._generation
+            self._cond.notify_all()
+
+        if job["callback"] is not None and completed:
+            job["callback"](frames)
+
+    def _position(self, target: int, generation: int):
+        """Ставит захват так, чтобы следующий read() вернул кадр target"""
+        if target == self._decode_pos:
+            return
+
+        index = self._keyframes
+        if index is None:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            self._decode_pos = target
+            return
+
+        keyframe = index.keyframe_before(target)
+        if not (keyframe <= self._decode_pos < target):
+            # Цель в другой группе кадров (или позади) - встаем на ключевой кадр
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, keyframe)
+            self._decode_pos = keyframe
+
+        # Доходим до цели без выдачи кадров (grab без retrieve)
+        while self._decode_pos < target:
+            if generation != self._generation:
+                # Пришла новая перемотка - дальше идти незачем
+                return
+            if not self._cap.grab():
+                break
+            self._decode_pos += 1
+
+    # --- Внутреннее (вызывается под self._cond) ---
+
+    def _submit_range_locked(self, start: int, end: int, callback) -> dict:
+        job = {"start": max(0, int(start)), "end": int(end), "frames": None, "callback": callback}
+        self._drop_ready_locked()
+        self._generation += 1
+        self._seek_target = None
+        if self._range_job is not None:
+            # Незапущенное задание заменяется новым
+            self._range_job["frames"] = []
+        self._range_job = job
+        self._next_index = job["end"] + 1
+        self._producer_eof = False
+        self._cond.notify_all()
+        return job
+
+    def _release_held_locked(self):
+        if self._held is not None:
+            self._free.append(self._held)
+            self._held = None
+            self._cond.notify_all()
+
+    def _drop_ready_locked(self):
+        for slot, _ in self._ready:
+            if slot is not None:
+                self._free.append(slot)
+        self._ready.clear()
@@ -1,6 +1,8 @@
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import bisect
 
+import numpy as np
+
 # Тип данных для прямоугольника: (x, y, w, h)
 Rect = Tuple[float, float, float, float]
 
@@ -50,6 +52,94 @@ class FrameSequence:
                 return block.rects[frame_index - block.start_frame]
         return None
 
+    @classmethod
+    def from_dict(cls, data: Dict[int, Rect]) -> "FrameSequence":
+        """{кадр: rect} -> непрерывные блоки"""
+        sequence = cls()
+        frames = sorted(data)
+        start = 0
+        for i in range(1, len(frames) + 1):
+            if i == len(frames) or frames[i] != frames[i - 1] + 1:
+                sequence._blocks.append(FrameBlock(frames[start], [data[f] for f in frames[start:i]]))
+                start = i
+        return sequence
+
+    def fill_gaps(self, max_gap: int, method: str = "linear") -> "FrameSequence":
+        """
+        Кадры в пропусках между блоками длиной не больше max_gap.
+        Возвращает только интерполированные кадры (отдельной последовательностью,
+        чтобы они не сливались с настоящими).
+        :param method: "linear" или "cubic" (кубический Эрмит, касательные -
+                       скорость на краях соседних блоков)
+        """
+        result = FrameSequence()
+        if max_gap <= 0 or len(self._blocks) < 2:
+            return result
+
+        left, right = self._blocks[:-1], self._blocks[1:]
+        lengths = np.array([r.start_frame - l.end_frame - 1 for l, r in zip(left, right)])
+        gaps = np.flatnonzero((lengths > 0) & (lengths <= max_gap))
+        if not len(gaps):
+            return result
+
+        p0 = np.array([left[g].rects[-1] for g in gaps], dtype=np.float64)
+        p1 = np.array([right[g].rects[0] for g in gaps], dtype=np.float64)
+        lengths = lengths[gaps]
+
+        # Все кадры всех пропусков одним массивом: номер пропуска и t в (0, 1)
+        gap_of = np.repeat(np.arange(len(gaps)), lengths)
+        offsets = np.cumsum(lengths) - lengths
+        steps = np.arange(len(gap_of)) - offsets[gap_of] + 1
+        span = (lengths + 1)[gap_of]
+        t = (steps / span)[:, None]
+
+        if method == "cubic":
+            # Скорость (на кадр) на концах блоков; у блока из одного кадра - 0
+            m0 = np.array([np.subtract(left[g].rects[-1], left[g].rects[-2]) if len(left[g].rects) > 1
+                           else np.zeros(4) for g in gaps], dtype=np.float64)
+            m1 = np.array([np.subtract(right[g].rects[1], right[g].rects[0]) if len(right[g].rects) > 1
+                           else np.zeros(4) for g in gaps], dtype=np.float64)
+            t2, t3 = t * t, t * t * t
+            values = ((2 * t3 - 3 * t2 + 1) * p0[gap_of] + (t3 - 2 * t2 + t) * span[:, None] * m0[gap_of]
+                      + (-2 * t3 + 3 * t2) * p1[gap_of] + (t3 - t2) * span[:, None] * m1[gap_of])
+        else:
+            values = p0[gap_of] + t * (p1[gap_of] - p0[gap_of])
+
+        rows = list(map(tuple, values.tolist()))
+        for g, offset, length in zip(gaps, offsets, lengths):
+            result._blocks.append(FrameBlock(left[g].end_frame + 1, rows[offset:offset + length]))
+        return result
+
+    def low_confidence_segments(self, threshold: float, min_length: int = 1) -> List[Tuple[int, int]]:
+        """
+        Отрезки (первый, последний кадр) подряд идущих кадров со значением
+        (первым в кортеже - для последовательности уверенностей) ниже threshold.
+        Кадры без значения разрывают отрезок. Короче min_length - отбрасываются.
+        """
+        if not self._blocks:
+            return []
+        frames = np.concatenate([np.arange(b.start_frame, b.end_frame + 1) for b in self._blocks])
+        values = np.concatenate([np.asarray(b.rects, dtype=np.float64).reshape(len(b.rects), -1)[:, 0]
+                                 for b in self._blocks])
+        low = frames[values < threshold]
+        if not len(low):
+            return []
+
+        # Разрыв - там, где следующий низкий кадр не соседний
+        breaks = np.flatnonzero(np.diff(low) != 1)
+        starts = low[np.r_[0, breaks + 1]]
+        ends = low[np.r_[breaks, len(low) - 1]]
+        keep = ends - starts + 1 >= min_length
+        return list(zip(starts[keep].tolist(), ends[keep].tolist()))
+
+    def to_dict(self) -> Dict[int, Rect]:
+        """{кадр: rect} по всем блокам"""
+        result = {}
+        for block in self._blocks:
+            for i, rect in enumerate(block.rects):
+                result[block.start_frame + i] = rect
+        return result
+
     def _clear_range(self, start: int, end: int):
         to_remove_indices = []
         to_add_blocks = []
@@ -1,9 +1,13 @@
 import struct
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
 from src.core.geometry import Geometry
 
-from src.core.mor_parser.types import DataType, MAGIC_BYTE, VERSION, BlockType
+from src.core.mor_parser.types import (DataType, MAGIC_BYTE, VERSION, VERSION_V1, SUPPORTED_VERSIONS, BlockType,
+                                      TrackEncoding)
 from src.core.mor_parser.frame_block import Rect, FrameSequence, FrameBlock
 
 
@@ -20,10 +24,25 @@ class StatBlock:
 
 
 class MorrisFile:
+    # Трек по умолчанию (одно животное); хранится блоками FRAMES
+    MAIN_TRACK = 0
+
     def __init__(self, filepath: str):
         self.filepath = filepath
         self.coord_type = DataType.FLOAT
-        self.sequence = FrameSequence()
+        # Что пишется на кадр: bbox или только центр (для многосуточных записей)
+        self.track_encoding = TrackEncoding.BBOX
+        # Треки по id: 0 - основной, остальные - дополнительные животные
+        self.tracks: Dict[int, FrameSequence] = {self.MAIN_TRACK: FrameSequence()}
+        self.track_names: Dict[int, str] = {}
+        # Статистика зон по трекам: id -> {имя зоны: (время, дистанция)}
+        self.track_stats: Dict[int, Dict[str, Tuple[float, float]]] = {}
+        # Интерполированные кадры в пропусках треков (отдельно от настоящих)
+        self.interpolated: Dict[int, FrameSequence] = {}
+        # Направление движения по трекам (из файлов CENTROID_HEADING): блоки из (угол,)
+        self.track_headings: Dict[int, FrameSequence] = {}
+        # Уверенность трекера по трекам: блоки из (уверенность,), только кадры, где она известна
+        self.confidence: Dict[int, FrameSequence] = {}
         self.stats_blocks: List[StatBlock] = []
 
         # Хранилище метаданных
@@ -34,11 +53,85 @@ class MorrisFile:
     def set_coordinate_format(self, dtype: DataType):
         self.coord_type = dtype
 
+    def set_track_encoding(self, encoding: TrackEncoding):
+        """
+        CENTROID и CENTROID_HEADING хранят только центр bbox: после загрузки
+        кадр читается как (cx, cy, 0, 0), поэтому статистика и экспорт,
+        берущие центр как x + w / 2, работают без изменений.
+        """
+        self.track_encoding = encoding
+
+    @property
+    def sequence(self) -> FrameSequence:
+        """Основной трек"""
+        return self.tracks[self.MAIN_TRACK]
+
+    @sequence.setter
+    def sequence(self, value: FrameSequence):
+        self.tracks[self.MAIN_TRACK] = value
+
     # --- API Управления данными ---
 
-    def add_frames(self, start_frame: int, rects: List[Rect]):
+    def add_frames(self, start_frame: int, rects: List[Rect], track_id: int = MAIN_TRACK):
         """Добавляет кадры в умный менеджер"""
-        self.sequence.add_frames(start_frame, rects)
+        self.get_track(track_id).add_frames(start_frame, rects)
+
+    def add_track(self, name: str) -> int:
+        """Новый пустой трек; возвращает его id (до 255 треков)"""
+        track_id = max(self.tracks) + 1
+        if track_id > 255:
+            raise ValueError("Too many tracks")
+        self.tracks[track_id] = FrameSequence()
+        self.track_names[track_id] = name
+        return track_id
+
+    def get_track(self, track_id: int) -> FrameSequence:
+        if track_id not in self.tracks:
+            self.tracks[track_id] = FrameSequence()
+        return self.tracks[track_id]
+
+    def get_heading(self, frame_index: int, track_id: int = MAIN_TRACK) -> Optional[float]:
+        """Направление движения в градусах (только для CENTROID_HEADING)"""
+        headings = self.track_headings.get(track_id)
+        value = headings.get_rect(frame_index) if headings else None
+        return value[0] if value else None
+
+    def set_confidence(self, confidence: Dict[int, float], track_id: int = MAIN_TRACK):
+        """{кадр: уверенность 0..1}; кадры с None (бэкенд не оценивает) не хранятся"""
+        known = {frame: (float(value),) for frame, value in confidence.items() if value is not None}
+        if known:
+            self.confidence[track_id] = FrameSequence.from_dict(known)
+        else:
+            self.confidence.pop(track_id, None)
+
+    def get_confidence(self, frame_index: int, track_id: int = MAIN_TRACK) -> Optional[float]:
+        values = self.confidence.get(track_id)
+        value = values.get_rect(frame_index) if values else None
+        return value[0] if value else None
+
+    def low_confidence_segments(self, threshold: float, min_length: int = 1,
+                                track_id: int = MAIN_TRACK) -> List[Tuple[int, int]]:
+        """Отрезки кадров трека с уверенностью ниже threshold (FrameSequence.low_confidence_segments)"""
+        values = self.confidence.get(track_id)
+        return values.low_confidence_segments(threshold, min_length) if values else []
+
+    def fill_gaps(self, max_gap: int, method: str = "linear"):
+        """Заново заполняет пропуски до max_gap кадров во всех треках (FrameSequence.fill_gaps)"""
+        self.interpolated = {}
+        for track_id, sequence in self.tracks.items():
+            filled = sequence.fill_gaps(max_gap, method)
+            if filled.blocks:
+                self.interpolated[track_id] = filled
+
+    def get_filled_track(self, track_id: int = MAIN_TRACK) -> Dict[int, Rect]:
+        """{кадр: rect} трека вместе с интерполированными кадрами"""
+        data = self.get_track(track_id).to_dict()
+        if track_id in self.interpolated:
+            data.update(self.interpolated[track_id].to_dict())
+        return data
+
+    def get_track_name(self, track_id: int) -> str:
+        return self.track_names.get(track_id, f"Трек {track_id + 1}")
 
     def add_stat(self, stat: StatBlock):
         self.stats_blocks.append(stat)
@@ -57,22 +150,65 @@ class MorrisFile:
 
     # --- I/O ---
 
+    def _format_version(self) -> int:
+        """Версия 1, пока в файле нет блоков и типов, которых не знают старые версии"""
+        has_new_blocks = (
+            self.track_encoding != TrackEncoding.BBOX
+            or self.coord_type == DataType.FLOAT16
+            or self.track_names
+            or self.track_stats
+            or any(track_id != self.MAIN_TRACK and sequence.blocks for track_id, sequence in self.tracks.items())
+            or any(sequence.blocks for sequence in self.interpolated.values())
+            or any(sequence.blocks for sequence in self.confidence.values())
+        )
+        return VERSION if has_new_blocks else VERSION_V1
+
     def save(self):
         with open(self.filepath, 'wb') as f:
             # 1. Header
-            f.write(struct.pack('<BBQ B', MAGIC_BYTE, VERSION, 0, self.coord_type.value))
+            f.write(struct.pack('<BBQ B', MAGIC_BYTE, self._format_version(), 0, self.coord_type.value))
             start_pos = f.tell()
 
-            fmt_char = self.coord_type.to_struct_fmt()
-            rect_pack_fmt = f'<{4}{fmt_char}'
+            # 1.1 Формат кадров (старые файлы без этого блока - BBOX)
+            if self.track_encoding != TrackEncoding.BBOX:
+                f.write(struct.pack('<BB', BlockType.ENCODING.value, self.track_encoding.value))
 
             # 2. Frames Block
             for block in self.sequence.blocks:
                 f.write(struct.pack('B', BlockType.FRAMES.value))
-                count = len(block.rects)
-                f.write(struct.pack('<III', block.start_frame, block.end_frame, count))
-                for rect in block.rects:
-                    f.write(struct.pack(rect_pack_fmt, *rect))
+                self._write_frames(f, block)
+
+            # 2.1 Треки (имена, кадры дополнительных треков, статистика по зонам)
+            for track_id, name in self.track_names.items():
+                name_bytes = name.encode('utf-8')
+                f.write(struct.pack('<BBH', BlockType.TRACK_INFO.value, track_id, len(name_bytes)))
+                f.write(name_bytes)
+
+            for track_id, sequence in self.tracks.items():
+                if track_id == self.MAIN_TRACK:
+                    continue
+                for block in sequence.blocks:
+                    f.write(struct.pack('<BB', BlockType.TRACK_FRAMES.value, track_id))
+                    self._write_frames(f, block)
+
+            for track_id, sequence in self.interpolated.items():
+                for block in sequence.blocks:
+                    f.write(struct.pack('<BB', BlockType.INTERPOLATED.value, track_id))
+                    self._write_frames(f, block)
+
+            for track_id, sequence in self.confidence.items():
+                for block in sequence.blocks:
+                    f.write(struct.pack('<BBIII', BlockType.CONFIDENCE.value, track_id,
+                                        block.start_frame, block.end_frame, len(block.rects)))
+                    values = np.asarray(block.rects, dtype=np.float64).reshape(-1)
+                    f.write(np.rint(np.clip(values, 0.0, 1.0) * 255).astype(np.uint8).tobytes())
+
+            for track_id, zones in self.track_stats.items():
+                for zone_name, (time_val, dist_val) in zones.items():
+                    name_bytes = zone_name.encode('utf-8')
+                    f.write(struct.pack('<BBH', BlockType.TRACK_STATS.value, track_id, len(name_bytes)))
+                    f.write(name_bytes)
+                    f.write(struct.pack('<dd', time_val, dist_val))
 
             # 3. Stats Block (Геометрия)
             for stat in self.stats_blocks:
@@ -120,8 +256,50 @@ class MorrisFile:
             f.seek(2)
             f.write(struct.pack('<Q', total_size))
 
+    def _write_frames(self, f, block: FrameBlock):
+        """Блок кадров одной записью: массив значений в типе coord_type"""
+        f.write(struct.pack('<III', block.start_frame, block.end_frame, len(block.rects)))
+        rects = np.asarray(block.rects, dtype=np.float64).reshape(-1, 4)
+
+        if self.track_encoding == TrackEncoding.BBOX:
+            values = rects
+        else:
+            values = rects[:, :2] + rects[:, 2:] / 2
+            if self.track_encoding == TrackEncoding.CENTROID_HEADING:
+                values = np.column_stack([values, _motion_heading(values)])
+
+        dtype = self.coord_type.to_numpy()
+        if self.coord_type.is_integer:
+            # Беззнаковые типы: bbox у края кадра бывает с отрицательным x/y
+            limits = np.iinfo(dtype)
+            values = np.clip(np.rint(values), limits.min, limits.max)
+        f.write(values.astype(dtype).tobytes())
+
+    def _read_frames(self, f, track_id: int = None) -> FrameBlock:
+        """track_id - куда складывать направление (None - не нужно)"""
+        start, end, count = struct.unpack('<III', f.read(12))
+        width = self.track_encoding.values_per_frame
+        fmt = f'<{width}{self.coord_type.to_struct_fmt()}'
+        rows = struct.iter_unpack(fmt, f.read(count * width * self.coord_type.get_size()))
+
+        if self.track_encoding == TrackEncoding.BBOX:
+            return FrameBlock(start, list(rows))
+
+        # Центр как bbox нулевого размера
+        rows = list(rows)
+        if self.track_encoding == TrackEncoding.CENTROID_HEADING and track_id is not None:
+            headings = self.track_headings.setdefault(track_id, FrameSequence())
+            headings._blocks.append(FrameBlock(start, [(row[2],) for row in rows]))
+        return FrameBlock(start, [(row[0], row[1], 0.0, 0.0) for row in rows])
+
     def load(self):
-        self.sequence = FrameSequence()
+        self.tracks = {self.MAIN_TRACK: FrameSequence()}
+        self.track_names = {}
+        self.track_stats = {}
+        self.track_headings = {}
+        self.interpolated = {}
+        self.confidence = {}
+        self.track_encoding = TrackEncoding.BBOX
         self.stats_blocks = []
         self.metadata = {}
 
@@ -134,10 +312,9 @@ class MorrisFile:
             if len(header) < 11: return
             magic, ver, size, dtype_val = struct.unpack('<BBQ B', header)
             if magic != MAGIC_BYTE: raise ValueError("Invalid magic")
+            if ver not in SUPPORTED_VERSIONS: raise ValueError(f"Unsupported version: {ver}")
 
             self.coord_type = DataType(dtype_val)
-            rect_fmt = f'<{4}{self.coord_type.to_struct_fmt()}'
-            rect_byte_size = 4 * self.coord_type.get_size()
 
             while True:
                 b_type = f.read(1)
@@ -145,12 +322,34 @@ class MorrisFile:
                 block_type = BlockType(ord(b_type))
 
                 if block_type == BlockType.FRAMES:
-                    meta = f.read(12)
-                    start, end, count = struct.unpack('<III', meta)
-                    rects = []
-                    for _ in range(count):
-                        rects.append(struct.unpack(rect_fmt, f.read(rect_byte_size)))
-                    self.sequence._blocks.append(FrameBlock(start, rects))
+                    self.sequence._blocks.append(self._read_frames(f, self.MAIN_TRACK))
+
+                elif block_type == BlockType.ENCODING:
+                    self.track_encoding = TrackEncoding(ord(f.read(1)))
+
+                elif block_type == BlockType.TRACK_INFO:
+                    track_id, name_len = struct.unpack('<BH', f.read(3))
+                    self.track_names[track_id] = f.read(name_len).decode('utf-8')
+
+                elif block_type == BlockType.TRACK_FRAMES:
+                    track_id = ord(f.read(1))
+                    self.get_track(track_id)._blocks.append(self._read_frames(f, track_id))
+
+                elif block_type == BlockType.INTERPOLATED:
+                    track_id = ord(f.read(1))
+                    self.interpolated.setdefault(track_id, FrameSequence())._blocks.append(self._read_frames(f))
+
+                elif block_type == BlockType.CONFIDENCE:
+                    track_id, start, _, count = struct.unpack('<BIII', f.read(13))
+                    values = np.frombuffer(f.read(count), dtype=np.uint8) / 255.0
+                    block = FrameBlock(start, [(v,) for v in values.tolist()])
+                    self.confidence.setdefault(track_id, FrameSequence())._blocks.append(block)
+
+                elif block_type == BlockType.TRACK_STATS:
+                    track_id, name_len = struct.unpack('<BH', f.read(3))
+                    zone_name = f.read(name_len).decode('utf-8')
+                    time_val, dist_val = struct.unpack('<dd', f.read(16))
+                    self.track_stats.setdefault(track_id, {})[zone_name] = (time_val, dist_val)
 
                 elif block_type == BlockType.STATS:
                     # Name
@@ -214,6 +413,9 @@ class MorrisFile:
             # Header (11 bytes)
             header = f.read(11)
             if len(header) < 11: return False
+            # Размер кадра зависит от типа координат из заголовка и блока ENCODING
+            coord_type = DataType(header[10])
+            encoding = TrackEncoding.BBOX
 
             # Читаем блоки
             while True:
@@ -221,16 +423,31 @@ class MorrisFile:
                 if not b_type_byte: break
                 block_type = BlockType(ord(b_type_byte))
 
-                if block_type == BlockType.FRAMES:
-                    # Пропускаем блок FRAMES
+                if block_type in (BlockType.FRAMES, BlockType.TRACK_FRAMES, BlockType.INTERPOLATED):
+                    # Пропускаем блок FRAMES (у TRACK_FRAMES и INTERPOLATED перед ним id трека)
+                    if block_type != BlockType.FRAMES:
+                        f.seek(1, 1)
                     # Формат: Start(4), End(4), Count(4) + Count * RectSize
                     meta = f.read(12)
                     _, _, count = struct.unpack('<III', meta)
-                    # RectSize = 4 * sizeof(datatype)
-                    rect_size = 4 * self.coord_type.get_size()
+                    # RectSize = значений на кадр * sizeof(datatype)
+                    rect_size = encoding.values_per_frame * coord_type.get_size()
                     # Прыгаем вперед
                     f.seek(count * rect_size, 1)  # 1 = from current position
 
+                elif block_type == BlockType.ENCODING:
+                    encoding = TrackEncoding(ord(f.read(1)))
+
+                elif block_type == BlockType.CONFIDENCE:
+                    # Id(1) + Start, End, Count (12) + Count байт
+                    _, _, _, count = struct.unpack('<BIII', f.read(13))
+                    f.seek(count, 1)
+
+                elif block_type in (BlockType.TRACK_INFO, BlockType.TRACK_STATS):
+                    # Id(1) + NameLen(2) + Name (+ Time, Dist у TRACK_STATS)
+                    _, name_len = struct.unpack('<BH', f.read(3))
+                    f.seek(name_len + (16 if block_type == BlockType.TRACK_STATS else 0), 1)
+
                 elif block_type == BlockType.STATS:
                     # Пропускаем блок STATS
                     # Name
@@ -259,3 +476,18 @@ class MorrisFile:
                     return is_marked
 
         return is_marked
+
+
+def _motion_heading(centers: np.ndarray) -> np.ndarray:
+    """
+    Направление движения (градусы, [0, 360)) по центрам блока.
+    На кадрах без движения сохраняется последнее известное направление.
+    """
+    if len(centers) < 2:
+        return np.zeros(len(centers))
+    dx = np.gradient(centers[:, 0])
+    dy = np.gradient(centers[:, 1])
+    heading = np.degrees(np.arctan2(dy, dx)) % 360
+    moved = (dx != 0) | (dy != 0)
+    last = np.maximum.accumulate(np.where(moved, np.arange(len(centers)), 0))
+    return heading[last]
@@ -1,7 +1,13 @@
 from enum import IntEnum
 
+import numpy as np
+
 MAGIC_BYTE = 0x4D
-VERSION = 1
+# Версия 1 - один трек BBOX в FLOAT/целых координатах (блоки FRAMES, STATS, METADATA).
+# Версия 2 - файлы с треками, блоками ENCODING, INTERPOLATED, CONFIDENCE или координатами FLOAT16
+VERSION_V1 = 1
+VERSION = 2
+SUPPORTED_VERSIONS = (VERSION_V1, VERSION)
 
 
 class DataType(IntEnum):
@@ -11,21 +17,55 @@ class DataType(IntEnum):
     UINT64 = 3
     FLOAT = 4
     DOUBLE = 5
+    # Половинная точность: целые пиксели точно до 2048, дальше шаг 2 px
+    FLOAT16 = 6
 
     def to_struct_fmt(self) -> str:
         mapping = {
-            0: 'B', 1: 'H', 2: 'I', 3: 'Q', 4: 'f', 5: 'd'
+            0: 'B', 1: 'H', 2: 'I', 3: 'Q', 4: 'f', 5: 'd', 6: 'e'
         }
         return mapping[self.value]
 
     def get_size(self) -> int:
         mapping = {
-            0: 1, 1: 2, 2: 4, 3: 8, 4: 4, 5: 8
+            0: 1, 1: 2, 2: 4, 3: 8, 4: 4, 5: 8, 6: 2
         }
         return mapping[self.value]
 
+    def to_numpy(self) -> np.dtype:
+        return np.dtype('<' + self.to_struct_fmt())
+
+    @property
+    def is_integer(self) -> bool:
+        return self.value <= DataType.UINT64
+
 
 class BlockType(IntEnum):
     FRAMES = 1
     STATS = 2
     METADATA = 3
+    # Несколько животных: основной трек (id 0) пишется блоками FRAMES,
+    # остальные - блоками TRACK_FRAMES со своим id
+    TRACK_INFO = 4
+    TRACK_FRAMES = 5
+    TRACK_STATS = 6
+    # Что хранится на кадр в FRAMES/TRACK_FRAMES (TrackEncoding); пишется сразу после заголовка
+    ENCODING = 7
+    # Кадры, восстановленные интерполяцией в коротких пропусках трека (id трека + как FRAMES)
+    INTERPOLATED = 8
+    # Уверенность трекера на кадр (id трека + Start, End, Count + Count байт: 0-255 -> 0..1)
+    CONFIDENCE = 9
+
+
+class TrackEncoding(IntEnum):
+    """Содержимое кадра в блоках FRAMES"""
+    # x, y, w, h
+    BBOX = 0
+    # cx, cy - центр bbox (статистике и экспорту больше ничего не нужно)
+    CENTROID = 1
+    # cx, cy, направление движения в градусах [0, 360)
+    CENTROID_HEADING = 2
+
+    @property
+    def values_per_frame(self) -> int:
+        return {0: 4, 1: 2, 2: 3}[self.value]
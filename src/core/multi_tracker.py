@@ -0,0 +1,169 @@
+from typing import List, Optional
+
+import numpy as np
+
+from src.cv.frame_scaler import FrameScaler
+from src.cv.onnx_detector import ONNXTracker, load_detector
+from src.cv.onnx_yolo_tracker import ASSOCIATION_MIN_IOU, default_model_path
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+# Трек без совпадения по IoU ищется среди оставшихся детекций
+# не дальше стольких своих размеров (животное прошло мимо, пока не детектилось)
+REACQUIRE_MAX_DISTANCE = 3.0
+
+
+def bbox_iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """IoU каждого bbox из boxes_a (Nx4) с каждым из boxes_b (Mx4): матрица NxM"""
+    a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 1, 4)
+    b = np.asarray(boxes_b, dtype=np.float32).reshape(1, -1, 4)
+    x1 = np.maximum(a[..., 0], b[..., 0])
+    y1 = np.maximum(a[..., 1], b[..., 1])
+    x2 = np.minimum(a[..., 0] + a[..., 2], b[..., 0] + b[..., 2])
+    y2 = np.minimum(a[..., 1] + a[..., 3], b[..., 1] + b[..., 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    union = a[..., 2] * a[..., 3] + b[..., 2] * b[..., 3] - inter
+    return inter / (union + 1e-6)
+
+
+def assign(cost: np.ndarray, max_cost: float):
+    """
+    Пары (строка, столбец) с минимальной суммарной стоимостью, без пар дороже max_cost.
+    Венгерский алгоритм из scipy, если он есть; иначе жадно по возрастанию стоимости
+    (для нескольких животных результат почти всегда тот же).
+    """
+    if cost.size == 0:
+        return []
+    # Недопустимые пары дороже любой допустимой: решение не жертвует ради них настоящими
+    cost = np.where(cost > max_cost, max_cost * 2 + 1e6, cost)
+    if linear_sum_assignment is not None:
+        rows, cols = linear_sum_assignment(cost)
+    else:
+        rows, cols = _greedy_assignment(cost)
+    return [(int(r), int(c)) for r, c in zip(rows, cols) if cost[r, c] <= max_cost]
+
+
+def _greedy_assignment(cost: np.ndarray):
+    rows, cols = [], []
+    used_rows, used_cols = set(), set()
+    for flat in np.argsort(cost, axis=None):
+        r, c = np.unravel_index(flat, cost.shape)
+        if r in used_rows or c in used_cols:
+            continue
+        used_rows.add(r)
+        used_cols.add(c)
+        rows.append(r)
+        cols.append(c)
+    return rows, cols
+
+
+class MultiTracker:
+    """
+    Трекинг нескольких животных одной детекцией YOLO на кадр.
+
+    Все детекции кадра сопоставляются с треками сразу: сначала по IoU
+    с прошлым bbox трека, потом треки без пары (животное не детектилось
+    несколько кадров) - по расстоянию между центрами. Id трека сохраняется,
+    пока его животное детектится рядом; на кадре, где трек не найден, он
+    пропускается, а не теряется.
+    """
+
+    def __init__(self, count: int, model_path: str = None, scale: float = 1.0, max_side: int = None,
+                 inference: tuple = None):
+        self.count = max(1, count)
+        self.model_path = model_path or default_model_path()
+        self.inference = inference
+        self.scaler = FrameScaler(max_side, scale)
+        self._frame_shape = None
+        # Последний bbox каждого трека (в координатах уменьшенного кадра)
+        self.last_bboxes: List[Optional[np.ndarray]] = [None] * self.count
+        # Уверенность детекции каждого трека на кадрах последнего update_batch()
+        self.batch_confidences: List[List[Optional[float]]] = []
+        self._detector = None
+
+    @property
+    def detector(self) -> ONNXTracker:
+        if self._detector is None:
+            self._detector = load_detector(self.model_path, self.inference)
+        return self._detector
+
+    @property
+    def is_initialized(self) -> bool:
+        return all(bbox is not None for bbox in self.last_bboxes)
+
+    def init(self, frame: np.ndarray, bboxes: List[tuple]):
+        """Начальные bbox треков (в порядке id)"""
+        self._fit(frame)
+        for i, bbox in enumerate(bboxes[:self.count]):
+            self.last_bboxes[i] = np.array(self.scaler.to_small(bbox), dtype=np.float32)
+
+    def update(self, frame: np.ndarray) -> List[Optional[tuple]]:
+        """bbox каждого трека на кадре (None - трек на этом кадре не найден)"""
+        return self.update_batch([frame])[0]
+
+    def update_batch(self, frames) -> List[List[Optional[tuple]]]:
+        """update() для пачки кадров: один проход сети на всю пачку"""
+        small = [self._fit(frame) for frame in frames]
+        detections = self.detector.detect_batch(small)
+        self.batch_confidences = []
+        return [self._associate(boxes, confs) for boxes, confs in detections]
+
+    def _fit(self, frame: np.ndarray) -> np.ndarray:
+        if frame.shape[:2] != self._frame_shape:
+            self._frame_shape = frame.shape[:2]
+            self.scaler.fit(frame.shape)
+        return self.scaler.prepare(frame)
+
+    def _associate(self, boxes: np.ndarray, confs: np.ndarray) -> List[Optional[tuple]]:
+        # Индекс детекции для каждого трека
+        matched: List[Optional[int]] = [None] * self.count
+        used = set()
+        tracks = [i for i, bbox in enumerate(self.last_bboxes) if bbox is not None]
+
+        # 1. IoU с прошлым положением; 2. оставшиеся - по расстоянию между центрами
+        for cost_fn, max_cost in ((_iou_cost, 1.0 - ASSOCIATION_MIN_IOU),
+                                  (_distance_cost, REACQUIRE_MAX_DISTANCE)):
+            free_tracks = [i for i in tracks if matched[i] is None]
+            free_boxes = [j for j in range(len(boxes)) if j not in used]
+            if not free_tracks or not free_boxes:
+                break
+            track_boxes = np.stack([self.last_bboxes[i] for i in free_tracks])
+            for r, c in assign(cost_fn(track_boxes, boxes[free_boxes]), max_cost):
+                matched[free_tracks[r]] = free_boxes[c]
+                used.add(free_boxes[c])
+
+        # 3. Треки без начального bbox занимают самые уверенные из оставшихся детекций
+        empty = [i for i, bbox in enumerate(self.last_bboxes) if bbox is None]
+        if empty:
+            free_boxes = [j for j in range(len(boxes)) if j not in used]
+            free_boxes = sorted(free_boxes, key=lambda j: -confs[j])[:len(empty)]
+            # Слева направо, чтобы номера животных не зависели от уверенности
+            free_boxes.sort(key=lambda j: boxes[j][0])
+            for i, j in zip(empty, free_boxes):
+                matched[i] = j
+
+        result = []
+        for i, j in enumerate(matched):
+            if j is None:
+                result.append(None)
+                continue
+            self.last_bboxes[i] = boxes[j].copy()
+            result.append(self.scaler.to_full(boxes[j]))
+        self.batch_confidences.append([float(confs[j]) if j is not None else None for j in matched])
+        return result
+
+
+def _iou_cost(track_boxes: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    return 1.0 - bbox_iou_matrix(track_boxes, boxes)
+
+
+def _distance_cost(track_boxes: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """Расстояние между центрами в размерах bbox трека"""
+    centers_t = track_boxes[:, :2] + track_boxes[:, 2:] / 2
+    centers_d = boxes[:, :2] + boxes[:, 2:] / 2
+    dist = np.linalg.norm(centers_t[:, None, :] - centers_d[None, :, :], axis=2)
+    size = np.maximum(track_boxes[:, 2], track_boxes[:, 3])[:, None] + 1e-6
+    return dist / size
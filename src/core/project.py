@@ -1,3 +1,4 @@
+import logging
 import os
 from pathlib import Path
 from typing import List, Optional
@@ -6,6 +7,9 @@ import yaml
 
 from src.config import VIDEO_EXTENSIONS
 from src.core import Video
+from src.core.mor_parser.types import DataType, TrackEncoding
+
+logger = logging.getLogger(__name__)
 
 
 class Project:
@@ -15,6 +19,7 @@ class Project:
     _is_loaded: bool
     _compass_settings: dict
     _scale_factor: float  # пикселей на метр (0 = не задано)
+    _tracking_settings: dict  # трекер и запись: {"scale": 0.5, "max_side": 960, "encoding": "centroid", "max_gap": 10, ...}
 
     def __init__(self, project_path: str | os.PathLike, cached_name: str = None):
         self._path = Path(project_path).resolve()
@@ -24,6 +29,9 @@ class Project:
         self._compass_settings = {}
         self._scale_factor = 0.0
         self._export_settings = {}
+        self._tracking_settings = {}
+        # (encoding, precision) из настроек -> (TrackEncoding, DataType); предупреждение - один раз
+        self._track_storage = None
 
         self.__read_config()
 
@@ -43,6 +51,8 @@ class Project:
                         self._scale_factor = float(data["scale_factor"])
                     if "export_settings" in data:
                         self._export_settings = data["export_settings"]
+                    if "tracking_settings" in data:
+                        self._tracking_settings = data["tracking_settings"] or {}
             except Exception:
                 pass
 
@@ -68,6 +78,9 @@ class Project:
         # Всегда сохраняем export_settings, даже пустой
         existing_data["export_settings"] = self._export_settings
 
+        if self._tracking_settings:
+            existing_data["tracking_settings"] = self._tracking_settings
+
         with open(config_file, "w", encoding="utf-8") as f:
             yaml.dump(existing_data, f, default_flow_style=False, allow_unicode=True)
 
@@ -79,6 +92,68 @@ class Project:
     def export_settings(self, value: dict):
         self._export_settings = value
 
+    @property
+    def tracking_settings(self) -> dict:
+        return self._tracking_settings
+
+    @tracking_settings.setter
+    def tracking_settings(self, value: dict):
+        self._tracking_settings = value
+
+    @property
+    def tracking_scale(self) -> tuple:
+        """(scale, max_side) для TrackerWrapper; max_side = None - без ограничения"""
+        scale = float(self._tracking_settings.get("scale") or 1.0)
+        max_side = int(self._tracking_settings.get("max_side") or 0)
+        return scale, (max_side or None)
+
+    @property
+    def track_storage(self) -> tuple:
+        """
+        (TrackEncoding, DataType) для записи трекинга в .mor:
+        {"encoding": "centroid", "precision": "float16"} в tracking_settings.
+        По умолчанию - bbox во float, как раньше.
+        """
+        encoding = str(self._tracking_settings.get("encoding") or "bbox").upper()
+        precision = str(self._tracking_settings.get("precision") or "float").upper()
+        if self._track_storage is None or self._track_storage[0] != (encoding, precision):
+            try:
+                storage = TrackEncoding[encoding], DataType[precision]
+            except KeyError:
+                # Опечатка в project.yaml не должна ломать разметку и пакетный режим
+                logger.warning("Unknown track storage settings %s/%s, using bbox/float", encoding, precision)
+                storage = TrackEncoding.BBOX, DataType.FLOAT
+            self._track_storage = ((encoding, precision), storage)
+        return self._track_storage[1]
+
+    @property
+    def gap_filling(self) -> tuple:
+        """
+        (max_gap, method) для заполнения коротких пропусков трека:
+        {"max_gap": 10, "interpolation": "cubic"} в tracking_settings.
+        max_gap = 0 - пропуски не заполняются.
+        """
+        max_gap = int(self._tracking_settings.get("max_gap") or 0)
+        method = str(self._tracking_settings.get("interpolation") or "linear")
+        return max_gap, method
+
+    @property
+    def motion_threshold(self) -> float:
+        """Порог MotionGate перед трекером (tracking_settings "motion_threshold"); 0 - выключен"""
+        return float(self._tracking_settings.get("motion_threshold") or 0.0)
+
+    @property
+    def inference(self) -> tuple:
+        """
+        (runtime, threads, precision) прохода сети YOLO: {"inference_runtime": "onnxruntime",
+        "inference_threads": 4, "model_precision": "int8"} в tracking_settings.
+        По умолчанию - cv2.dnn, потоки как у OpenCV, исходные веса.
+        """
+        runtime = str(self._tracking_settings.get("inference_runtime") or "opencv").lower()
+        threads = int(self._tracking_settings.get("inference_threads") or 0)
+        precision = str(self._tracking_settings.get("model_precision") or "fp32").lower()
+        return runtime, threads, precision
+
     def reload_videos(self):
         self._videos = []
         valid_extensions = {".mp4", ".avi", ".mov", ".mkv"}
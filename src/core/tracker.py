@@ -1,172 +1,186 @@
 import cv2
 import numpy as np
 
-from src.config import get_resource_path
+from src.core.video import reader_pool
+from src.cv.frame_scaler import FrameScaler
+from src.cv.motion_gate import MotionGate
+from src.cv.tracker_registry import create_backend
 
-
-class ONNXTracker:
-    def __init__(self, model_path, conf_threshold=0.3):
-        self.model_path = model_path
-        self.conf_threshold = conf_threshold
-        self.net = None
-        self.input_size = (640, 640)
-        self.last_bbox = None
-        self._load_model()
-
-    def _load_model(self):
-        self.net = cv2.dnn.readNet(self.model_path)
-        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
-        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
-
-    def _preprocess(self, frame):
-        blob = cv2.dnn.blobFromImage(
-            frame, 1/255.0, self.input_size, swapRB=True, crop=False
-        )
-        return blob
-
-    def _postprocess(self, outputs, orig_shape):
-        output = np.array(outputs[0])
-        
-        if output.shape[0] == 1:
-            output = output[0]
-        
-        bboxes = []
-        confs = []
-        
-        for detection in output.T:
-            if len(detection) < 5:
-                continue
-            
-            cx, cy, w, h, obj_conf = detection[:5]
-            
-            if obj_conf < self.conf_threshold:
-                continue
-            
-            x = cx - w/2
-            y = cy - h/2
-            
-            bboxes.append([x, y, w, h])
-            confs.append(float(obj_conf))
-        
-        if not bboxes:
-            return None, None
-        
-        indices = cv2.dnn.NMSBoxes(
-            bboxes, confs, self.conf_threshold, 0.45
-        )
-        
-        if len(indices) > 0:
-            i = indices[0]
-            bbox = bboxes[i]
-            conf = confs[i]
-            return bbox, conf
-        
-        return None, None
-
-    def detect(self, frame):
-        blob = self._preprocess(frame)
-        self.net.setInput(blob)
-        outputs = self.net.forward(self.net.getUnconnectedOutLayersNames())
-        
-        orig_h, orig_w = frame.shape[:2]
-        scale_x = orig_w / self.input_size[0]
-        scale_y = orig_h / self.input_size[1]
-        
-        bbox, conf = self._postprocess(outputs, (orig_h, orig_w))
-        
-        if bbox:
-            x, y, w, h = bbox
-            x = x * scale_x
-            y = y * scale_y
-            w = w * scale_x
-            h = h * scale_y
-            return True, (int(x), int(y), int(w), int(h))
-        
-        return False, None
+# Сколько кадров за один проход сети при офлайн-трекинге (турбо, пакетный режим)
+DEFAULT_BATCH_SIZE = 8
 
 
 class TrackerWrapper:
-    def __init__(self, model_type="csrt", model_path=None):
-        if model_path is None:
-            self.model_path = str(get_resource_path("best.onnx"))
-        else:
-            self.model_path = model_path
-            
+    """
+    Трекер плеера и пакетного режима. Сам трекинг делает бэкенд
+    из реестра src.cv.tracker_registry (CSRT, KCF, MOSSE, YOLO, ...),
+    модели бэкендов загружаются лениво и кэшируются на процесс,
+    поэтому новый TrackerWrapper для уже загруженной модели создается сразу.
+
+    Кадры можно уменьшать перед трекером (scale, max_side - см. FrameScaler):
+    бэкенд работает в уменьшенных координатах, а init/update принимают
+    и возвращают bbox в координатах исходного кадра.
+
+    С motion_threshold > 0 перед бэкендом стоит MotionGate: пока в окне
+    вокруг bbox ничего не меняется (животное сидит на месте), бэкенд
+    не вызывается и возвращается прошлый bbox.
+
+    inference - (runtime, threads, precision) для бэкендов на YOLO (ONNX),
+    см. src.cv.onnx_detector.load_detector.
+    """
+
+    def __init__(self, model_type="csrt", model_path=None, batch_size=DEFAULT_BATCH_SIZE, use_roi=True,
+                 scale: float = 1.0, max_side: int = None, motion_threshold: float = 0,
+                 inference: tuple = None):
         self.model_type = model_type.lower()
-        self.tracker = None
-        self.onnx_tracker = None
-        self.last_bbox = None
-
-        if "yolo" in self.model_type:
-            try:
-                self.onnx_tracker = ONNXTracker(self.model_path)
-            except Exception as e:
-                print(f"Failed to load ONNX model: {e}")
-                self.onnx_tracker = None
+        self.model_path = model_path
+        # Размер пачки для update_batch
+        self.batch_size = max(1, batch_size)
+        # YOLO: детекция в окне вокруг прошлого bbox вместо всего кадра
+        self.use_roi = use_roi
+
+        self.backend = create_backend(self.model_type, model_path=model_path, use_roi=use_roi,
+                                      inference=inference)
+        self.scaler = FrameScaler(max_side, scale)
+        self._frame_shape = None
+        # Уверенности кадров последнего update_batch(), по порядку результатов
+        self.last_confidences = []
+        self.motion_gate = MotionGate(motion_threshold) if motion_threshold > 0 else None
+
+    @property
+    def label(self) -> str:
+        return self.backend.label
+
+    @property
+    def traits(self):
+        return self.backend.traits
+
+    @property
+    def last_bbox(self):
+        return self._to_full(self.backend.last_bbox)
+
+    @property
+    def last_confidence(self):
+        """Уверенность последнего update() от 0 до 1 (None - бэкенд ее не оценивает)"""
+        return self.backend.last_confidence
+
+    def load(self) -> bool:
+        """Загружает модель бэкенда сейчас, а не на первом кадре"""
+        return self.backend.load()
+
+    def prepare_video(self, video_path) -> bool:
+        """
+        Кадры со всего видео для бэкендов, которым они нужны до трекинга
+        (VIDEO_SAMPLES, например модель фона). Для остальных ничего не делает.
+        """
+        count = self.backend.VIDEO_SAMPLES
+        if not count:
+            return False
+        frames = []
+        with reader_pool.lease(video_path) as cap:
+            total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            for index in np.unique(np.linspace(0, max(0, total - 1), count).astype(int)):
+                cap.set(cv2.CAP_PROP_POS_FRAMES, int(index))
+                ret, frame = cap.read()
+                if ret:
+                    frames.append(self._prepare(frame))
+        self.backend.prepare(frames)
+        return bool(frames)
 
     def reset(self):
-        self.tracker = None
-        self.last_bbox = None
+        self.backend.reset()
+        if self.motion_gate:
+            self.motion_gate.reset()
 
     def init(self, frame: np.ndarray, bbox: tuple):
         if bbox:
             bbox = tuple(map(int, bbox))
+        self.backend.init(self._prepare(frame), self.scaler.to_small(bbox) if bbox else bbox)
+        self._set_reference(frame, bbox)
 
-        self.last_bbox = bbox
-
-        if "csrt" in self.model_type:
-            if self.tracker is None:
-                self.tracker = cv2.TrackerCSRT_create()
-            else:
-                self.tracker = cv2.TrackerCSRT_create()
-
-            self.tracker.init(frame, bbox)
+    @property
+    def can_autostart(self) -> bool:
+        """Может ли трекер сам найти объект на кадре (без начального bbox)"""
+        return self.traits.can_autostart
 
     def update(self, frame: np.ndarray):
-        if "csrt" in self.model_type:
-            if self.tracker is None:
-                return False, None
-            success, box = self.tracker.update(frame)
-            if success:
-                return True, tuple(map(int, box))
-            return False, None
-
-        elif "yolo" in self.model_type and self.onnx_tracker:
-            if self.last_bbox is not None:
-                best_bbox = None
-                best_iou = 0
-                
-                success, det_bbox = self.onnx_tracker.detect(frame)
-                
-                if success:
-                    iou = self._calculate_iou(self.last_bbox, det_bbox)
-                    if iou > best_iou:
-                        best_iou = iou
-                        best_bbox = det_bbox
-                
-                if best_bbox is None or best_iou < 0.1:
-                    return False, self.last_bbox
-                
-                self.last_bbox = best_bbox
-                return True, best_bbox
+        if self.motion_gate and self.motion_gate.is_static(frame):
+            return True, self.motion_gate.bbox
+        success, bbox = self.backend.update(self._prepare(frame))
+        bbox = self._to_full(bbox)
+        self._set_reference(frame, bbox if success else None)
+        return success, bbox
+
+    @property
+    def supports_batch(self) -> bool:
+        return self.backend.supports_batch
+
+    def update_batch(self, frames):
+        """
+        update() для нескольких кадров подряд (для YOLO - один проход сети
+        на пачку). Результаты возвращаются до первой потери объекта включительно.
+        """
+        # Кадры без движения в начале пачки не идут в бэкенд; после первого
+        # движения bbox меняется, и остаток пачки обрабатывается целиком
+        skipped = 0
+        while self.motion_gate and skipped < len(frames) and self.motion_gate.is_static(frames[skipped]):
+            skipped += 1
+        results = [(True, self.motion_gate.bbox)] * skipped if skipped else []
+        # Пропущенные кадры - та же уверенность, что у прошлого настоящего обновления
+        self.last_confidences = [self.backend.last_confidence] * skipped
+
+        frames = frames[skipped:]
+        if frames:
+            tracked = self.backend.update_batch([self._prepare(frame) for frame in frames])
+            tracked = [(success, self._to_full(bbox)) for success, bbox in tracked]
+            if tracked:
+                success, bbox = tracked[-1]
+                self._set_reference(frames[len(tracked) - 1], bbox if success else None)
+            confidences = list(self.backend.batch_confidences[:len(tracked)])
+            self.last_confidences += confidences + [None] * (len(tracked) - len(confidences))
+            results += tracked
+        return results
+
+    def _prepare(self, frame: np.ndarray) -> np.ndarray:
+        # Коэффициент подбирается по первому кадру (и заново, если размер сменился)
+        if frame.shape[:2] != self._frame_shape:
+            self._frame_shape = frame.shape[:2]
+            self.scaler.fit(frame.shape)
+        return self.scaler.prepare(frame)
+
+    def _set_reference(self, frame: np.ndarray, bbox):
+        if self.motion_gate:
+            if bbox:
+                self.motion_gate.set_reference(frame, bbox)
             else:
-                success, det_bbox = self.onnx_tracker.detect(frame)
-                
-                if success:
-                    self.last_bbox = det_bbox
-                    return True, det_bbox
-                
-                return False, None
-
-        return False, None
-
-    def _calculate_iou(self, boxA, boxB):
-        xA = max(boxA[0], boxB[0])
-        yA = max(boxA[1], boxB[1])
-        xB = min(boxA[0] + boxA[2], boxB[0] + boxB[2])
-        yB = min(boxA[1] + boxA[3], boxB[1] + boxB[3])
-        interArea = max(0, xB - xA) * max(0, yB - yA)
-        boxAArea = boxA[2] * boxA[3]
-        boxBArea = boxB[2] * boxB[3]
-        denom = float(boxAArea + boxBArea - interArea + 1e-6)
-        return interArea / denom
+                self.motion_gate.reset()
+
+    def _to_full(self, bbox):
+        return self.scaler.to_full(bbox) if bbox is not None else None
+
+
+def has_size(bbox) -> bool:
+    """
+    Годится ли сохраненный bbox для init() трекера: в .mor с записью
+    только центра (TrackEncoding.CENTROID) размеров нет.
+    """
+    return bbox is not None and bbox[2] > 0 and bbox[3] > 0
+
+
+def track_batches(reader, tracker: TrackerWrapper):
+    """
+    Трекинг кадров из DecodeAheadReader подряд, пачками по tracker.batch_size
+    (для трекеров без пакетного режима - по одному кадру).
+    Отдает (frame_idx, frame, success, bbox, confidence); confidence - от 0 до 1
+    или None, если бэкенд ее не оценивает. После потери объекта останавливается.
+    """
+    batch_size = tracker.batch_size if tracker.supports_batch else 1
+    while True:
+        batch = reader.read_batch(batch_size)
+        if not batch:
+            return
+        results = tracker.update_batch([frame for _, frame in batch])
+        for (frame_idx, frame), (success, bbox), confidence in zip(batch, results, tracker.last_confidences):
+            yield frame_idx, frame, success, bbox, confidence
+            if not success:
+                return
@@ -1,6 +1,12 @@
+from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
+from typing import List, Optional
+import bisect
+import json
 import os
+import threading
+import time
 
 import cv2
 import numpy as np
@@ -13,6 +19,276 @@ class VideoExtension(str, Enum):
     MOV = "mov"
 
 
+class VideoInfo:
+    """Базовые параметры видеопотока (читаются один раз и кешируются)"""
+
+    def __init__(self, total_frames: int, fps: float, width: int, height: int):
+        self.total_frames = total_frames
+        self.fps = fps
+        self.width = width
+        self.height = height
+
+    @property
+    def duration(self) -> float:
+        if self.fps > 0:
+            return self.total_frames / self.fps
+        return 0.0
+
+
+class VideoReaderPool:
+    """
+    Пул открытых cv2.VideoCapture, сгруппированных по пути к файлу.
+
+    Плеер, таймлайн и "пробы" (чтение fps/размера) берут захват в аренду
+    через acquire()/release() или lease() и возвращают его обратно,
+    вместо того чтобы каждый раз открывать новый декодер.
+    Один захват в любой момент принадлежит только одному арендатору.
+
+    :param max_idle_per_path: сколько свободных захватов держать на один файл
+    :param max_idle_total: сколько свободных захватов держать всего
+    :param idle_timeout: через сколько секунд простоя свободный захват закрывается
+    """
+
+    def __init__(self, max_idle_per_path: int = 2, max_idle_total: int = 6,
+                 idle_timeout: float = 30.0):
+        self.max_idle_per_path = max_idle_per_path
+        self.max_idle_total = max_idle_total
+        self.idle_timeout = idle_timeout
+
+        self._lock = threading.Lock()
+        # Ключ (str path) -> список (cap, время возврата в пул)
+        self._idle = {}
+        self._leased = 0
+        self._info_cache = {}
+
+    @staticmethod
+    def _key(path) -> str:
+        return str(Path(path).resolve())
+
+    def acquire(self, path) -> cv2.VideoCapture:
+        """Выдает захват, установленный на начало файла"""
+        key = self._key(path)
+        cap = None
+
+        with self._lock:
+            self._close_expired_locked()
+            idle = self._idle.get(key)
+            if idle:
+                cap, _ = idle.pop()
+                if not idle:
+                    del self._idle[key]
+            self._leased += 1
+
+        if cap is None:
+            cap = cv2.VideoCapture(str(path))
+        elif cap.get(cv2.CAP_PROP_POS_FRAMES) != 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+        return cap
+
+    def release(self, path, cap: cv2.VideoCapture):
+        """Возвращает захват в пул (или закрывает, если пул заполнен)"""
+        if cap is None:
+            return
+
+        key = self._key(path)
+        to_close = []
+
+        with self._lock:
+            self._leased = max(0, self._leased - 1)
+
+            if not cap.isOpened():
+                to_close.append(cap)
+            else:
+                idle = self._idle.setdefault(key, [])
+                idle.append((cap, time.monotonic()))
+                if len(idle) > self.max_idle_per_path:
+                    to_close.append(idle.pop(0)[0])
+                to_close.extend(self._trim_locked())
+
+            self._close_expired_locked(to_close)
+
+        for c in to_close:
+            c.release()
+
+    @contextmanager
+    def lease(self, path):
+        cap = self.acquire(path)
+        try:
+            yield cap
+        finally:
+            self.release(path, cap)
+
+    def probe(self, path) -> VideoInfo:
+        """Параметры видео без открытия отдельного декодера (с кешем)"""
+        key = self._key(path)
+        with self._lock:
+            info = self._info_cache.get(key)
+        if info is not None:
+            return info
+
+        with self.lease(path) as cap:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            info = VideoInfo(
+                total_frames=int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+                fps=fps if fps and fps > 0 else 0.0,
+                width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            )
+
+        if cap.isOpened():
+            with self._lock:
+                self._info_cache[key] = info
+        return info
+
+    def close_idle(self, path=None):
+        """Закрывает свободные захваты (все или только для одного файла)"""
+        with self._lock:
+            if path is None:
+                keys = list(self._idle.keys())
+            else:
+                keys = [self._key(path)]
+            to_close = []
+            for key in keys:
+                to_close.extend(cap for cap, _ in self._idle.pop(key, []))
+
+        for cap in to_close:
+            cap.release()
+
+    def close_all(self):
+        self.close_idle()
+        with self._lock:
+            self._info_cache.clear()
+
+    @property
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(v) for v in self._idle.values())
+
+    @property
+    def leased_count(self) -> int:
+        with self._lock:
+            return self._leased
+
+    # --- Внутреннее (вызывается под self._lock) ---
+
+    def _trim_locked(self) -> list:
+        """Ограничивает общее число свободных захватов (выкидывает самые старые)"""
+        to_close = []
+        total = sum(len(v) for v in self._idle.values())
+        while total > self.max_idle_total:
+            oldest_key = min(self._idle, key=lambda k: self._idle[k][0][1])
+            to_close.append(self._idle[oldest_key].pop(0)[0])
+            if not self._idle[oldest_key]:
+                del self._idle[oldest_key]
+            total -= 1
+        return to_close
+
+    def _close_expired_locked(self, to_close: list = None):
+        now = time.monotonic()
+        expired = []
+        for key in list(self._idle.keys()):
+            alive = []
+            for cap, released_at in self._idle[key]:
+                if now - released_at > self.idle_timeout:
+                    expired.append(cap)
+                else:
+                    alive.append((cap, released_at))
+            if alive:
+                self._idle[key] = alive
+            else:
+                del self._idle[key]
+
+        if to_close is not None:
+            to_close.extend(expired)
+        else:
+            for cap in expired:
+                cap.release()
+
+
+# Общий пул на процесс
+reader_pool = VideoReaderPool()
+
+
+class KeyframeIndex:
+    """
+    Номера ключевых кадров видео.
+
+    Строится один раз сканированием пакетов без декодирования
+    (сырой режим FFmpeg) и кешируется в .morris/<video>.keyframes.
+    Позволяет перематывать точно: позиционирование на ключевой кадр
+    и последовательное декодирование до нужного.
+    """
+
+    CACHE_SUFFIX = ".keyframes"
+
+    def __init__(self, keyframes: List[int]):
+        self._keyframes = sorted(set(keyframes)) or [0]
+
+    @property
+    def keyframes(self) -> List[int]:
+        return self._keyframes
+
+    def keyframe_before(self, frame_index: int) -> int:
+        """Ближайший ключевой кадр <= frame_index"""
+        i = bisect.bisect_right(self._keyframes, frame_index)
+        return self._keyframes[i - 1] if i > 0 else 0
+
+    def keyframe_after(self, frame_index: int) -> Optional[int]:
+        """Ближайший ключевой кадр > frame_index (None, если его нет)"""
+        i = bisect.bisect_right(self._keyframes, frame_index)
+        return self._keyframes[i] if i < len(self._keyframes) else None
+
+    @staticmethod
+    def scan(video_path) -> Optional["KeyframeIndex"]:
+        """Проход по пакетам контейнера без декодирования"""
+        cap = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
+        try:
+            if not cap.isOpened() or not cap.set(cv2.CAP_PROP_FORMAT, -1):
+                return None
+
+            keyframes = []
+            idx = 0
+            while cap.grab():
+                if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                    keyframes.append(idx)
+                idx += 1
+        finally:
+            cap.release()
+
+        if not keyframes:
+            return None
+        return KeyframeIndex(keyframes)
+
+    @staticmethod
+    def load_or_build(video_path, cache_dir) -> Optional["KeyframeIndex"]:
+        video_path = Path(video_path)
+        cache_file = Path(cache_dir) / f"{video_path.stem}{KeyframeIndex.CACHE_SUFFIX}"
+
+        try:
+            stat = video_path.stat()
+        except OSError:
+            return None
+        signature = {"size": stat.st_size, "mtime": stat.st_mtime}
+
+        if cache_file.exists():
+            try:
+                data = json.loads(cache_file.read_text())
+                if data.get("size") == signature["size"] and data.get("mtime") == signature["mtime"]:
+                    return KeyframeIndex(data["keyframes"])
+            except (ValueError, KeyError, OSError):
+                pass
+
+        index = KeyframeIndex.scan(video_path)
+        if index is not None:
+            try:
+                cache_file.parent.mkdir(parents=True, exist_ok=True)
+                cache_file.write_text(json.dumps({**signature, "keyframes": index.keyframes}))
+            except OSError:
+                pass
+        return index
+
+
 class Video:
     _extension: VideoExtension
     _path: Path
@@ -34,15 +310,17 @@ class Video:
     def path(self):
         return self._path
 
+    @property
+    def info(self) -> VideoInfo:
+        return reader_pool.probe(self._path)
+
     # Make default values for width and height
     def get_preview(self, width=-1, height=-1) -> np.ndarray | None:
-        cap = cv2.VideoCapture(str(self.path))
-
-        if not cap.isOpened():
-            return None
+        with reader_pool.lease(self.path) as cap:
+            if not cap.isOpened():
+                return None
 
-        ret, frame = cap.read()
-        cap.release()
+            ret, frame = cap.read()
 
         if not ret:
             return None
@@ -0,0 +1,162 @@
+import cv2
+import numpy as np
+
+from src.cv.base_tracker import BaseTracker
+from src.cv.frame_scaler import FrameScaler
+from src.cv.tracker_registry import BackendTraits, register_backend
+
+# Кадров, равномерно взятых по всему видео, для медианного фона
+BACKGROUND_SAMPLES = 25
+# Отличие от фона (0-255), с которого пиксель считается объектом
+BACKGROUND_DIFF = 30
+# Блоб меньше такой доли площади прошлого bbox - шум, а не объект
+BACKGROUND_MIN_AREA_RATIO = 0.2
+# Без прошлого bbox (автозапуск): площадь блоба в долях кадра
+BACKGROUND_MIN_AREA = 0.0005
+BACKGROUND_MAX_AREA = 0.25
+# Центр блоба дальше стольких размеров прошлого bbox - другой объект
+BACKGROUND_MAX_JUMP = 3.0
+# Столько кадров подряд без блоба остается прошлый bbox (перекрытие), потом - потеря
+BACKGROUND_LOST_FRAMES = 30
+# Скорость подстройки фона под освещение (вне bbox объекта)
+BACKGROUND_LEARNING_RATE = 0.01
+
+
+@register_backend("background", "Фон (неподвижная камера)", BackendTraits(
+    speed=BackendTraits.HIGH, accuracy=BackendTraits.MEDIUM, can_autostart=True, recovers=True,
+    description="Для неподвижной камеры: объект - то, что отличается от фона арены. "
+                "Самый быстрый, модель не нужна, сам находит животное.",
+))
+class BackgroundTracker(BaseTracker):
+    """
+    Вычитание фона и выбор блоба.
+
+    Фон - медиана кадров, взятых по всему видео (prepare): животное
+    все время двигается, поэтому в медиане остается пустая арена.
+    Без prepare фоном становится кадр init() с закрашенным (inpaint) bbox -
+    годится для однородной арены. Фон медленно подстраивается под
+    освещение везде, кроме объекта, поэтому неподвижное животное
+    в него не уходит (как в MOG2). На кадре берется связная область
+    переднего плана, ближайшая к прошлому bbox, без прошлого bbox - самая большая.
+    """
+
+    MAX_SIDE = 640
+    VIDEO_SAMPLES = BACKGROUND_SAMPLES
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.scaler = FrameScaler(self.MAX_SIDE, grayscale=True)
+        self._frame_shape = None
+        # Фон (уменьшенный, серый) и он же во float для подстройки
+        self.background = None
+        self._background_f = None
+        self._open = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3))
+        self._close = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (7, 7))
+        self._last_small = None
+        self.missed = 0
+
+    def prepare(self, frames):
+        small = [self._small(frame) for frame in frames]
+        if small:
+            self._set_background(np.median(np.stack(small), axis=0).astype(np.uint8))
+
+    def reset(self):
+        super().reset()
+        self._last_small = None
+        self.missed = 0
+
+    def init(self, frame, bbox):
+        small = self._small(frame)
+        self.missed = 0
+        if bbox:
+            self.last_bbox = tuple(bbox)
+            self._last_small = np.array(self.scaler.to_small(bbox), dtype=np.float32)
+            if self.background is None or self.background.shape != small.shape:
+                mask = np.zeros(small.shape, np.uint8)
+                x, y, w, h = self._region(self._last_small, small.shape)
+                mask[y:y + h, x:x + w] = 255
+                self._set_background(cv2.inpaint(small, mask, 3, cv2.INPAINT_TELEA))
+
+    def update(self, frame):
+        small = self._small(frame)
+        if self.background is None or self.background.shape != small.shape:
+            # Фона нет (не было ни prepare, ни init с bbox)
+            return False, None
+        mask = self._foreground(small)
+        _, _, stats, centroids = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        # Нулевая компонента - фон
+        blob = self._select(stats[1:], centroids[1:], small.shape)
+
+        if blob is None:
+            self.missed += 1
+            # Прошлый bbox без подтверждения на кадре - уверенность нулевая
+            self.last_confidence = 0.0
+            if self.last_bbox is not None and self.missed <= BACKGROUND_LOST_FRAMES:
+                return True, self.last_bbox
+            return False, None
+
+        # Уверенность - постоянство площади блоба (резкий скачок - слияние с тенью, распад)
+        if self._last_small is not None:
+            prev_area = float(self._last_small[2] * self._last_small[3])
+            area = float(blob[2] * blob[3])
+            self.last_confidence = min(area, prev_area) / max(area, prev_area, 1.0)
+        else:
+            self.last_confidence = 1.0
+        self.missed = 0
+        self._last_small = blob.astype(np.float32)
+        self._learn(small)
+        self.last_bbox = self.scaler.to_full(blob)
+        return True, self.last_bbox
+
+    def _small(self, frame):
+        if frame.shape[:2] != self._frame_shape:
+            self._frame_shape = frame.shape[:2]
+            self.scaler.fit(frame.shape)
+        return self.scaler.prepare(frame)
+
+    def _set_background(self, background):
+        self.background = background
+        self._background_f = background.astype(np.float32)
+
+    def _learn(self, small):
+        """Подстройка фона под освещение везде, кроме окна вокруг объекта"""
+        mask = np.full(small.shape, 255, np.uint8)
+        x, y, w, h = self._region(self._last_small, small.shape)
+        mask[y:y + h, x:x + w] = 0
+        cv2.accumulateWeighted(small, self._background_f, BACKGROUND_LEARNING_RATE, mask)
+        self.background = cv2.convertScaleAbs(self._background_f)
+
+    @staticmethod
+    def _region(bbox, shape, margin: float = 0.25):
+        """bbox с запасом, в пределах кадра (целые)"""
+        x, y, w, h = bbox
+        x1, y1 = max(0, int(x - w * margin)), max(0, int(y - h * margin))
+        x2 = min(shape[1], int(x + w * (1 + margin)) + 1)
+        y2 = min(shape[0], int(y + h * (1 + margin)) + 1)
+        return x1, y1, max(0, x2 - x1), max(0, y2 - y1)
+
+    def _foreground(self, small):
+        mask = cv2.threshold(cv2.absdiff(small, self.background), BACKGROUND_DIFF, 255, cv2.THRESH_BINARY)[1]
+        # Шум - прочь, части тела (хвост, тень от спины) - в один блоб
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self._open)
+        return cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self._close)
+
+    def _select(self, stats: np.ndarray, centroids: np.ndarray, shape):
+        """bbox (x, y, w, h) выбранного блоба или None"""
+        frame_area = shape[0] * shape[1]
+        areas = stats[:, cv2.CC_STAT_AREA]
+        valid = areas <= BACKGROUND_MAX_AREA * frame_area
+
+        if self._last_small is None:
+            valid &= areas >= BACKGROUND_MIN_AREA * frame_area
+            if not valid.any():
+                return None
+            return stats[np.argmax(np.where(valid, areas, -1)), :4]
+
+        x, y, w, h = self._last_small
+        valid &= areas >= BACKGROUND_MIN_AREA_RATIO * w * h
+        dist = np.hypot(centroids[:, 0] - (x + w / 2), centroids[:, 1] - (y + h / 2)) / max(w, h, 1.0)
+        valid &= dist <= BACKGROUND_MAX_JUMP
+        if not valid.any():
+            return None
+        return stats[np.argmin(np.where(valid, dist, np.inf)), :4]
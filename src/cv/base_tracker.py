@@ -7,8 +7,46 @@ class BaseTracker(ABC):
     """
     Абстрактный базовый класс для всех трекеров.
     Гарантирует, что у CSRT и YOLO будет одинаковый API.
+    Бэкенды регистрируются в src.cv.tracker_registry, который заполняет
+    name, label и traits.
     """
 
+    name = ""
+    label = ""
+    traits = None
+    # Сколько кадров со всего видео нужно бэкенду до трекинга (prepare); 0 - не нужно
+    VIDEO_SAMPLES = 0
+
+    def __init__(self, **options):
+        self.last_bbox = None
+        # Уверенность последнего update() от 0 до 1; None - бэкенд ее не оценивает
+        self.last_confidence = None
+        # Уверенности кадров последнего update_batch(), по порядку результатов
+        self.batch_confidences = []
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Можно ли создать трекер в этом окружении (есть библиотека, модуль OpenCV)"""
+        return True
+
+    def load(self) -> bool:
+        """
+        Загрузка модели заранее (иначе - при первом кадре).
+        :return: готов ли трекер к работе
+        """
+        return True
+
+    def prepare(self, frames):
+        """
+        Кадры, равномерно взятые по всему видео (VIDEO_SAMPLES штук),
+        до начала трекинга - например, для модели фона.
+        """
+        pass
+
+    def reset(self):
+        self.last_bbox = None
+        self.last_confidence = None
+
     @abstractmethod
     def init(self, frame: np.ndarray, bbox: tuple):
         """
@@ -27,5 +65,24 @@ class BaseTracker(ABC):
         """
         pass
 
+    @property
+    def supports_batch(self) -> bool:
+        """Обрабатывает ли update_batch пачку кадров быстрее, чем по одному"""
+        return False
+
+    def update_batch(self, frames):
+        """
+        update() для нескольких кадров подряд.
+        Результаты возвращаются до первой потери объекта включительно.
+        """
+        results = []
+        self.batch_confidences = []
+        for frame in frames:
+            results.append(self.update(frame))
+            self.batch_confidences.append(self.last_confidence)
+            if not results[-1][0]:
+                break
+        return results
+
     def get_name(self):
-        return self.__class__.__name__
+        return self.label or self.__class__.__name__
@@ -0,0 +1,39 @@
+import cv2
+
+from src.config import get_resource_path
+from src.cv.opencv_tracker import OpenCVTracker
+from src.cv.tracker_registry import BackendTraits, register_backend
+
+# Модели DaSiamRPN из OpenCV Zoo; в сборку не входят, кладутся в resources
+DASIAMRPN_MODEL = "dasiamrpn_model.onnx"
+DASIAMRPN_KERNEL_CLS = "dasiamrpn_kernel_cls1.onnx"
+DASIAMRPN_KERNEL_R = "dasiamrpn_kernel_r1.onnx"
+
+
+@register_backend("dasiamrpn", "DaSiamRPN", BackendTraits(
+    speed=BackendTraits.MEDIUM, accuracy=BackendTraits.HIGH,
+    needs_model=True,
+    description="Нейросетевой трекер, требует ручной инициализации.",
+))
+class DaSiamRPNTracker(OpenCVTracker):
+    """
+    Сиамский трекер DaSiamRPN (cv2.dnn). Доступен, только если
+    модели лежат в resources.
+    """
+
+    MAX_SIDE = 640
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return hasattr(cv2, "TrackerDaSiamRPN_create") and all(
+            get_resource_path(name).exists()
+            for name in (DASIAMRPN_MODEL, DASIAMRPN_KERNEL_CLS, DASIAMRPN_KERNEL_R)
+        )
+
+    @staticmethod
+    def _create():
+        params = cv2.TrackerDaSiamRPN_Params()
+        params.model = str(get_resource_path(DASIAMRPN_MODEL))
+        params.kernel_cls1 = str(get_resource_path(DASIAMRPN_KERNEL_CLS))
+        params.kernel_r1 = str(get_resource_path(DASIAMRPN_KERNEL_R))
+        return cv2.TrackerDaSiamRPN_create(params)
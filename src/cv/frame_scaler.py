@@ -0,0 +1,58 @@
+import cv2
+
+
+class FrameScaler:
+    """
+    Уменьшение кадра перед трекером и пересчет bbox между масштабами.
+    Коэффициент выбирается по размеру кадра в fit(): не больше scale
+    и такой, чтобы длинная сторона не превышала max_side. Увеличения нет.
+    """
+
+    def __init__(self, max_side: int = None, scale: float = 1.0, grayscale: bool = False):
+        self.max_side = max_side
+        self.scale = scale
+        self.grayscale = grayscale
+        self.factor = 1.0
+
+    def fit(self, frame_shape):
+        """Подбирает коэффициент для кадров размера frame_shape (h, w, ...)"""
+        factor = min(self.scale, 1.0)
+        if self.max_side:
+            factor = min(factor, self.max_side / max(frame_shape[:2]))
+        self.factor = factor
+        return factor
+
+    def prepare(self, frame):
+        if self.factor < 1.0:
+            frame = self._downscale(frame, self.factor)
+        if self.grayscale and frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return frame
+
+    @staticmethod
+    def _downscale(frame, factor: float):
+        """
+        Уменьшение без муара на мелкой текстуре, но дешевле INTER_AREA:
+        билинейное сжатие ровно вдвое усредняет квадраты 2x2, поэтому кадр
+        сначала делится пополам, а остаток (меньше чем вдвое) - билинейно.
+        """
+        h, w = frame.shape[:2]
+        target = (max(1, int(round(w * factor))), max(1, int(round(h * factor))))
+        while frame.shape[1] >= 2 * target[0] and frame.shape[0] >= 2 * target[1]:
+            frame = cv2.resize(frame, (frame.shape[1] // 2, frame.shape[0] // 2), interpolation=cv2.INTER_LINEAR)
+        if (frame.shape[1], frame.shape[0]) != target:
+            frame = cv2.resize(frame, target, interpolation=cv2.INTER_LINEAR)
+        return frame
+
+    def to_small(self, bbox):
+        """bbox кадра -> bbox уменьшенного кадра"""
+        if self.factor >= 1.0:
+            return tuple(bbox)
+        x, y, w, h = (v * self.factor for v in bbox)
+        return int(round(x)), int(round(y)), max(1, int(round(w))), max(1, int(round(h)))
+
+    def to_full(self, bbox):
+        """bbox уменьшенного кадра -> bbox кадра (целые координаты)"""
+        if self.factor >= 1.0:
+            return tuple(int(v) for v in bbox)
+        return tuple(int(round(v / self.factor)) for v in bbox)
@@ -0,0 +1,87 @@
+import cv2
+import numpy as np
+
+from src.cv.onnx_yolo_tracker import ONNXYoloTracker
+from src.cv.tracker_registry import BackendTraits, register_backend
+
+# Гибридный режим: CSRT на каждом кадре, YOLO - раз в N кадров или при сбое CSRT
+HYBRID_REANCHOR_EVERY = 30
+# Если площадь bbox CSRT изменилась сильнее, чем во столько раз, ему больше не верим
+HYBRID_MAX_SCALE_CHANGE = 2.0
+
+
+@register_backend("hybrid", "Hybrid", BackendTraits(
+    speed=BackendTraits.MEDIUM, accuracy=BackendTraits.HIGH,
+    can_autostart=True, recovers=True, needs_model=True,
+    description="CSRT на каждом кадре с периодической проверкой по YOLO.",
+))
+class HybridTracker(ONNXYoloTracker):
+    """
+    CSRT на каждом кадре; раз в HYBRID_REANCHOR_EVERY кадров, при сбое CSRT
+    или резком изменении размера bbox - детекция YOLO рядом с объектом,
+    и CSRT заново инициализируется по ней. Без модели работает как CSRT.
+    """
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.tracker = None
+        # Кадров с последней привязки к детекции и площадь bbox на ней
+        self._frames_since_anchor = 0
+        self._anchor_area = None
+
+    def reset(self):
+        super().reset()
+        self.tracker = None
+
+    def init(self, frame, bbox):
+        self._anchor(frame, bbox)
+
+    @property
+    def supports_batch(self) -> bool:
+        return False
+
+    def update(self, frame: np.ndarray):
+        if self.tracker is None:
+            # Автозапуск: объект ищется по всему кадру
+            if self.detector is None:
+                return False, None
+            boxes, confs = self.detector.detect_all(frame)
+            if not len(boxes):
+                return False, None
+            det_bbox = tuple(int(v) for v in boxes[0])
+            self._anchor(frame, det_bbox)
+            self.last_confidence = float(confs[0])
+            return True, det_bbox
+
+        success, box = self.tracker.update(frame)
+        box = tuple(map(int, box)) if success else None
+        self._frames_since_anchor += 1
+
+        drifted = False
+        if success and self._anchor_area:
+            scale = (box[2] * box[3]) / self._anchor_area
+            drifted = not (1 / HYBRID_MAX_SCALE_CHANGE <= scale <= HYBRID_MAX_SCALE_CHANGE)
+
+        trusted = success and not drifted
+        if self.detector is not None and (not trusted or self._frames_since_anchor >= HYBRID_REANCHOR_EVERY):
+            match = self._detect_near(frame, box if trusted else self.last_bbox)
+            if match is not None:
+                det_bbox = tuple(int(v) for v in match[0])
+                self._anchor(frame, det_bbox)
+                self.last_confidence = float(match[1])
+                return True, det_bbox
+
+        if not trusted:
+            return False, None
+        self.last_bbox = box
+        # Между проверками YOLO уверенность не оценивается
+        self.last_confidence = None
+        return True, box
+
+    def _anchor(self, frame: np.ndarray, bbox: tuple):
+        """(Пере)инициализация CSRT по известному bbox"""
+        self.tracker = cv2.TrackerCSRT_create()
+        self.tracker.init(frame, bbox)
+        self.last_bbox = bbox
+        self._frames_since_anchor = 0
+        self._anchor_area = bbox[2] * bbox[3] or None
@@ -0,0 +1,28 @@
+import cv2
+
+from src.cv.opencv_tracker import OpenCVTracker
+from src.cv.tracker_registry import BackendTraits, register_backend
+
+
+@register_backend("kcf", "KCF", BackendTraits(
+    speed=BackendTraits.HIGH, accuracy=BackendTraits.MEDIUM,
+    description="Быстрый, требует ручной инициализации, не следит за размером объекта.",
+))
+class KCFTracker(OpenCVTracker):
+    """
+    Kernelized Correlation Filters из OpenCV.
+    В несколько раз быстрее CSRT, но bbox не меняет размер
+    и хуже переносит перекрытия. Работает на уменьшенном цветном кадре:
+    с параметрами по умолчанию KCF строит цветовые признаки (CN)
+    и не принимает одноканальное изображение.
+    """
+
+    MAX_SIDE = 480
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return hasattr(cv2, "TrackerKCF_create")
+
+    @staticmethod
+    def _create():
+        return cv2.TrackerKCF_create()
@@ -0,0 +1,31 @@
+import threading
+from typing import Callable, Dict, Tuple
+
+# Загруженные модели процесса: (вид, путь) -> объект модели
+_models: Dict[Tuple[str, str], object] = {}
+_lock = threading.Lock()
+
+
+def get_model(kind: str, path, loader: Callable):
+    """
+    Модель из кэша процесса; при первом обращении загружается через loader(path).
+    Повторный выбор того же трекера не перечитывает веса с диска.
+    Ошибка загрузки не кэшируется: следующий вызов попробует снова.
+    """
+    key = (kind, str(path))
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            model = loader(path)
+            _models[key] = model
+        return model
+
+
+def is_loaded(kind: str, path) -> bool:
+    return (kind, str(path)) in _models
+
+
+def clear_models():
+    """Освобождает все загруженные модели"""
+    with _lock:
+        _models.clear()
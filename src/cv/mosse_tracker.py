@@ -0,0 +1,27 @@
+import cv2
+
+from src.cv.opencv_tracker import OpenCVTracker
+from src.cv.tracker_registry import BackendTraits, register_backend
+
+
+@register_backend("mosse", "MOSSE", BackendTraits(
+    speed=BackendTraits.HIGH, accuracy=BackendTraits.LOW,
+    description="Самый быстрый, требует ручной инициализации, для контрастного объекта.",
+))
+class MOSSETracker(OpenCVTracker):
+    """
+    MOSSE из OpenCV (есть только в legacy-части модуля tracking).
+    Сотни кадров в секунду, но легко срывается при смене освещения и формы.
+    Работает на уменьшенном кадре в оттенках серого.
+    """
+
+    MAX_SIDE = 480
+    GRAYSCALE = True
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return hasattr(cv2, "legacy") and hasattr(cv2.legacy, "TrackerMOSSE_create")
+
+    @staticmethod
+    def _create():
+        return cv2.legacy.TrackerMOSSE_create()
@@ -0,0 +1,72 @@
+import cv2
+import numpy as np
+
+# Доля пикселей окна, изменившихся с прошлого настоящего обновления,
+# ниже которой кадр считается статичным
+MOTION_THRESHOLD = 0.02
+# Изменение яркости пикселя (0-255), которое не считается шумом сжатия
+MOTION_PIXEL_DIFF = 16
+# Не больше стольких пропущенных кадров подряд: потом трекер обновляется в любом случае
+MOTION_MAX_SKIP = 30
+# Окно вокруг bbox (с запасом на выход объекта) сравнивается в таком размере
+MOTION_ROI_SIDE = 32
+MOTION_ROI_MARGIN = 0.25
+
+
+class MotionGate:
+    """
+    Дешевая проверка "объект не двигался" перед трекером.
+
+    Окно вокруг bbox сравнивается (absdiff) с тем же окном на кадре
+    последнего настоящего обновления трекера, в оттенках серого и
+    уменьшенным до MOTION_ROI_SIDE. Сравнение идет с опорным кадром,
+    а не с предыдущим, поэтому медленное движение накапливается и
+    тоже замечается.
+    """
+
+    def __init__(self, threshold: float = MOTION_THRESHOLD, max_skip: int = MOTION_MAX_SKIP):
+        self.threshold = threshold
+        self.max_skip = max_skip
+        self.reference = None
+        self.bbox = None
+        self.skipped = 0
+
+    def reset(self):
+        self.reference = None
+        self.bbox = None
+        self.skipped = 0
+
+    def set_reference(self, frame: np.ndarray, bbox):
+        """Кадр и bbox (координаты кадра) настоящего обновления трекера"""
+        self.bbox = tuple(int(v) for v in bbox)
+        self.reference = self._roi(frame, self.bbox)
+        self.skipped = 0
+
+    def is_static(self, frame: np.ndarray) -> bool:
+        """True - обновление трекера можно пропустить и оставить прошлый bbox"""
+        if self.reference is None or self.skipped >= self.max_skip:
+            return False
+        roi = self._roi(frame, self.bbox)
+        if roi is None:
+            return False
+        changed = cv2.countNonZero(cv2.threshold(cv2.absdiff(roi, self.reference), MOTION_PIXEL_DIFF, 255,
+                                                 cv2.THRESH_BINARY)[1])
+        if changed >= self.threshold * roi.size:
+            return False
+        self.skipped += 1
+        return True
+
+    @staticmethod
+    def _roi(frame: np.ndarray, bbox):
+        x, y, w, h = bbox
+        if w <= 0 or h <= 0:
+            return None
+        mx, my = int(w * MOTION_ROI_MARGIN), int(h * MOTION_ROI_MARGIN)
+        x1, y1 = max(0, x - mx), max(0, y - my)
+        x2, y2 = min(frame.shape[1], x + w + mx), min(frame.shape[0], y + h + my)
+        if x2 <= x1 or y2 <= y1:
+            return None
+        roi = frame[y1:y2, x1:x2]
+        if roi.ndim == 3:
+            roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(roi, (MOTION_ROI_SIDE, MOTION_ROI_SIDE), interpolation=cv2.INTER_AREA)
@@ -0,0 +1,36 @@
+import cv2
+
+from src.config import get_resource_path
+from src.cv.opencv_tracker import OpenCVTracker
+from src.cv.tracker_registry import BackendTraits, register_backend
+
+# Модели NanoTrack из OpenCV Zoo; в сборку не входят, кладутся в resources
+NANO_BACKBONE = "nanotrack_backbone_sim.onnx"
+NANO_NECKHEAD = "nanotrack_head_sim.onnx"
+
+
+@register_backend("nano", "NanoTrack", BackendTraits(
+    speed=BackendTraits.HIGH, accuracy=BackendTraits.MEDIUM,
+    needs_model=True,
+    description="Быстрый нейросетевой трекер, требует ручной инициализации.",
+))
+class NanoTracker(OpenCVTracker):
+    """
+    Сиамский трекер NanoTrack (cv2.dnn): быстрее CSRT и устойчивее KCF
+    к смене формы. Доступен, только если модели лежат в resources.
+    """
+
+    MAX_SIDE = 640
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return (hasattr(cv2, "TrackerNano_create")
+                and get_resource_path(NANO_BACKBONE).exists()
+                and get_resource_path(NANO_NECKHEAD).exists())
+
+    @staticmethod
+    def _create():
+        params = cv2.TrackerNano_Params()
+        params.backbone = str(get_resource_path(NANO_BACKBONE))
+        params.neckhead = str(get_resource_path(NANO_NECKHEAD))
+        return cv2.TrackerNano_create(params)
@@ -0,0 +1,250 @@
+import threading
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.cv.model_cache import get_model
+
+try:
+    import onnxruntime as ort
+    from onnxruntime.capi.onnxruntime_pybind11_state import Fail, InvalidArgument
+    # Ошибки прохода сети на неподходящем входе (размер пачки или кадра)
+    INFERENCE_ERRORS = (cv2.error, Fail, InvalidArgument)
+except ImportError:
+    ort = None
+    INFERENCE_ERRORS = (cv2.error,)
+
+# Чем выполняется проход сети
+RUNTIME_OPENCV = "opencv"
+RUNTIME_ONNXRUNTIME = "onnxruntime"
+RUNTIMES = (RUNTIME_OPENCV, RUNTIME_ONNXRUNTIME)
+# Варианты весов: best.onnx, рядом best.fp16.onnx и best.int8.onnx (scripts/benchmark_inference.py --quantize)
+PRECISIONS = ("fp32", "fp16", "int8")
+# (runtime, потоков (0 - как у OpenCV в процессе), точность весов)
+DEFAULT_INFERENCE = (RUNTIME_OPENCV, 0, "fp32")
+
+# Порог IoU для подавления перекрывающихся детекций (NMS)
+NMS_IOU_THRESHOLD = 0.45
+
+# Детекция в окрестности прошлого bbox (ROI):
+# размер входа сети для вырезанного окна
+ROI_INPUT_SIZE = (320, 320)
+# На сколько размеров bbox окно расширяется в каждую сторону (запас на движение)
+ROI_MOTION_MARGIN = 1.0
+# Ниже этой уверенности результат по окну перепроверяется по всему кадру
+ROI_MIN_CONFIDENCE = 0.5
+
+
+def bbox_iou_many(box, boxes: np.ndarray) -> np.ndarray:
+    """IoU одного bbox (x, y, w, h) со всеми bbox массива Nx4"""
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[0] + box[2], boxes[:, 0] + boxes[:, 2])
+    y2 = np.minimum(box[1] + box[3], boxes[:, 1] + boxes[:, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    union = box[2] * box[3] + boxes[:, 2] * boxes[:, 3] - inter
+    return inter / (union + 1e-6)
+
+
+def model_variant(model_path, precision: str = "fp32") -> str:
+    """Путь к весам нужной точности (best.int8.onnx рядом с best.onnx); если их нет - исходная модель"""
+    path = Path(model_path)
+    if precision != "fp32":
+        variant = path.with_suffix(f".{precision}.onnx")
+        if variant.exists():
+            return str(variant)
+    return str(path)
+
+
+def load_detector(model_path, inference: tuple = None) -> "ONNXTracker":
+    """
+    ONNXTracker из кэша процесса. inference - (runtime, threads, precision),
+    см. Project.inference; None - cv2.dnn и исходные веса. Вариант весов,
+    который не загрузился (например, INT8-операции не поддерживаются cv2.dnn),
+    заменяется исходной моделью.
+    """
+    runtime, threads, precision = inference or DEFAULT_INFERENCE
+    kind = f"onnx/{runtime}/{threads}"
+    path = model_variant(model_path, precision)
+    try:
+        return get_model(kind, path, lambda p: ONNXTracker(p, runtime=runtime, threads=threads))
+    except Exception as e:
+        if path == str(model_path):
+            raise
+        print(f"Failed to load {precision} model {path}, using {model_path}: {e}")
+        return get_model(kind, model_path, lambda p: ONNXTracker(p, runtime=runtime, threads=threads))
+
+
+class ONNXTracker:
+    """
+    Детектор YOLO (ONNX). Один экземпляр на модель разделяется
+    всеми трекерами процесса (см. model_cache), поэтому проход сети
+    выполняется под блокировкой.
+
+    Проход сети - на cv2.dnn или (runtime="onnxruntime", если пакет
+    установлен) в сессии ONNX Runtime на CPU: с полной оптимизацией графа
+    и своим числом потоков, не зависящим от потоков OpenCV.
+    """
+
+    def __init__(self, model_path, conf_threshold=0.3, runtime: str = RUNTIME_OPENCV, threads: int = 0):
+        self.model_path = model_path
+        self.conf_threshold = conf_threshold
+        if runtime == RUNTIME_ONNXRUNTIME and ort is None:
+            print("onnxruntime is not installed, using cv2.dnn")
+        self.runtime = RUNTIME_ONNXRUNTIME if runtime == RUNTIME_ONNXRUNTIME and ort is not None else RUNTIME_OPENCV
+        # Потоков на проход сети (ONNX Runtime); 0 - сколько отведено OpenCV в процессе
+        self.threads = max(0, int(threads or 0))
+        self.net = None
+        self.session = None
+        self._input_name = None
+        self._input_dtype = np.float32
+        self.input_size = (640, 640)
+        self.roi_input_size = ROI_INPUT_SIZE
+        self.last_bbox = None
+        # Сбрасывается, если модель экспортирована с фиксированным batch=1
+        self.batch_supported = True
+        self._lock = threading.RLock()
+        self._load_model()
+
+    def _load_model(self):
+        if self.runtime == RUNTIME_ONNXRUNTIME:
+            self._load_session()
+            return
+        self.net = cv2.dnn.readNet(self.model_path)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+
+    def _load_session(self):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        # В воркерах пакетного режима потоки OpenCV уже поделены между процессами
+        options.intra_op_num_threads = self.threads or max(1, cv2.getNumThreads())
+        options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(str(self.model_path), options, providers=["CPUExecutionProvider"])
+
+        model_input = self.session.get_inputs()[0]
+        self._input_name = model_input.name
+        if model_input.type == "tensor(float16)":
+            self._input_dtype = np.float16
+        # Размеры, заданные числом, зафиксированы при экспорте модели
+        batch, _, height, width = model_input.shape
+        if isinstance(batch, int):
+            self.batch_supported = False
+        if isinstance(height, int) and isinstance(width, int):
+            self.input_size = (width, height)
+            self.roi_input_size = self.input_size
+
+    def _forward(self, blob):
+        with self._lock:
+            if self.session is not None:
+                return self.session.run(None, {self._input_name: blob.astype(self._input_dtype, copy=False)})
+            self.net.setInput(blob)
+            return self.net.forward(self.net.getUnconnectedOutLayersNames())
+
+    def _preprocess(self, frame, input_size=None):
+        blob = cv2.dnn.blobFromImage(
+            frame, 1/255.0, input_size or self.input_size, swapRB=True, crop=False
+        )
+        return blob
+
+    def _postprocess(self, outputs, orig_shape, input_size=None):
+        """
+        Кандидаты одного кадра после NMS, по убыванию уверенности:
+        (bbox Nx4 [x, y, w, h] в координатах кадра, уверенности N).
+        Все операции над якорями векторные: по порогу уверенности
+        маской отсекается почти все до какой-либо обработки.
+        """
+        output = np.asarray(outputs[0])
+        if output.ndim == 3:
+            output = output[0]
+
+        if output.ndim != 2 or output.shape[0] < 5:
+            return np.empty((0, 4), np.float32), np.empty(0, np.float32)
+
+        mask = output[4] >= self.conf_threshold
+        if not mask.any():
+            return np.empty((0, 4), np.float32), np.empty(0, np.float32)
+
+        cx, cy, w, h, confs = output[:5, mask]
+        boxes = np.stack([cx - w / 2, cy - h / 2, w, h], axis=1)
+
+        # NMS получает массивы целиком и возвращает индексы по убыванию уверенности
+        keep = np.asarray(cv2.dnn.NMSBoxes(boxes, confs, self.conf_threshold, NMS_IOU_THRESHOLD)).reshape(-1)
+        boxes, confs = boxes[keep], confs[keep]
+
+        # Из входа сети обратно в координаты кадра
+        in_w, in_h = input_size or self.input_size
+        orig_h, orig_w = orig_shape
+        boxes *= np.array([orig_w / in_w, orig_h / in_h] * 2, dtype=np.float32)
+        return boxes, confs
+
+    def detect_all(self, frame):
+        """Все детекции кадра: (bbox Nx4, уверенности N), лучшая - первая"""
+        outputs = self._forward(self._preprocess(frame))
+        return self._postprocess(outputs, frame.shape[:2])
+
+    def roi_around(self, bbox, frame_shape):
+        """
+        Квадратное окно (x, y, w, h) вокруг bbox с запасом на движение,
+        не меньше входа сети (маленький объект не растягивается).
+        None - если окно почти во весь кадр и выигрыша не будет.
+        """
+        frame_h, frame_w = frame_shape[:2]
+        x, y, w, h = bbox
+        side = int(max(w, h) * (1 + 2 * ROI_MOTION_MARGIN))
+        side = max(side, self.roi_input_size[0])
+        if side >= min(frame_w, frame_h):
+            return None
+
+        cx, cy = x + w / 2, y + h / 2
+        x0 = int(min(max(cx - side / 2, 0), frame_w - side))
+        y0 = int(min(max(cy - side / 2, 0), frame_h - side))
+        return x0, y0, side, side
+
+    def detect_roi(self, frame, roi):
+        """detect_all по окну roi (x, y, w, h) на уменьшенном входе сети"""
+        x0, y0, w, h = roi
+        crop = frame[y0:y0 + h, x0:x0 + w]
+        try:
+            outputs = self._forward(self._preprocess(crop, self.roi_input_size))
+        except INFERENCE_ERRORS:
+            if self.roi_input_size == self.input_size:
+                raise
+            # Модель с фиксированным размером входа: окно подается в полном размере
+            self.roi_input_size = self.input_size
+            return self.detect_roi(frame, roi)
+
+        boxes, confs = self._postprocess(outputs, crop.shape[:2], self.roi_input_size)
+        boxes[:, 0] += x0
+        boxes[:, 1] += y0
+        return boxes, confs
+
+    def detect_batch(self, frames):
+        """
+        detect_all для нескольких кадров одним проходом сети.
+        Если модель не принимает пачку, кадры обрабатываются по одному.
+        """
+        if len(frames) > 1 and self.batch_supported:
+            blob = cv2.dnn.blobFromImages(
+                frames, 1/255.0, self.input_size, swapRB=True, crop=False
+            )
+            try:
+                outputs = self._forward(blob)
+                output = np.asarray(outputs[0])
+            except INFERENCE_ERRORS:
+                output = None
+
+            if output is not None and output.ndim == 3 and output.shape[0] == len(frames):
+                return [self._postprocess([output[i]], frame.shape[:2]) for i, frame in enumerate(frames)]
+            self.batch_supported = False
+
+        return [self.detect_all(frame) for frame in frames]
+
+    def detect(self, frame):
+        boxes, _ = self.detect_all(frame)
+        if len(boxes):
+            return True, tuple(int(v) for v in boxes[0])
+        return False, None
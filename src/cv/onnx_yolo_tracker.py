@@ -0,0 +1,135 @@
+import numpy as np
+
+from src.config import get_resource_path
+from src.cv.base_tracker import BaseTracker
+from src.cv.onnx_detector import ROI_MIN_CONFIDENCE, bbox_iou_many, load_detector
+from src.cv.tracker_registry import BackendTraits, register_backend
+
+# Минимальный IoU с прошлым bbox, чтобы детекция считалась тем же объектом
+ASSOCIATION_MIN_IOU = 0.1
+
+
+def default_model_path() -> str:
+    return str(get_resource_path("best.onnx"))
+
+
+@register_backend("yolo", "YOLO", BackendTraits(
+    speed=BackendTraits.LOW, accuracy=BackendTraits.HIGH,
+    can_autostart=True, recovers=True, needs_model=True,
+    description="Автоматический поиск, поддерживает дообучение.",
+))
+class ONNXYoloTracker(BaseTracker):
+    """
+    Трекинг детекцией: YOLO (ONNX) на каждом кадре, из кандидатов берется
+    ближайший к прошлому bbox. Сеть загружается при первом использовании
+    и одна на процесс для всех трекеров с той же моделью.
+    """
+
+    def __init__(self, model_path=None, use_roi=True, inference: tuple = None, **options):
+        super().__init__(**options)
+        self.model_path = model_path or default_model_path()
+        # Детекция в окне вокруг прошлого bbox вместо всего кадра
+        self.use_roi = use_roi
+        # (runtime, threads, precision) прохода сети, см. load_detector
+        self.inference = inference
+        self._detector = None
+        self._load_failed = False
+
+    def load(self) -> bool:
+        if self._detector is None and not self._load_failed:
+            try:
+                self._detector = load_detector(self.model_path, self.inference)
+            except Exception as e:
+                print(f"Failed to load ONNX model: {e}")
+                self._load_failed = True
+        return self._detector is not None
+
+    @property
+    def detector(self):
+        """ONNXTracker (None - модель не загрузилась)"""
+        self.load()
+        return self._detector
+
+    def init(self, frame, bbox):
+        self.last_bbox = bbox
+
+    def update(self, frame):
+        if self.detector is None:
+            return False, None
+
+        if self.last_bbox is not None:
+            match = self._detect_near(frame, self.last_bbox)
+            if match is None:
+                self.last_confidence = 0.0
+                return False, self.last_bbox
+            return self._accept(*match)
+
+        # Автозапуск: самая уверенная детекция кадра
+        boxes, confs = self.detector.detect_all(frame)
+        if len(boxes):
+            return self._accept(boxes[0], confs[0])
+        return False, None
+
+    @property
+    def supports_batch(self) -> bool:
+        # Окно ROI зависит от результата прошлого кадра, поэтому с ним пачки не собрать
+        return not self.use_roi and self.detector is not None
+
+    def update_batch(self, frames):
+        """
+        Детекция идет одним проходом сети на всю пачку, а сопоставление
+        с прошлым bbox - по кадрам, по порядку.
+        """
+        if not self.supports_batch or self.last_bbox is None:
+            return super().update_batch(frames)
+
+        results = []
+        self.batch_confidences = []
+        for boxes, confs in self.detector.detect_batch(frames):
+            results.append(self._associate(boxes, confs))
+            self.batch_confidences.append(self.last_confidence)
+            if not results[-1][0]:
+                break
+        return results
+
+    def _detect_near(self, frame: np.ndarray, ref_bbox):
+        """
+        Детекция YOLO, ближайшая к ref_bbox: сначала в окне вокруг него,
+        потом (если в окне не нашлось или уверенность низкая) по всему кадру.
+        (bbox, уверенность) или None - совпадений нет.
+        """
+        roi = self.detector.roi_around(ref_bbox, frame.shape) if self.use_roi else None
+        if roi is not None:
+            boxes, confs = self.detector.detect_roi(frame, roi)
+            best = self._best_match(boxes, ref_bbox)
+            if best is not None and confs[best] >= ROI_MIN_CONFIDENCE:
+                return boxes[best], confs[best]
+            # Объект вышел из окна или уверенность упала - ищем по всему кадру
+
+        boxes, confs = self.detector.detect_all(frame)
+        best = self._best_match(boxes, ref_bbox)
+        return (boxes[best], confs[best]) if best is not None else None
+
+    def _associate(self, boxes, confs):
+        """Из всех кандидатов берется тот, что ближе всего к прошлому bbox"""
+        best = self._best_match(boxes, self.last_bbox)
+        if best is None:
+            self.last_confidence = 0.0
+            return False, self.last_bbox
+        return self._accept(boxes[best], confs[best])
+
+    def _best_match(self, boxes, ref_bbox):
+        """Индекс кандидата с наибольшим IoU с ref_bbox (None - совпадений нет)"""
+        if not len(boxes):
+            return None
+        ious = bbox_iou_many(ref_bbox, boxes)
+        best = int(np.argmax(ious))
+        if ious[best] < ASSOCIATION_MIN_IOU:
+            return None
+        return best
+
+    def _accept(self, box, conf):
+        best_bbox = tuple(int(v) for v in box)
+        self.last_bbox = best_bbox
+        self.last_confidence = float(conf)
+        return True, best_bbox
@@ -0,0 +1,53 @@
+from abc import abstractmethod
+
+from src.cv.base_tracker import BaseTracker
+from src.cv.frame_scaler import FrameScaler
+
+
+class OpenCVTracker(BaseTracker):
+    """
+    Общая часть трекеров из модуля tracking OpenCV (CSRT, KCF, MOSSE, ...).
+    Быстрые трекеры работают на уменьшенном кадре (MAX_SIDE) и, если
+    умеют, в оттенках серого; bbox пересчитывается в координаты кадра.
+    """
+
+    # Длинная сторона кадра, на котором работает трекер (None - исходный размер)
+    MAX_SIDE = None
+    # Подавать трекеру кадр в оттенках серого
+    GRAYSCALE = False
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.tracker = None
+        self.scaler = FrameScaler(self.MAX_SIDE, grayscale=self.GRAYSCALE)
+
+    @staticmethod
+    @abstractmethod
+    def _create():
+        """Новый трекер OpenCV (cv2.TrackerCSRT_create() и т.п.)"""
+
+    def reset(self):
+        super().reset()
+        self.tracker = None
+
+    def init(self, frame, bbox):
+        # В OpenCV трекеры нужно пересоздавать при новой инициализации
+        self.tracker = self._create()
+        self.scaler.fit(frame.shape)
+        self.tracker.init(self.scaler.prepare(frame), self.scaler.to_small(bbox))
+        self.last_bbox = bbox
+
+    def update(self, frame):
+        if self.tracker is None:
+            return False, None
+
+        success, bbox = self.tracker.update(self.scaler.prepare(frame))
+        if not success:
+            self.last_confidence = None
+            return False, None
+        # OpenCV возвращает float, приводим к int для удобства UI
+        self.last_bbox = self.scaler.to_full(bbox)
+        # NanoTrack/DaSiamRPN оценивают совпадение с образцом; CSRT/KCF возвращают -1
+        score = self.tracker.getTrackingScore() if hasattr(self.tracker, "getTrackingScore") else -1.0
+        self.last_confidence = float(min(score, 1.0)) if score >= 0 else None
+        return True, self.last_bbox
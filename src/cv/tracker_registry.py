@@ -0,0 +1,102 @@
+import importlib
+from typing import Dict, List, Optional
+
+# Модули встроенных бэкендов: регистрируются при первом обращении к реестру
+BUILTIN_BACKENDS = [
+    "src.cv.csrt_tracker",
+    "src.cv.kcf_tracker",
+    "src.cv.mosse_tracker",
+    "src.cv.nano_tracker",
+    "src.cv.dasiamrpn_tracker",
+    "src.cv.background_tracker",
+    "src.cv.onnx_yolo_tracker",
+    "src.cv.hybrid_tracker",
+    "src.cv.yolo_tracker",
+]
+
+
+class BackendTraits:
+    """Характеристики бэкенда для выбора трекера и подсказок в интерфейсе"""
+
+    # Оценки скорости и точности
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+
+    def __init__(self, speed: int, accuracy: int,
+                 can_autostart: bool = False,
+                 recovers: bool = False,
+                 needs_model: bool = False,
+                 description: str = ""):
+        self.speed = speed
+        self.accuracy = accuracy
+        # Сам находит объект на кадре, без начального bbox
+        self.can_autostart = can_autostart
+        # Может снова найти объект после потери
+        self.recovers = recovers
+        # Нужны веса модели (загружаются при первом использовании)
+        self.needs_model = needs_model
+        self.description = description
+
+
+class BackendInfo:
+    def __init__(self, name: str, label: str, cls, traits: BackendTraits):
+        self.name = name
+        self.label = label
+        self.cls = cls
+        self.traits = traits
+
+    @property
+    def is_available(self) -> bool:
+        return self.cls.is_available()
+
+
+_backends: Dict[str, BackendInfo] = {}
+_builtins_loaded = False
+
+
+def register_backend(name: str, label: str, traits: BackendTraits):
+    """Декоратор класса-трекера (наследника BaseTracker): добавляет его в реестр под именем name"""
+
+    def decorator(cls):
+        info = BackendInfo(name.lower(), label, cls, traits)
+        cls.name = info.name
+        cls.label = label
+        cls.traits = traits
+        _backends[info.name] = info
+        return cls
+
+    return decorator
+
+
+def _load_builtins():
+    global _builtins_loaded
+    if _builtins_loaded:
+        return
+    _builtins_loaded = True
+    for module in BUILTIN_BACKENDS:
+        importlib.import_module(module)
+
+
+def get_backend(name: str) -> Optional[BackendInfo]:
+    _load_builtins()
+    return _backends.get((name or "").lower())
+
+
+def available_backends() -> List[BackendInfo]:
+    """Бэкенды, которые можно создать в этом окружении, в порядке регистрации"""
+    _load_builtins()
+    return [info for info in _backends.values() if info.is_available]
+
+
+def create_backend(name: str, **options):
+    """
+    Новый экземпляр трекера name. options (model_path, use_roi, ...) передаются
+    конструктору бэкенда; модели берутся из кэша процесса.
+    """
+    info = get_backend(name)
+    if info is None:
+        raise ValueError(f"Unknown tracker type: {name}")
+    if not info.is_available:
+        raise ValueError(f"Tracker is not available: {name}")
+    return info.cls(**options)
@@ -1,4 +1,6 @@
 from src.cv.base_tracker import BaseTracker
+from src.cv.model_cache import get_model
+from src.cv.tracker_registry import BackendTraits, register_backend
 
 try:
     from ultralytics import YOLO
@@ -6,21 +8,38 @@ except ImportError:
     YOLO = None
 
 
+@register_backend("ultralytics", "YOLO (ultralytics)", BackendTraits(
+    speed=BackendTraits.LOW, accuracy=BackendTraits.HIGH,
+    needs_model=True,
+    description="Модель ultralytics (.pt), требует начального bbox.",
+))
 class YOLOTracker(BaseTracker):
-    def __init__(self, model_path='yolov8n.pt'):
+    def __init__(self, model_path=None, **options):
         if YOLO is None: raise ImportError("Install ultralytics: pip install ultralytics")
-        self.model = YOLO(model_path)
-        self.last_bbox = None
+        super().__init__(**options)
+        self.model_path = model_path or 'yolov8n.pt'
+        self.model = None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return YOLO is not None
+
+    def load(self) -> bool:
+        if self.model is None:
+            self.model = get_model("ultralytics", self.model_path, YOLO)
+        return True
 
     def init(self, frame, bbox):
         self.last_bbox = bbox  # Просто запоминаем, что искать
 
     def update(self, frame):
-        if self.last_bbox is None: return False, (0, 0, 0, 0)
+        if self.last_bbox is None: return False, None
+        self.load()
         # Упрощенная логика: ищем объект с максимальным IoU с предыдущим кадром
         results = self.model(frame, verbose=False, conf=0.3)
         best_iou = 0
         best_bbox = self.last_bbox
+        best_conf = None
         found = False
 
         for r in results:
@@ -31,11 +50,14 @@ class YOLOTracker(BaseTracker):
                 if iou > best_iou:
                     best_iou = iou
                     best_bbox = curr_box
+                    best_conf = float(box.conf[0])
                     found = True
 
         if found or best_iou > 0.1:
             self.last_bbox = best_bbox
+            self.last_confidence = best_conf
             return True, best_bbox
+        self.last_confidence = 0.0
         return False, self.last_bbox
 
     def _get_iou(self, boxA, boxB):
@@ -0,0 +1,568 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+
+from src.core import KeyframeIndex, Video, reader_pool
+from src.core.frame_buffer import DecodeAheadReader
+from src.core.mor_parser.frame_block import FrameSequence
+from src.core.multi_tracker import MultiTracker
+from src.core.project import Project
+from src.core.tracker import TrackerWrapper, track_batches, has_size, DEFAULT_BATCH_SIZE
+from src.services.geometry_storage import GeometryStorageService
+from src.services.statistics_service import StatisticsService
+
+# Сколько кадров декодер готовит заранее, пока трекер занят
+DECODE_AHEAD_FRAMES = 16
+# Видео считается размеченным, если трекинг покрыл все кадры, кроме последних N
+# (то же правило, что и в экране разметки)
+FINISHED_FRAMES_MARGIN = 5
+# Как часто (в кадрах) сообщать о прогрессе
+PROGRESS_EVERY_FRAMES = 50
+
+# Параллельный трекинг одного видео по кускам:
+# на сколько кадров кусок заходит в следующий (для сшивки)
+CHUNK_OVERLAP_FRAMES = 50
+# Сколько кадров от начала куска YOLO ищет объект для старта
+CHUNK_SEED_SEARCH_FRAMES = 25
+# Минимальный IoU, при котором куски считаются согласованными в зоне перекрытия
+CHUNK_STITCH_IOU = 0.5
+
+# Участки трека, которые стоит проверить вручную: уверенность трекера
+# ниже порога хотя бы столько кадров подряд
+LOW_CONFIDENCE_THRESHOLD = 0.5
+LOW_CONFIDENCE_MIN_FRAMES = 5
+
+
+class BatchResult:
+    """Итог трекинга одного видео"""
+
+    def __init__(self, video_name: str, total_frames: int = 0):
+        self.video_name = video_name
+        self.total_frames = total_frames
+        self.tracked_frames = 0
+        self.start_frame = 0
+        self.last_frame: Optional[int] = None
+        self.lost_at: Optional[int] = None
+        self.is_finished = False
+        self.skipped = False
+        self.error: Optional[str] = None
+        self.elapsed = 0.0
+        # Несколько животных: {имя трека: кадров в треке}
+        self.tracks: Dict[str, int] = {}
+        # Отрезки (первый, последний кадр) с низкой уверенностью трекера;
+        # для нескольких животных - отрезки всех треков по порядку
+        self.low_confidence: List[Tuple[int, int]] = []
+        # Несколько животных: {имя трека: отрезки с низкой уверенностью}
+        self.tracks_low_confidence: Dict[str, List[Tuple[int, int]]] = {}
+
+    @property
+    def fps(self) -> float:
+        """Скорость трекинга в этом запуске, кадров в секунду"""
+        if self.last_frame is None or self.elapsed <= 0:
+            return 0.0
+        return (self.last_frame - self.start_frame + 1) / self.elapsed
+
+
+class BatchTrackingService:
+    """
+    Пакетный трекинг видео проекта без UI.
+
+    Трекер стартует с первого кадра: с заданного bbox, с разметки первого
+    кадра из .mor видео или (для YOLO) с автопоиска объекта. Видео
+    проходится до конца или до потери объекта; результат вместе со
+    статистикой зон пишется в .mor через GeometryStorageService.
+
+    Трекинг можно продолжить с кадра start_frame, если для него в .mor
+    уже есть bbox (так планировщик возобновляет задания после сбоя);
+    промежуточные результаты при этом сохраняются каждые checkpoint_every кадров.
+    """
+
+    def __init__(self, project: Project,
+                 model_type: str = "yolo",
+                 model_path: str = None,
+                 seed_bbox: tuple = None,
+                 overwrite: bool = False,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 use_roi: bool = True,
+                 scale: float = None,
+                 max_side: int = None,
+                 max_gap: int = None,
+                 motion_threshold: float = None,
+                 inference: tuple = None,
+                 progress_callback: Callable[[str, int, int], None] = None):
+        self.project = project
+        self.model_type = model_type
+        self.model_path = model_path
+        self.seed_bbox = tuple(map(int, seed_bbox)) if seed_bbox else None
+        # Перезаписывать видео, уже отмеченные как размеченные
+        self.overwrite = overwrite
+        # Кадров за один проход сети (YOLO); пачки собираются только без ROI
+        self.batch_size = batch_size
+        # YOLO: детекция в окне вокруг прошлого bbox
+        self.use_roi = use_roi
+        # Масштаб кадра для трекера; по умолчанию - из настроек проекта
+        project_scale, project_max_side = project.tracking_scale
+        self.scale = scale or project_scale
+        self.max_side = max_side or project_max_side
+        # Заполнение коротких пропусков трека (в статистике и в .mor)
+        project_max_gap, interpolation = project.gap_filling
+        self.gap_filling = (project_max_gap if max_gap is None else max_gap, interpolation)
+        # Пропуск обновлений трекера на кадрах без движения (MotionGate); 0 - нет
+        self.motion_threshold = project.motion_threshold if motion_threshold is None else motion_threshold
+        # (runtime, threads, precision) для YOLO; по умолчанию - из настроек проекта
+        self.inference = inference or project.inference
+        # (имя видео, кадр, всего кадров)
+        self.progress_callback = progress_callback
+        self.storage = GeometryStorageService(project.path, project.track_storage, self.gap_filling)
+
+    def run(self, video_names: List[str] = None) -> List[BatchResult]:
+        results = []
+        for video in self.project.videos:
+            if video_names and video.path.name not in video_names:
+                continue
+            results.append(self.track_video(video))
+        return results
+
+    def track_video(self, video: Video, start_frame: int = 0,
+                    checkpoint_every: int = 0,
+                    checkpoint_callback: Callable[[int], None] = None) -> BatchResult:
+        """
+        :param start_frame: продолжить с этого кадра (нужен bbox в .mor), иначе с начала
+        :param checkpoint_every: сохранять промежуточный результат каждые N кадров (0 - нет)
+        :param checkpoint_callback: вызывается с последним сохраненным кадром
+        """
+        result = BatchResult(video.path.name)
+        started = time.monotonic()
+
+        try:
+            existing, zones, is_marked = self.storage.load_tracking(video.path)
+            if is_marked and not self.overwrite:
+                result.skipped = True
+                return result
+
+            info = reader_pool.probe(video.path)
+            result.total_frames = info.total_frames
+            zones_snapshot = StatisticsService.prepare_stat_blocks_snapshot(zones)
+
+            if start_frame > 0 and has_size(existing.get(start_frame)):
+                # Продолжение: кадры до start_frame уже сохранены
+                tracking_data = {k: v for k, v in existing.items() if k <= start_frame}
+                confidence_data = {k: v for k, v in self.storage.load_confidence(video.path).items()
+                                   if k <= start_frame}
+            else:
+                start_frame = 0
+                tracking_data = {}
+                confidence_data = {}
+            result.start_frame = start_frame
+
+            def checkpoint(frame_idx: int):
+                self._save(video, info, zones_snapshot, tracking_data, False, confidence_data)
+                if checkpoint_callback:
+                    checkpoint_callback(frame_idx)
+
+            self._track(video, info, start_frame, existing.get(start_frame), tracking_data, result,
+                        checkpoint_every, checkpoint if checkpoint_every > 0 else None, confidence_data)
+
+            self._finish(video, info, zones_snapshot, tracking_data, result, confidence_data)
+
+        except Exception as e:
+            result.error = str(e)
+        finally:
+            result.elapsed = time.monotonic() - started
+
+        return result
+
+    def track_video_chunked(self, video: Video, chunks: int, workers: int = None,
+                            chunk_callback: Callable[[int, int, dict], None] = None) -> BatchResult:
+        """
+        Трекинг одного видео параллельно по кускам.
+
+        Видео делится на chunks кусков по ключевым кадрам (позиционирование
+        на начало куска точное и быстрое), каждый кусок заходит в следующий
+        на CHUNK_OVERLAP_FRAMES кадров. Первый кусок стартует как обычно,
+        остальные - с детекции YOLO на своем начале. Куски трекаются
+        в отдельных процессах и сшиваются в одну FrameSequence (stitch_chunks).
+        :param chunk_callback: (номер куска, всего кусков, разметка куска) по мере готовности
+        """
+        result = BatchResult(video.path.name)
+        started = time.monotonic()
+
+        try:
+            existing, zones, is_marked = self.storage.load_tracking(video.path)
+            if is_marked and not self.overwrite:
+                result.skipped = True
+                return result
+
+            info = reader_pool.probe(video.path)
+            result.total_frames = info.total_frames
+            zones_snapshot = StatisticsService.prepare_stat_blocks_snapshot(zones)
+
+            # Индекс строится один раз здесь, воркеры читают его из кеша
+            index = KeyframeIndex.load_or_build(video.path, self.storage.morris_dir)
+            ranges = split_into_chunks(info.total_frames, chunks, index)
+
+            first_seed = self.seed_bbox or (tuple(map(int, existing[0])) if has_size(existing.get(0)) else None)
+            options = {"model_type": self.model_type, "model_path": self.model_path,
+                       "batch_size": self.batch_size, "use_roi": self.use_roi,
+                       "scale": self.scale, "max_side": self.max_side,
+                       "motion_threshold": self.motion_threshold, "inference": self.inference,
+                       "morris_dir": str(self.storage.morris_dir)}
+
+            workers = min(len(ranges), workers or os.cpu_count() or 1)
+            cv_threads = max(1, (os.cpu_count() or 1) // workers)
+            chunk_results: List[Optional[Dict[int, tuple]]] = [None] * len(ranges)
+            chunk_confidence: List[Dict[int, float]] = [{} for _ in ranges]
+
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=init_worker_process, initargs=(cv_threads,)) as pool:
+                futures = {
+                    pool.submit(_track_chunk, str(video.path), start, end,
+                                first_seed if i == 0 else None, options): i
+                    for i, (start, end) in enumerate(ranges)
+                }
+                # Куски сообщаются по мере готовности, а не по порядку
+                for future in as_completed(futures):
+                    i = futures[future]
+                    chunk_results[i], chunk_confidence[i] = future.result()
+                    if chunk_callback:
+                        chunk_callback(i, len(ranges), chunk_results[i])
+
+            if not chunk_results[0]:
+                raise ValueError("Не удалось начать трекинг первого куска")
+
+            tracking_data = stitch_chunks(chunk_results).to_dict()
+            # Уверенность кадра - из того куска, чей bbox попал в сшитый трек
+            confidence_data = {}
+            for data, confidence in zip(chunk_results, chunk_confidence):
+                for frame_idx, value in confidence.items():
+                    if data[frame_idx] == tracking_data.get(frame_idx):
+                        confidence_data[frame_idx] = value
+            result.last_frame = max(tracking_data.keys())
+            self._finish(video, info, zones_snapshot, tracking_data, result, confidence_data)
+
+        except Exception as e:
+            result.error = str(e)
+        finally:
+            result.elapsed = time.monotonic() - started
+
+        return result
+
+    def track_video_multi(self, video: Video, animals: int, seed_bboxes: List[tuple] = None) -> BatchResult:
+        """
+        Трекинг нескольких животных (MultiTracker): один проход YOLO на кадр
+        для всех треков, каждый трек сохраняется в .mor отдельно
+        со своей статистикой зон. Без seed_bboxes треки стартуют
+        с детекций первого кадра, слева направо.
+        """
+        result = BatchResult(video.path.name)
+        started = time.monotonic()
+
+        try:
+            _, zones, is_marked = self.storage.load_tracking(video.path)
+            if is_marked and not self.overwrite:
+                result.skipped = True
+                return result
+
+            info = reader_pool.probe(video.path)
+            result.total_frames = info.total_frames
+            zones_snapshot = StatisticsService.prepare_stat_blocks_snapshot(zones)
+
+            names = [f"Животное {i + 1}" for i in range(animals)]
+            tracks_confidence = {name: {} for name in names}
+            tracks = self._track_multi(video, info, animals, seed_bboxes, names, result, tracks_confidence)
+
+            result.tracks = {name: len(data) for name, data in tracks.items()}
+            result.tracked_frames = len(set().union(*tracks.values()))
+            result.is_finished = (
+                result.total_frames > 0
+                and min(result.tracks.values()) >= result.total_frames - FINISHED_FRAMES_MARGIN
+            )
+
+            max_frame = result.last_frame or 0
+            stats = StatisticsService.calculate_tracks(tracks, zones_snapshot, info.fps, max_frame,
+                                                       *self.gap_filling)
+            self.storage.save_tracks(
+                video.path, tracks, {name: zones_stats for name, (_, zones_stats) in stats.items()},
+                result.is_finished, tracks_confidence
+            )
+            result.tracks_low_confidence = {
+                name: low_confidence_segments(confidence) for name, confidence in tracks_confidence.items()
+            }
+            result.low_confidence = sorted(
+                segment for segments in result.tracks_low_confidence.values() for segment in segments
+            )
+
+        except Exception as e:
+            result.error = str(e)
+        finally:
+            result.elapsed = time.monotonic() - started
+
+        return result
+
+    def _track_multi(self, video: Video, info, animals: int, seed_bboxes, names: List[str],
+                     result: BatchResult,
+                     tracks_confidence: Dict[str, Dict[int, float]]) -> Dict[str, Dict[int, tuple]]:
+        tracker = MultiTracker(animals, self.model_path, self.scale, self.max_side, self.inference)
+        tracks = {name: {} for name in names}
+
+        cap = reader_pool.acquire(video.path)
+        reader = DecodeAheadReader(cap, DECODE_AHEAD_FRAMES, (info.height, info.width, 3))
+        reader.start()
+        try:
+            if seed_bboxes:
+                ret, frame_idx, frame = reader.read()
+                if not ret:
+                    raise ValueError("Не удалось прочитать первый кадр")
+                tracker.init(frame, seed_bboxes)
+                for name, bbox in zip(names, seed_bboxes):
+                    tracks[name][frame_idx] = tuple(map(int, bbox))
+                result.last_frame = frame_idx
+
+            while True:
+                batch = reader.read_batch(self.batch_size)
+                if not batch:
+                    break
+                results = tracker.update_batch([frame for _, frame in batch])
+                for (frame_idx, _), bboxes, confidences in zip(batch, results, tracker.batch_confidences):
+                    for name, bbox, confidence in zip(names, bboxes, confidences):
+                        if bbox is not None:
+                            tracks[name][frame_idx] = bbox
+                            tracks_confidence[name][frame_idx] = confidence
+                    result.last_frame = frame_idx
+
+                    if self.progress_callback and frame_idx % PROGRESS_EVERY_FRAMES == 0:
+                        self.progress_callback(video.path.name, frame_idx, info.total_frames)
+        finally:
+            reader.stop()
+            reader_pool.release(video.path, cap)
+
+        if not any(tracks.values()):
+            raise ValueError("YOLO не нашел объектов")
+        return tracks
+
+    def _finish(self, video: Video, info, zones_snapshot, tracking_data: dict, result: BatchResult,
+                confidence_data: dict = None):
+        result.tracked_frames = len(tracking_data)
+        result.is_finished = (
+            result.total_frames > 0
+            and result.tracked_frames >= result.total_frames - FINISHED_FRAMES_MARGIN
+        )
+        result.low_confidence = low_confidence_segments(confidence_data or {})
+        self._save(video, info, zones_snapshot, tracking_data, result.is_finished, confidence_data)
+
+    def _save(self, video: Video, info, zones_snapshot, tracking_data: dict, is_finished: bool,
+              confidence_data: dict = None):
+        max_frame = max(tracking_data.keys()) if tracking_data else 0
+        _, zones_stats = StatisticsService.calculate(
+            tracking_data, zones_snapshot, info.fps, max_frame, *self.gap_filling
+        )
+        self.storage.save_tracking(video.path, tracking_data, zones_stats, is_finished, confidence_data)
+
+    def _track(self, video: Video, info, start_frame: int, stored_seed,
+               tracking_data: dict, result: BatchResult,
+               checkpoint_every: int = 0, checkpoint: Callable[[int], None] = None,
+               confidence_data: dict = None):
+        confidence_data = confidence_data if confidence_data is not None else {}
+        tracker = TrackerWrapper(self.model_type, self.model_path, self.batch_size, self.use_roi,
+                                 self.scale, self.max_side, self.motion_threshold, self.inference)
+        tracker.prepare_video(video.path)
+
+        cap = reader_pool.acquire(video.path)
+        reader = DecodeAheadReader(cap, DECODE_AHEAD_FRAMES, (info.height, info.width, 3))
+        if start_frame > 0:
+            # Точное позиционирование нужно, чтобы bbox совпал со своим кадром
+            reader.set_keyframe_index(KeyframeIndex.load_or_build(video.path, self.storage.morris_dir))
+            reader.seek(start_frame)
+        reader.start()
+        try:
+            ret, frame_idx, frame = reader.read()
+            if not ret:
+                raise ValueError(f"Не удалось прочитать кадр {start_frame}")
+
+            stored_seed = tuple(map(int, stored_seed)) if has_size(stored_seed) else None
+            # При продолжении трекинга bbox берется из сохраненной разметки
+            seed = stored_seed if start_frame > 0 else (self.seed_bbox or stored_seed)
+            if seed is not None:
+                tracker.init(frame, seed)
+            elif tracker.can_autostart:
+                # Автозапуск: объект ищется на первом кадре
+                success, seed = tracker.update(frame)
+                if not success:
+                    raise ValueError(f"{tracker.label}: объект не найден на первом кадре")
+                confidence_data[frame_idx] = tracker.last_confidence
+            else:
+                raise ValueError("Нет начального bbox для первого кадра")
+            tracking_data[frame_idx] = seed
+            result.last_frame = frame_idx
+
+            for frame_idx, _, success, bbox, confidence in track_batches(reader, tracker):
+                if not success:
+                    result.lost_at = frame_idx
+                    break
+                tracking_data[frame_idx] = bbox
+                confidence_data[frame_idx] = confidence
+                result.last_frame = frame_idx
+
+                if self.progress_callback and frame_idx % PROGRESS_EVERY_FRAMES == 0:
+                    self.progress_callback(video.path.name, frame_idx, info.total_frames)
+
+                if checkpoint and (frame_idx - start_frame) % checkpoint_every == 0:
+                    checkpoint(frame_idx)
+        finally:
+            reader.stop()
+            reader_pool.release(video.path, cap)
+
+
+def init_worker_process(cv_threads: int):
+    """Настройка процесса-воркера: сколько потоков может занять OpenCV"""
+    cv2.setNumThreads(cv_threads)
+
+
+def split_into_chunks(total_frames: int, chunks: int,
+                      index: Optional[KeyframeIndex]) -> List[Tuple[int, int]]:
+    """
+    Делит видео на куски [start, end], начинающиеся с ключевых кадров.
+    Каждый кусок, кроме последнего, заходит в следующий на CHUNK_OVERLAP_FRAMES.
+    При редких ключевых кадрах кусков может получиться меньше, чем запрошено.
+    Без индекса (ключевые кадры не удалось прочитать) видео делится поровну,
+    а читатели кусков позиционируются обычной перемоткой.
+    """
+    last = max(0, total_frames - 1)
+    starts = [0]
+    for i in range(1, max(1, chunks)):
+        start = total_frames * i // chunks
+        if index is not None:
+            start = index.keyframe_before(start)
+        if start > starts[-1]:
+            starts.append(start)
+
+    ranges = []
+    for i, start in enumerate(starts):
+        if i + 1 < len(starts):
+            end = min(last, starts[i + 1] - 1 + CHUNK_OVERLAP_FRAMES)
+        else:
+            end = last
+        ranges.append((start, end))
+    return ranges
+
+
+def stitch_chunks(chunk_results: List[Optional[Dict[int, tuple]]]) -> FrameSequence:
+    """
+    Сшивает разметку кусков (по порядку) в одну последовательность.
+
+    В зоне перекрытия переход на следующий кусок делается на первом кадре,
+    где bbox обоих кусков совпадают (IoU >= CHUNK_STITCH_IOU). Если совпадений
+    нет, предыдущий кусок, скорее всего, ушел с объекта - тогда верится
+    свежей детекции, и следующий кусок берется с начала своей разметки.
+    Кадры предыдущего куска после потери объекта следующим остаются.
+    """
+    sequence = FrameSequence()
+    merged: Dict[int, tuple] = {}
+
+    for data in chunk_results:
+        if not data:
+            continue
+        frames = sorted(data)
+
+        handoff = frames[0]
+        for frame_idx in frames:
+            if frame_idx not in merged:
+                break
+            if _bbox_iou(merged[frame_idx], data[frame_idx]) >= CHUNK_STITCH_IOU:
+                handoff = frame_idx
+                break
+
+        # Непрерывные участки начиная с кадра перехода
+        run_start, run = None, []
+        for frame_idx in frames:
+            if frame_idx < handoff:
+                continue
+            if run and frame_idx != run_start + len(run):
+                sequence.add_frames(run_start, run)
+                run = []
+            if not run:
+                run_start = frame_idx
+            run.append(data[frame_idx])
+            merged[frame_idx] = data[frame_idx]
+        if run:
+            sequence.add_frames(run_start, run)
+
+    return sequence
+
+
+def low_confidence_segments(confidence_data: Dict[int, float]) -> List[Tuple[int, int]]:
+    """Отрезки кадров для ручной проверки (LOW_CONFIDENCE_THRESHOLD, LOW_CONFIDENCE_MIN_FRAMES)"""
+    known = {frame: (value,) for frame, value in confidence_data.items() if value is not None}
+    return FrameSequence.from_dict(known).low_confidence_segments(LOW_CONFIDENCE_THRESHOLD,
+                                                                  LOW_CONFIDENCE_MIN_FRAMES)
+
+
+def _bbox_iou(box_a, box_b) -> float:
+    x_a, y_a = max(box_a[0], box_b[0]), max(box_a[1], box_b[1])
+    x_b = min(box_a[0] + box_a[2], box_b[0] + box_b[2])
+    y_b = min(box_a[1] + box_a[3], box_b[1] + box_b[3])
+    inter = max(0, x_b - x_a) * max(0, y_b - y_a)
+    union = box_a[2] * box_a[3] + box_b[2] * box_b[3] - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _track_chunk(video_path: str, start: int, end: int, seed,
+                 options: dict) -> Tuple[Dict[int, tuple], Dict[int, float]]:
+    """
+    Выполняется в процессе-воркере: трекинг кадров [start, end].
+    Без seed объект ищется YOLO на первых CHUNK_SEED_SEARCH_FRAMES кадрах куска.
+    Возвращает разметку куска и уверенность трекера по кадрам (где она известна).
+    """
+    video_path = Path(video_path)
+    info = reader_pool.probe(video_path)
+    tracker = TrackerWrapper(options["model_type"], options["model_path"],
+                             options["batch_size"], options["use_roi"],
+                             options["scale"], options["max_side"], options["motion_threshold"],
+                             options["inference"])
+    tracker.prepare_video(video_path)
+    detector = None
+    if seed is None:
+        detector = tracker if tracker.can_autostart else TrackerWrapper(
+            "yolo", options["model_path"], scale=options["scale"], max_side=options["max_side"],
+            inference=options["inference"])
+
+    tracking_data = {}
+    confidence_data = {}
+    cap = reader_pool.acquire(video_path)
+    reader = DecodeAheadReader(cap, DECODE_AHEAD_FRAMES, (info.height, info.width, 3))
+    reader.set_keyframe_index(KeyframeIndex.load_or_build(video_path, Path(options["morris_dir"])))
+    reader.seek(start)
+    reader.start()
+    try:
+        # Старт: заданный bbox на первом кадре или первая детекция YOLO
+        while True:
+            ret, frame_idx, frame = reader.read()
+            if not ret or frame_idx > min(end, start + CHUNK_SEED_SEARCH_FRAMES):
+                return tracking_data, confidence_data
+            if seed is None:
+                success, seed = detector.update(frame)
+                if not success:
+                    seed = None
+                    continue
+                if detector.last_confidence is not None:
+                    confidence_data[frame_idx] = detector.last_confidence
+            tracker.init(frame, seed)
+            tracking_data[frame_idx] = tuple(map(int, seed))
+            break
+
+        for frame_idx, _, success, bbox, confidence in track_batches(reader, tracker):
+            if not success or frame_idx > end:
+                break
+            tracking_data[frame_idx] = bbox
+            if confidence is not None:
+                confidence_data[frame_idx] = confidence
+    finally:
+        reader.stop()
+        reader_pool.release(video_path, cap)
+
+    return tracking_data, confidence_data
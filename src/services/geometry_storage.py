@@ -1,8 +1,7 @@
 from pathlib import Path
 from typing import List, Dict, Tuple
 
-import cv2
-
+from src.core.mor_parser.frame_block import FrameSequence
 from src.core.mor_parser.morris_file import MorrisFile, StatBlock
 from src.core.geometry import Square, Circle, Donut, GeometryType
 from src.ui.components.video.graphics_items import EditableGeometryItem
@@ -11,8 +10,12 @@ from src.ui.components.video.graphics_items import EditableGeometryItem
 class GeometryStorageService:
     PROJECT_FILE_NAME = ".morproj"
 
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, track_storage: tuple = None, gap_filling: tuple = None):
         self.project_path = project_path
+        # (TrackEncoding, DataType) для новых записей трекинга; None - bbox во float
+        self.track_storage = track_storage
+        # (max_gap, method): короткие пропуски трека пишутся в .mor интерполированными блоками
+        self.gap_filling = gap_filling
         self.morris_dir = self.project_path / ".morris"
         self.morris_dir.mkdir(exist_ok=True)
 
@@ -72,10 +75,11 @@ class GeometryStorageService:
              items: List[EditableGeometryItem],
              tracking_data: Dict[int, tuple] = None,
              zones_stats: Dict[str, dict] = None,
-             is_marked_finished: bool = False):
+             is_marked_finished: bool = False,
+             confidence_data: Dict[int, float] = None):
 
         path = self.get_video_file_path(video_path.stem)
-        self._write_to_file(path, items, tracking_data, zones_stats, is_marked_finished)
+        self._write_to_file(path, items, tracking_data, zones_stats, is_marked_finished, confidence_data)
 
     def save_project_settings(self, items: List[EditableGeometryItem]):
         path = self.get_project_file_path()
@@ -85,36 +89,164 @@ class GeometryStorageService:
                        items: List[EditableGeometryItem],
                        tracking_data: Dict[int, tuple],
                        zones_stats: Dict[str, dict] = None,
-                       is_marked: bool = False):
+                       is_marked: bool = False,
+                       confidence_data: Dict[int, float] = None):
 
         mor_file = MorrisFile(str(path))
+        self._apply_track_storage(mor_file)
+        self._keep_extra_tracks(mor_file)
         mor_file.set_marked_status(is_marked)
 
         # Генерируем блоки статистики
         mor_file.stats_blocks = self._create_stat_blocks(items, zones_stats)
 
         # Трекинг
-        if tracking_data:
-            sorted_frames = sorted(tracking_data.keys())
-            if sorted_frames:
-                start_frame = sorted_frames[0]
-                current_block = []
-                prev_frame = start_frame - 1
-
-                for frame_idx in sorted_frames:
-                    if frame_idx != prev_frame + 1:
-                        if current_block:
-                            mor_file.add_frames(start_frame, current_block)
-                        start_frame = frame_idx
-                        current_block = []
-                    current_block.append(tracking_data[frame_idx])
-                    prev_frame = frame_idx
-
-                if current_block:
-                    mor_file.add_frames(start_frame, current_block)
+        self._add_tracking(mor_file, tracking_data)
+        self._add_confidence(mor_file, confidence_data, tracking_data)
+        self._fill_gaps(mor_file)
+
+        mor_file.save()
 
+    @staticmethod
+    def _keep_extra_tracks(mor_file: MorrisFile):
+        """
+        Экран разметки редактирует только основной трек: дополнительные треки
+        (другие животные из пакетного трекинга) переносятся из файла как есть.
+        """
+        if not Path(mor_file.filepath).exists():
+            return
+        existing = MorrisFile(mor_file.filepath)
+        try:
+            existing.load()
+        except Exception:
+            return
+
+        # Формат записи файла не меняется: данные в нем могли быть уже без размеров bbox
+        mor_file.set_track_encoding(existing.track_encoding)
+        mor_file.set_coordinate_format(existing.coord_type)
+
+        main = MorrisFile.MAIN_TRACK
+        mor_file.tracks.update({k: v for k, v in existing.tracks.items() if k != main})
+        mor_file.track_names = existing.track_names
+        mor_file.track_stats = {k: v for k, v in existing.track_stats.items() if k != main}
+        mor_file.confidence.update({k: v for k, v in existing.confidence.items() if k != main})
+
+    def save_tracking(self, video_path: Path,
+                      tracking_data: Dict[int, tuple],
+                      zones_stats: Dict[str, dict] = None,
+                      is_marked_finished: bool = None,
+                      confidence_data: Dict[int, float] = None):
+        """
+        Сохраняет трекинг без UI-элементов (для пакетной обработки).
+        Зоны, их оформление и метаданные берутся из существующего .mor видео,
+        а если его нет - из шаблона проекта (.morproj).
+        """
+        mor_file = self._open_for_tracking(video_path, zones_stats, is_marked_finished)
+        mor_file.sequence = FrameSequence()
+        self._add_tracking(mor_file, tracking_data)
+        self._add_confidence(mor_file, confidence_data, tracking_data)
+        self._fill_gaps(mor_file)
         mor_file.save()
 
+    def save_tracks(self, video_path: Path,
+                    tracks: Dict[str, Dict[int, tuple]],
+                    tracks_zones_stats: Dict[str, Dict[str, dict]] = None,
+                    is_marked_finished: bool = None,
+                    tracks_confidence: Dict[str, Dict[int, float]] = None):
+        """
+        Сохраняет несколько треков (по животному на трек) без UI-элементов.
+        Первый трек становится основным (его видит экран разметки,
+        его статистика пишется в зоны), остальные - дополнительными.
+        Статистика зон сохраняется для каждого трека отдельно.
+        """
+        tracks_zones_stats = tracks_zones_stats or {}
+        tracks_confidence = tracks_confidence or {}
+        names = list(tracks.keys())
+        main_stats = tracks_zones_stats.get(names[0]) if names else None
+
+        mor_file = self._open_for_tracking(video_path, main_stats, is_marked_finished)
+        mor_file.tracks = {MorrisFile.MAIN_TRACK: FrameSequence()}
+        mor_file.track_names = {}
+        mor_file.track_stats = {}
+        mor_file.confidence = {}
+
+        for i, name in enumerate(names):
+            if i == 0:
+                track_id = MorrisFile.MAIN_TRACK
+                mor_file.track_names[track_id] = name
+            else:
+                track_id = mor_file.add_track(name)
+            self._add_tracking(mor_file, tracks[name], track_id)
+            self._add_confidence(mor_file, tracks_confidence.get(name), tracks[name], track_id)
+
+            zones_stats = tracks_zones_stats.get(name) or {}
+            mor_file.track_stats[track_id] = {
+                zone: (stat.get('time', 0.0), stat.get('dist', 0.0)) for zone, stat in zones_stats.items()
+            }
+        self._fill_gaps(mor_file)
+        mor_file.save()
+
+    def _open_for_tracking(self, video_path: Path, zones_stats: Dict[str, dict] = None,
+                           is_marked_finished: bool = None) -> MorrisFile:
+        """
+        .mor видео для записи трекинга: зоны, их оформление и метаданные
+        из существующего файла или из шаблона проекта.
+        """
+        path = self.get_video_file_path(video_path.stem)
+        mor_file = MorrisFile(str(path))
+
+        if path.exists():
+            mor_file.load()
+        else:
+            template = MorrisFile(str(self.get_project_file_path()))
+            try:
+                template.load()
+            except Exception:
+                pass
+            mor_file.stats_blocks = template.stats_blocks
+
+        if zones_stats:
+            for stat in mor_file.stats_blocks:
+                if stat.name in zones_stats:
+                    stat.time = zones_stats[stat.name].get('time', 0.0)
+                    stat.distance = zones_stats[stat.name].get('dist', 0.0)
+
+        if is_marked_finished is not None:
+            mor_file.set_marked_status(is_marked_finished)
+        # Трекинг пишется заново, поэтому в формате проекта
+        self._apply_track_storage(mor_file)
+        return mor_file
+
+    def _fill_gaps(self, mor_file: MorrisFile):
+        """Интерполированные блоки пересчитываются по настоящим кадрам при каждом сохранении"""
+        max_gap, method = self.gap_filling or (0, "linear")
+        mor_file.fill_gaps(max_gap, method)
+
+    def _apply_track_storage(self, mor_file: MorrisFile):
+        if self.track_storage:
+            encoding, coord_type = self.track_storage
+            mor_file.set_track_encoding(encoding)
+            mor_file.set_coordinate_format(coord_type)
+
+    def _add_tracking(self, mor_file: MorrisFile, tracking_data: Dict[int, tuple],
+                      track_id: int = MorrisFile.MAIN_TRACK):
+        """Разбивает {кадр: bbox} на непрерывные блоки"""
+        if not tracking_data:
+            return
+        for block in FrameSequence.from_dict(tracking_data).blocks:
+            mor_file.add_frames(block.start_frame, block.rects, track_id)
+
+    @staticmethod
+    def _add_confidence(mor_file: MorrisFile, confidence_data: Dict[int, float],
+                        tracking_data: Dict[int, tuple], track_id: int = MorrisFile.MAIN_TRACK):
+        """Уверенность пишется только для кадров, которые есть в трекинге"""
+        if not confidence_data or not tracking_data:
+            mor_file.confidence.pop(track_id, None)
+            return
+        mor_file.set_confidence(
+            {frame: value for frame, value in confidence_data.items() if frame in tracking_data}, track_id
+        )
+
     # --- ВСПОМОГАТЕЛЬНЫЙ МЕТОД ---
 
     def _create_stat_blocks(self, items: List[EditableGeometryItem], zones_stats: Dict[str, dict] = None) -> List[
@@ -162,6 +294,56 @@ class GeometryStorageService:
 
         return [], {}, False
 
+    def load_tracking(self, video_path: Path) -> Tuple[Dict[int, tuple], List[StatBlock], bool]:
+        """
+        Трекинг, зоны (StatBlock) и статус видео без создания UI-элементов.
+        Если .mor видео нет, зоны берутся из шаблона проекта.
+        """
+        path = self.get_video_file_path(video_path.stem)
+        is_template = not path.exists()
+        if is_template:
+            path = self.get_project_file_path()
+
+        mor_file = MorrisFile(str(path))
+        try:
+            mor_file.load()
+        except Exception:
+            return {}, [], False
+
+        tracking_data = {}
+        if not is_template:
+            for block in mor_file.sequence.blocks:
+                for i, rect in enumerate(block.rects):
+                    tracking_data[block.start_frame + i] = rect
+
+        return tracking_data, mor_file.stats_blocks, mor_file.get_marked_status()
+
+    def load_tracks(self, video_path: Path) -> Dict[str, Dict[int, tuple]]:
+        """Все треки видео: {имя трека: {кадр: bbox}}, основной - первым"""
+        path = self.get_video_file_path(video_path.stem)
+        mor_file = MorrisFile(str(path))
+        try:
+            mor_file.load()
+        except Exception:
+            return {}
+
+        return {
+            mor_file.get_track_name(track_id): mor_file.tracks[track_id].to_dict()
+            for track_id in sorted(mor_file.tracks)
+            if mor_file.tracks[track_id].blocks
+        }
+
+    def load_confidence(self, video_path: Path, track_id: int = MorrisFile.MAIN_TRACK) -> Dict[int, float]:
+        """{кадр: уверенность трекера} трека; кадры без оценки отсутствуют"""
+        path = self.get_video_file_path(video_path.stem)
+        mor_file = MorrisFile(str(path))
+        try:
+            mor_file.load()
+        except Exception:
+            return {}
+        confidence = mor_file.confidence.get(track_id)
+        return {frame: value[0] for frame, value in confidence.to_dict().items()} if confidence else {}
+
     def load_project_settings(self) -> List[EditableGeometryItem]:
         path = self.get_project_file_path()
         if not path.exists():
@@ -257,8 +439,7 @@ class GeometryStorageService:
             mor_path = self.get_video_file_path(stem)
 
             is_marked = False
-            # Длительность пока возьмем из cv2 (это может быть медленно при первом запуске)
-            # В идеале, длительность стоит кешировать в .morproj или в отдельном json
+            # Длительность берется из пула захватов (кешируется на процесс)
             duration = 0.0
 
             # 1. Статус из .mor
@@ -269,14 +450,9 @@ class GeometryStorageService:
                 except:
                     pass
 
-            # 2. Длительность (быстрый способ через OpenCV)
+            # 2. Длительность (через общий пул захватов, результат кешируется)
             try:
-                cap = cv2.VideoCapture(str(video.path))
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-                if fps > 0:
-                    duration = frames / fps
-                cap.release()
+                duration = video.info.duration
             except:
                 pass
 
@@ -1,6 +1,7 @@
 import math
 from typing import Dict, List, Tuple
-from src.core.geometry import Geometry, Square, Circle, Donut
+from src.core.geometry import Geometry, GeometryType, Square, Circle, Donut
+from src.core.mor_parser.frame_block import FrameSequence
 from src.ui.components.video.graphics_items import EditableGeometryItem
 
 
@@ -30,15 +31,37 @@ class StatisticsService:
                     })
         return snapshot
 
+    @staticmethod
+    def prepare_stat_blocks_snapshot(stat_blocks: list) -> List[dict]:
+        """
+        То же, что prepare_geometry_snapshot, но из зон, прочитанных из .mor
+        (StatBlock) - для работы без UI.
+        """
+        shapes = {GeometryType.SQUARE: "square", GeometryType.CIRCLE: "circle", GeometryType.DONUT: "donut"}
+        snapshot = []
+        for stat in stat_blocks:
+            if stat.is_active and stat.geometry is not None:
+                snapshot.append({
+                    "name": stat.name,
+                    "geometry": stat.geometry,
+                    "color": stat.color_hex,
+                    "shape": shapes.get(stat.geometry.get_type(), "")
+                })
+        return snapshot
+
     @staticmethod
     def calculate(tracking_data: Dict[int, tuple],
                   active_zones: List[dict],
                   fps: float,
-                  current_frame: int):
+                  current_frame: int,
+                  max_gap: int = 0,
+                  interpolation: str = "linear"):
         """
         Тяжелые вычисления (выполняется в Worker Thread).
+        :param max_gap: пропуски трека до стольких кадров заполняются интерполяцией
         """
         safe_fps = fps if fps > 0 else 30.0
+        tracking_data = StatisticsService.fill_gaps(tracking_data, max_gap, interpolation)
 
         global_stats = {
             "total_time": 0.0,
@@ -82,6 +105,28 @@ class StatisticsService:
 
         return global_stats, zones_stats
 
+    @staticmethod
+    def calculate_tracks(tracks: Dict[str, Dict[int, tuple]],
+                         active_zones: List[dict],
+                         fps: float,
+                         current_frame: int,
+                         max_gap: int = 0,
+                         interpolation: str = "linear") -> Dict[str, tuple]:
+        """calculate() для каждого трека: {имя трека: (global_stats, zones_stats)}"""
+        return {
+            name: StatisticsService.calculate(tracking_data, active_zones, fps, current_frame,
+                                              max_gap, interpolation)
+            for name, tracking_data in tracks.items()
+        }
+
+    @staticmethod
+    def fill_gaps(tracking_data: Dict[int, tuple], max_gap: int, interpolation: str = "linear") -> Dict[int, tuple]:
+        """tracking_data вместе с интерполированными кадрами в пропусках до max_gap кадров"""
+        if max_gap <= 0 or not tracking_data:
+            return tracking_data
+        filled = FrameSequence.from_dict(tracking_data).fill_gaps(max_gap, interpolation)
+        return {**tracking_data, **filled.to_dict()}
+
     @staticmethod
     def _item_to_geometry(item: EditableGeometryItem):
         """UI -> Math"""
@@ -0,0 +1,275 @@
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from src.core.project import Project
+from src.core.tracker import DEFAULT_BATCH_SIZE
+from src.services.batch_tracking_service import BatchTrackingService, init_worker_process
+
+# Как часто (в кадрах) сохранять промежуточный результат в .mor
+CHECKPOINT_EVERY_FRAMES = 500
+# Как часто (сек) планировщик перечитывает состояние заданий
+POLL_INTERVAL = 1.0
+
+
+class TrackingJob:
+    """Задание на трекинг одного видео (хранится в .morris/jobs/<видео>.json)"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+    def __init__(self, video_name: str):
+        self.video_name = video_name
+        self.status = TrackingJob.PENDING
+        self.frame = 0
+        self.total_frames = 0
+        # Последний кадр, сохраненный в .mor: с него задание продолжится после сбоя
+        self.checkpoint: Optional[int] = None
+        self.fps = 0.0
+        self.lost_at: Optional[int] = None
+        # Отрезки [первый, последний кадр] с низкой уверенностью трекера
+        self.low_confidence: List[List[int]] = []
+        self.error: Optional[str] = None
+        self.updated = 0.0
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (TrackingJob.PENDING, TrackingJob.RUNNING)
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+    @staticmethod
+    def from_dict(data: dict) -> "TrackingJob":
+        job = TrackingJob(data["video_name"])
+        for key, value in data.items():
+            if hasattr(job, key):
+                setattr(job, key, value)
+        return job
+
+
+class JobQueue:
+    """
+    Очередь заданий в папке .morris/jobs: одно задание - один JSON-файл.
+    Файлы пишутся атомарно, поэтому их можно читать из другого процесса,
+    пока воркер обновляет прогресс.
+    """
+
+    def __init__(self, jobs_dir: Path):
+        self.jobs_dir = Path(jobs_dir)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+
+    def _job_path(self, video_name: str) -> Path:
+        return self.jobs_dir / f"{video_name}.json"
+
+    def get(self, video_name: str) -> Optional[TrackingJob]:
+        path = self._job_path(video_name)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return TrackingJob.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, job: TrackingJob):
+        job.updated = time.time()
+        path = self._job_path(job.video_name)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(job.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def all(self) -> List[TrackingJob]:
+        jobs = []
+        for path in sorted(self.jobs_dir.glob("*.json")):
+            job = self.get(path.stem)
+            if job is not None:
+                jobs.append(job)
+        return jobs
+
+    def recover(self) -> List[TrackingJob]:
+        """Задания, оставшиеся в RUNNING после сбоя, возвращаются в очередь"""
+        recovered = []
+        for job in self.all():
+            if job.status == TrackingJob.RUNNING:
+                job.status = TrackingJob.PENDING
+                self.save(job)
+                recovered.append(job)
+        return recovered
+
+
+class TrackingScheduler:
+    """
+    Распределяет трекинг видео проекта по процессам.
+
+    В каждом процессе свой захват и свой TrackerWrapper (BatchTrackingService),
+    поэтому CSRT, который работает в одном потоке, загружает все ядра.
+    Очередь хранится в .morris/jobs: после сбоя повторный запуск продолжает
+    незавершенные задания с последнего сохраненного кадра, а готовые пропускает.
+    Один проект должен обрабатывать один планировщик.
+    """
+
+    def __init__(self, project: Project,
+                 workers: int = None,
+                 model_type: str = "yolo",
+                 model_path: str = None,
+                 seed_bbox: tuple = None,
+                 overwrite: bool = False,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 use_roi: bool = True,
+                 scale: float = None,
+                 max_side: int = None,
+                 max_gap: int = None,
+                 motion_threshold: float = None,
+                 inference: tuple = None,
+                 checkpoint_every: int = CHECKPOINT_EVERY_FRAMES):
+        self.project = project
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.options = {
+            "model_type": model_type,
+            "model_path": model_path,
+            "seed_bbox": seed_bbox,
+            "overwrite": overwrite,
+            "batch_size": batch_size,
+            "use_roi": use_roi,
+            "scale": scale,
+            "max_side": max_side,
+            "max_gap": max_gap,
+            "motion_threshold": motion_threshold,
+            "inference": inference,
+            "checkpoint_every": checkpoint_every,
+        }
+        self.queue = JobQueue(project.path / ".morris" / "jobs")
+
+    def enqueue(self, video_names: List[str] = None) -> List[TrackingJob]:
+        """
+        Ставит видео в очередь. Незавершенные задания не пересоздаются (продолжатся
+        с контрольной точки), завершенные - только при overwrite.
+        """
+        jobs = []
+        for video in self.project.videos:
+            name = video.path.name
+            if video_names and name not in video_names:
+                continue
+
+            job = self.queue.get(name)
+            if job is not None and (job.is_active or
+                                    (job.status == TrackingJob.DONE and not self.options["overwrite"])):
+                continue
+
+            job = TrackingJob(name)
+            self.queue.save(job)
+            jobs.append(job)
+        return jobs
+
+    def run(self, progress_callback: Callable[[TrackingJob], None] = None) -> List[TrackingJob]:
+        """Выполняет все задания из очереди; progress_callback вызывается при изменении задания"""
+        self.queue.recover()
+        pending = [job.video_name for job in self.queue.all() if job.status == TrackingJob.PENDING]
+        if not pending:
+            return []
+
+        workers = min(self.workers, len(pending))
+        # Потоки OpenCV делятся между процессами, чтобы не было переподписки ядер
+        cv_threads = max(1, (os.cpu_count() or 1) // workers)
+        # spawn: Qt и захваты видео не переносят fork
+        context = multiprocessing.get_context("spawn")
+
+        seen: Dict[str, float] = {}
+        with ProcessPoolExecutor(workers, mp_context=context,
+                                 initializer=init_worker_process, initargs=(cv_threads,)) as pool:
+            futures = [
+                pool.submit(_run_job, str(self.project.path), name, self.options)
+                for name in pending
+            ]
+
+            while True:
+                all_done = all(f.done() for f in futures)
+                if progress_callback:
+                    for name in pending:
+                        job = self.queue.get(name)
+                        if job is not None and seen.get(name) != job.updated:
+                            seen[name] = job.updated
+                            progress_callback(job)
+                if all_done:
+                    break
+                time.sleep(POLL_INTERVAL)
+
+            for future in futures:
+                # Ошибки воркера записаны в задание; здесь только пробрасываем сбой процесса
+                future.result()
+
+        return [self.queue.get(name) for name in pending]
+
+
+def _run_job(project_path: str, video_name: str, options: dict):
+    """Выполняется в процессе-воркере"""
+    project = Project(project_path)
+    queue = JobQueue(project.path / ".morris" / "jobs")
+    job = queue.get(video_name) or TrackingJob(video_name)
+
+    video = next((v for v in project.videos if v.path.name == video_name), None)
+    if video is None:
+        job.status = TrackingJob.FAILED
+        job.error = "Видео не найдено"
+        queue.save(job)
+        return
+
+    start_frame = job.checkpoint or 0
+    started = time.monotonic()
+
+    def on_progress(_name: str, frame_idx: int, total_frames: int):
+        elapsed = time.monotonic() - started
+        job.frame = frame_idx
+        job.total_frames = total_frames
+        job.fps = (frame_idx - start_frame) / elapsed if elapsed > 0 else 0.0
+        queue.save(job)
+
+    def on_checkpoint(frame_idx: int):
+        job.checkpoint = frame_idx
+        queue.save(job)
+
+    service = BatchTrackingService(
+        project,
+        model_type=options["model_type"],
+        model_path=options["model_path"],
+        seed_bbox=options["seed_bbox"],
+        overwrite=options["overwrite"],
+        batch_size=options["batch_size"],
+        use_roi=options["use_roi"],
+        scale=options["scale"],
+        max_side=options["max_side"],
+        max_gap=options["max_gap"],
+        motion_threshold=options["motion_threshold"],
+        inference=options["inference"],
+        progress_callback=on_progress,
+    )
+
+    job.status = TrackingJob.RUNNING
+    job.error = None
+    queue.save(job)
+
+    result = service.track_video(video, start_frame, options["checkpoint_every"], on_checkpoint)
+
+    job.total_frames = result.total_frames
+    job.fps = result.fps
+    job.lost_at = result.lost_at
+    job.low_confidence = [list(segment) for segment in result.low_confidence]
+    job.error = result.error
+    if result.last_frame is not None:
+        job.frame = result.last_frame
+        job.checkpoint = result.last_frame
+
+    if result.skipped:
+        job.status = TrackingJob.SKIPPED
+    elif result.error:
+        job.status = TrackingJob.FAILED
+    else:
+        job.status = TrackingJob.DONE
+    queue.save(job)
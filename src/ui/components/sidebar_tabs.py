@@ -19,6 +19,7 @@ from PySide6.QtWidgets import (
     QListWidget,
     QListWidgetItem,
     QPushButton,
+    QSpinBox,
     QStackedWidget,
     QTableWidget,
     QTableWidgetItem,
@@ -32,6 +33,8 @@ try:
 except ImportError:
     get_resource_path = lambda x: x
 
+from src.cv.tracker_registry import available_backends
+
 # --- КОНСТАНТЫ ---
 CONTENT_BG = "#3e3e42"
 HEADER_BG = "#2d2d30"
@@ -678,9 +681,22 @@ class GeometryPage(BasePage):
         self._add_to_list(item)
 
 
+# Масштаб кадра для трекера: (подпись, scale, max_side; 0 - без ограничения)
+TRACKING_SCALE_PRESETS = [
+    ("Исходный размер", 1.0, 0),
+    ("1/2", 0.5, 0),
+    ("1/4", 0.25, 0),
+    ("Не больше 1280 px", 1.0, 1280),
+    ("Не больше 640 px", 1.0, 640),
+]
+
+
 class TrackerPage(BasePage):
     # Сигналы для контроллера
-    model_changed = Signal(str)  # "CSRT" / "YOLO"
+    model_changed = Signal(str)  # имя трекера из реестра ("csrt", "yolo", ...) или "" - нет модели
+    scale_changed = Signal(float, int)  # (scale, max_side)
+    max_gap_changed = Signal(int)  # 0 - не заполнять пропуски
+    motion_gate_toggled = Signal(bool)
     manual_setup_toggled = Signal(bool)
 
     def __init__(self):
@@ -695,8 +711,12 @@ class TrackerPage(BasePage):
 
         # Выбор модели
         self.combo = QComboBox()
-        self.combo.addItems(["Нет модели", "CSRT", "YOLO"])
-        self.combo.currentTextChanged.connect(self.model_changed.emit)
+        self.combo.addItem("Нет модели", "")
+        for backend in available_backends():
+            self.combo.addItem(backend.label, backend.name)
+        self.combo.currentIndexChanged.connect(
+            lambda _: self.model_changed.emit(self.combo.currentData() or "")
+        )
         layout.addWidget(self.combo)
 
         self.lbl_error = QLabel()
@@ -708,13 +728,44 @@ class TrackerPage(BasePage):
         layout.addWidget(self.lbl_error)
 
         # Описание
-        info = QLabel(
-            "• CSRT: Точный, требует ручной инициализации.\n• YOLO: Автоматический поиск, поддерживает дообучение."
-        )
+        info = QLabel("\n".join(
+            f"• {backend.label}: {backend.traits.description}" for backend in available_backends()
+        ))
         info.setWordWrap(True)
         info.setStyleSheet("color: #aaa; font-size: 12px;")
         layout.addWidget(info)
 
+        # Масштаб кадра: на уменьшенном кадре трекер работает быстрее
+        lbl_scale = QLabel("Масштаб кадра для трекера")
+        lbl_scale.setStyleSheet("font-weight: bold; color: white;")
+        layout.addWidget(lbl_scale)
+
+        self.combo_scale = QComboBox()
+        for label, _, _ in TRACKING_SCALE_PRESETS:
+            self.combo_scale.addItem(label)
+        self.combo_scale.currentIndexChanged.connect(self._on_scale_changed)
+        layout.addWidget(self.combo_scale)
+
+        # Короткие пропуски (трекер терял объект на несколько кадров) - интерполяцией
+        lbl_gap = QLabel("Заполнять пропуски до, кадров")
+        lbl_gap.setStyleSheet("font-weight: bold; color: white;")
+        layout.addWidget(lbl_gap)
+
+        self.spin_max_gap = QSpinBox()
+        self.spin_max_gap.setRange(0, 1000)
+        self.spin_max_gap.setSpecialValueText("Не заполнять")
+        self.spin_max_gap.valueChanged.connect(self.max_gap_changed.emit)
+        layout.addWidget(self.spin_max_gap)
+
+        self.chk_motion_gate = QCheckBox("Пропускать кадры без движения")
+        self.chk_motion_gate.setToolTip(
+            "Пока в окне вокруг объекта ничего не меняется, трекер не вызывается\n"
+            "и остается прошлый bbox. Ускоряет длинные записи, где животное подолгу сидит."
+        )
+        self.chk_motion_gate.setStyleSheet("color: white;")
+        self.chk_motion_gate.toggled.connect(self.motion_gate_toggled.emit)
+        layout.addWidget(self.chk_motion_gate)
+
         layout.addSpacing(20)
 
         lbl_man = QLabel("Ручная коррекция")
@@ -747,6 +798,31 @@ class TrackerPage(BasePage):
 
         layout.addStretch()
 
+    def _on_scale_changed(self, index: int):
+        _, scale, max_side = TRACKING_SCALE_PRESETS[index]
+        self.scale_changed.emit(scale, max_side)
+
+    def set_scale(self, scale: float, max_side: int = None):
+        """Выбрать пресет масштаба без сигнала (при открытии видео)"""
+        for i, (_, preset_scale, preset_side) in enumerate(TRACKING_SCALE_PRESETS):
+            if preset_scale == scale and preset_side == (max_side or 0):
+                self.combo_scale.blockSignals(True)
+                self.combo_scale.setCurrentIndex(i)
+                self.combo_scale.blockSignals(False)
+                return
+
+    def set_motion_gate(self, enabled: bool):
+        """Без сигнала (при открытии видео)"""
+        self.chk_motion_gate.blockSignals(True)
+        self.chk_motion_gate.setChecked(enabled)
+        self.chk_motion_gate.blockSignals(False)
+
+    def set_max_gap(self, max_gap: int):
+        """Без сигнала (при открытии видео)"""
+        self.spin_max_gap.blockSignals(True)
+        self.spin_max_gap.setValue(max_gap)
+        self.spin_max_gap.blockSignals(False)
+
     def show_error(self, message: str):
         """Показать ошибку"""
         if message:
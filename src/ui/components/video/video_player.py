@@ -313,11 +313,15 @@ class VideoPlayerWidget(QWidget):
         self._init_controls()
 
         self.thread = VideoThread(self.video)
-        self.thread.change_pixmap_signal.connect(self.view.update_image)
+        info = self.video.info
+        self.view.set_source_size(info.width, info.height)
+        self.view.display_size_changed.connect(self.thread.set_display_size)
+        self.thread.frame_ready.connect(self._on_frame_ready)
         self.thread.tracker_update_signal.connect(self.view.update_tracker_box)
-        self.thread.frame_changed_signal.connect(self.position_changed.emit)
         self.thread.tracker_loading_signal.connect(self.on_tracker_loading)
         self.thread.tracking_error_signal.connect(self.on_tracking_error)
+        self.thread.tracking_progress.connect(self.on_tracking_progress)
+        self.thread.playback_finished.connect(self.on_playback_finished)
 
         self.thread.is_paused = True
         self.thread.start()
@@ -332,6 +336,12 @@ class VideoPlayerWidget(QWidget):
 
         cont_layout = QHBoxLayout(self.controls_container)
         cont_layout.setContentsMargins(0, 0, 0, 0)
+
+        # 1. Прогресс фонового трекинга
+        self.lbl_tracking = QLabel()
+        self.lbl_tracking.setStyleSheet("color: #aaa; font-size: 12px; border: none;")
+        cont_layout.addSpacing(20)
+        cont_layout.addWidget(self.lbl_tracking)
         cont_layout.addStretch()
 
         # 2. PREV
@@ -356,6 +366,12 @@ class VideoPlayerWidget(QWidget):
             btn.setCursor(Qt.PointingHandCursor)
             cont_layout.addWidget(btn)
 
+        # Удержание кнопок шага - покадровая прокрутка
+        for btn in [self.btn_prev, self.btn_next]:
+            btn.setAutoRepeat(True)
+            btn.setAutoRepeatDelay(300)
+            btn.setAutoRepeatInterval(40)
+
         cont_layout.addStretch()
 
         # 5. TURBO
@@ -394,11 +410,29 @@ class VideoPlayerWidget(QWidget):
         self.btn_play.clicked.connect(self.toggle_play_pause)
         self.btn_next.clicked.connect(self.step_forward)
 
+    @Slot()
+    def _on_frame_ready(self):
+        # Забираем только последний кадр; промежуточные уже отброшены
+        packet = self.thread.mailbox.take()
+        if packet is None:
+            return
+        self.view.update_image(packet.frame)
+        self.view.update_tracker_box(packet.success, packet.bbox)
+        self.position_changed.emit(packet.frame_idx)
+
     @Slot(str)
     def on_tracking_error(self, message):
         self.btn_play.setIcon(self.icon_play)
         self.error_occurred.emit(message)
 
+    @Slot()
+    def on_playback_finished(self):
+        self.btn_play.setIcon(self.icon_play)
+
+    @Slot(int)
+    def on_tracking_progress(self, frame_idx):
+        self.lbl_tracking.setText(f"Трекинг: до кадра {frame_idx + 1}")
+
     def seek_to_frame(self, frame_index):
         self.thread.seek(frame_index)
         if self.thread.is_paused:
@@ -467,7 +501,6 @@ class VideoPlayerWidget(QWidget):
             tracker = self.thread.tracker
 
             if tracker is not None:
-                model_type = tracker.model_type
                 is_active = self.thread.is_tracking_active
 
                 # Если трекер не активен, попробуем восстановить его из bbox на экране
@@ -478,13 +511,13 @@ class VideoPlayerWidget(QWidget):
 
                 # --- ПРОВЕРКИ ---
 
-                # 1. CSRT
-                if "csrt" in model_type and not is_active:
-                    self.error_occurred.emit("CSRT требует выделения объекта (или загруженных данных).")
+                # 1. CSRT и другие трекеры без автопоиска
+                if not tracker.can_autostart and not is_active:
+                    self.error_occurred.emit(f"{tracker.label} требует выделения объекта (или загруженных данных).")
                     return
 
-                # 2. YOLO (Автозапуск)
-                if "yolo" in model_type and not is_active:
+                # 2. YOLO / Hybrid (Автозапуск)
+                if tracker.can_autostart and not is_active:
                     found = self.thread.try_yolo_autostart()
                     if not found:
                         self.error_occurred.emit("YOLO не нашел объектов на этом кадре.")
@@ -504,9 +537,8 @@ class VideoPlayerWidget(QWidget):
     @Slot()
     def stop_video(self):
         self.thread.is_paused = True
-        self.thread.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
         self.btn_play.setIcon(self.icon_play)
-        self.thread.next_frame()
+        self.thread.seek(0)
 
     def cleanup(self):
         try:
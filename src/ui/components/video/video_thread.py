@@ -1,21 +1,90 @@
+import threading
+import time
+
 import cv2
 import numpy as np
 from PySide6.QtCore import QThread, Signal
 
-from src.core import Video
-from src.core.tracker import TrackerWrapper
+from src.core import KeyframeIndex, Video, reader_pool
+from src.core.frame_buffer import DecodeAheadReader, FrameCache
+from src.core.tracker import TrackerWrapper, has_size
+from src.cv.tracker_registry import get_backend
+from src.ui.threads.tracking_worker import TrackingWorker
+
+# Размер буфера предекодирования (кадров)
+DECODE_AHEAD_FRAMES = 8
+# Если отстали от графика больше чем на это время (сек) - не догоняем, а сбрасываем часы
+MAX_PLAYBACK_LAG = 0.25
+# Сколько последних показанных кадров держать в памяти (для шагов назад и кликов по таймлайну)
+FRAME_CACHE_SIZE = 32
+# Максимальный кусок, декодируемый за раз при шагах назад (кадров и байт)
+REVERSE_CHUNK_FRAMES = 60
+REVERSE_CHUNK_BYTES = 512 * 1024 * 1024
+
+
+class FramePacket:
+    """Кадр для показа вместе с состоянием трекера на нем"""
+
+    __slots__ = ("frame", "frame_idx", "success", "bbox")
+
+    def __init__(self, frame: np.ndarray, frame_idx: int, success: bool, bbox):
+        self.frame = frame
+        self.frame_idx = frame_idx
+        self.success = success
+        self.bbox = bbox
+
+
+class FrameMailbox:
+    """
+    Почтовый ящик на один кадр между VideoThread и UI.
+    Новый кадр заменяет непрочитанный (побеждает последний), поэтому
+    очередь событий Qt не растет, если отрисовка не успевает за потоком.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._packet = None
+        self.posted = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def post(self, packet: FramePacket) -> bool:
+        """Кладет кадр. True - ящик был пуст и UI нужно разбудить."""
+        with self._lock:
+            was_empty = self._packet is None
+            if not was_empty:
+                self.dropped += 1
+            self._packet = packet
+            self.posted += 1
+            return was_empty
+
+    def take(self):
+        with self._lock:
+            packet = self._packet
+            self._packet = None
+            if packet is not None:
+                self.delivered += 1
+            return packet
+
+    def reset_counters(self):
+        with self._lock:
+            self.posted = self.delivered = self.dropped = 0
 
 
 class VideoThread(QThread):
     # Сигналы
-    change_pixmap_signal = Signal(np.ndarray)
-    frame_changed_signal = Signal(int)
+    # Новый кадр в mailbox (эмитится только когда ящик был пуст)
+    frame_ready = Signal()
     tracker_update_signal = Signal(bool, object)  # (success, bbox)
     tracker_loading_signal = Signal(bool)
     tracking_error_signal = Signal(str)
 
     # СИГНАЛ ДЛЯ ТАЙМЛАЙНА (int frame_idx, object bbox)
     frame_data_updated = Signal(int, object)
+    # До какого кадра дошел трекинг в фоне
+    tracking_progress = Signal(int)
+    # Плеер сам встал на паузу: видео (или трекинг в турбо-режиме) дошло до конца
+    playback_finished = Signal()
 
     def __init__(self, video: Video):
         super().__init__()
@@ -23,29 +92,106 @@ class VideoThread(QThread):
         self._run_flag = True
         self.is_paused = False
 
-        self.cap = cv2.VideoCapture(self.video.path)
-        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
-
-        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
-        self.normal_delay = int(1000 / self.fps)
-        self.turbo_delay = 1  # Минимальная задержка
+        self.cap = reader_pool.acquire(self.video.path)
+        info = reader_pool.probe(self.video.path)
+        self.total_frames = info.total_frames
 
-        self.current_delay = self.normal_delay
+        self.fps = info.fps or 30
+        self.frame_interval = 1.0 / self.fps
         self.is_turbo = False
 
+        # Декодер работает в своем потоке и заполняет кольцевой буфер
+        self.reader = DecodeAheadReader(
+            self.cap, DECODE_AHEAD_FRAMES, (info.height, info.width, 3)
+        )
+        self.reader.start()
+        self.frame_cache = FrameCache(FRAME_CACHE_SIZE)
+        # Кольцевой буфер для шагов назад: кусок группы кадров, декодированный вперед
+        self.reverse_buffer = FrameCache(REVERSE_CHUNK_FRAMES, REVERSE_CHUNK_BYTES)
+        frame_bytes = max(1, info.width * info.height * 3)
+        self.reverse_chunk = max(1, min(REVERSE_CHUNK_FRAMES, REVERSE_CHUNK_BYTES // frame_bytes))
+        self.keyframe_index = None
+
+        # Показ кадров: последний кадр побеждает
+        self.mailbox = FrameMailbox()
+        self._last_packet = None
+
+        # Размер области показа (пиксели экрана); кадры для UI уменьшаются под него,
+        # а трекинг и разметка работают в полном разрешении
+        self.display_size = None
+        # Если кадр показан из памяти, декодер перематывается только перед чтением
+        self._pending_reader_seek = None
+        # Шаг назад, ждущий декодирования куска (кадр-цель), и кадр, для которого кусок готов
+        self._reverse_target = None
+        self._reverse_ready = None
+
+        # Индекс ключевых кадров строится в фоне (или читается из .morris/)
+        threading.Thread(target=self._load_keyframe_index, daemon=True).start()
+
+        # Сериализует работу с кадрами между потоком плеера и UI (seek/шаги)
+        self._frame_lock = threading.RLock()
+        self.current_frame_idx = 0
+
         self.tracker = None
         self.is_tracking_active = False
         self.last_frame_buffer = None
         self.is_model_loading = False
+        # Масштаб кадра для трекера (см. TrackerWrapper); задается из настроек проекта
+        self.tracking_scale = 1.0
+        self.tracking_max_side = None
+        # Порог MotionGate (пропуск трекера на кадрах без движения); 0 - выключен
+        self.motion_threshold = 0.0
+        # (runtime, threads, precision) прохода сети YOLO; None - cv2.dnn
+        self.inference = None
 
         self.tracking_data = {}
+        # Уверенность трекера по кадрам (только там, где бэкенд ее оценивает)
+        self.confidence_data = {}
+
+        # Трекинг идет в своем потоке; плеер только показывает готовую разметку
+        self.tracking_worker = None
+        self._worker_lock = threading.Lock()
+
+    def _load_keyframe_index(self):
+        cache_dir = self.video.path.parent / ".morris"
+        index = KeyframeIndex.load_or_build(self.video.path, cache_dir)
+        self.keyframe_index = index
+        self.reader.set_keyframe_index(index)
+
+    def set_display_size(self, width: int, height: int):
+        new_size = (width, height) if width > 0 and height > 0 else None
+        if new_size == self.display_size:
+            return
+        self.display_size = new_size
+
+        # На паузе перерисовываем текущий кадр в новом размере
+        if self.is_paused and self._last_packet is not None:
+            with self._frame_lock:
+                last = self._last_packet
+                cv_img = self._cached_frame(last.frame_idx)
+                if cv_img is not None:
+                    self._emit_frame(cv_img, last.frame_idx, last.success, last.bbox, True)
+
+    def _to_display(self, cv_img):
+        """Уменьшает кадр до размера области показа (никогда не увеличивает)"""
+        if self.display_size is None:
+            return cv_img
+        h, w = cv_img.shape[:2]
+        scale = min(self.display_size[0] / w, self.display_size[1] / h)
+        if scale >= 1.0:
+            return cv_img
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+        return cv2.resize(cv_img, size, interpolation=cv2.INTER_AREA)
 
     def set_turbo_mode(self, enabled: bool):
         self.is_turbo = enabled
-        self.current_delay = self.turbo_delay if enabled else self.normal_delay
+        worker = self.tracking_worker
+        if worker is not None:
+            worker.show_frames = enabled
 
     def set_tracker_model(self, model_name: str):
-        if model_name not in ["CSRT", "YOLO"]:
+        self._stop_tracking_worker()
+        if get_backend(model_name) is None:
             self.tracker = None
             self.is_tracking_active = False
             self.tracker_update_signal.emit(False, None)
@@ -56,13 +202,16 @@ class VideoThread(QThread):
         self.msleep(50)
 
         try:
-            self.tracker = TrackerWrapper(model_name)
+            # Модель грузится один раз на процесс: повторный выбор мгновенный
+            self.tracker = self._create_tracker(model_name)
+            self.tracker.load()
+            # Модель фона и т.п.: кадры со всего видео (отдельный захват из пула)
+            self.tracker.prepare_video(self.video.path)
 
             # Проверка: если на текущем кадре уже есть разметка, подхватываем её
-            current_idx = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
-            if current_idx > 0: current_idx -= 1
+            current_idx = self.current_frame_idx
 
-            if current_idx in self.tracking_data:
+            if has_size(self.tracking_data.get(current_idx)):
                 bbox = self.tracking_data[current_idx]
                 if self.last_frame_buffer is not None:
                     clean_bbox = tuple(map(int, bbox))
@@ -76,10 +225,40 @@ class VideoThread(QThread):
             self.is_model_loading = False
             self.tracker_loading_signal.emit(False)
 
+    def _create_tracker(self, model_name: str) -> TrackerWrapper:
+        return TrackerWrapper(model_name, scale=self.tracking_scale, max_side=self.tracking_max_side,
+                              motion_threshold=self.motion_threshold, inference=self.inference)
+
+    def set_tracking_scale(self, scale: float, max_side: int = None):
+        """Новый масштаб кадра для трекера; текущий трекер пересоздается"""
+        if (scale, max_side) == (self.tracking_scale, self.tracking_max_side):
+            return
+        self.tracking_scale = scale
+        self.tracking_max_side = max_side
+        if self.tracker is not None:
+            self.set_tracker_model(self.tracker.model_type)
+
+    def set_motion_threshold(self, threshold: float):
+        """Новый порог MotionGate; текущий трекер пересоздается"""
+        if threshold == self.motion_threshold:
+            return
+        self.motion_threshold = threshold
+        if self.tracker is not None:
+            self.set_tracker_model(self.tracker.model_type)
+
+    def set_inference(self, inference: tuple):
+        """Новые настройки прохода сети YOLO; текущий трекер пересоздается"""
+        if inference == self.inference:
+            return
+        self.inference = inference
+        if self.tracker is not None:
+            self.set_tracker_model(self.tracker.model_type)
+
     def init_tracker_manually(self, bbox: tuple):
         """Ручная установка bbox на текущем кадре"""
+        self._stop_tracking_worker()
         if self.tracker is None:
-            self.tracker = TrackerWrapper("csrt")
+            self.tracker = self._create_tracker("csrt")
 
         if self.last_frame_buffer is not None:
             clean_bbox = tuple(map(int, bbox))
@@ -87,12 +266,11 @@ class VideoThread(QThread):
             self.is_tracking_active = True
 
             # Сохраняем
-            save_idx = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
-            # Корректировка индекса, если мы на паузе (обычно pos указывает на следующий)
-            if save_idx > 0: save_idx -= 1
-            if save_idx < 0: save_idx = 0
+            save_idx = self.current_frame_idx
 
             self.tracking_data[save_idx] = clean_bbox
+            # Выделено вручную - сомнений нет
+            self.confidence_data[save_idx] = 1.0
 
             # --- ВАЖНО: УВЕДОМЛЯЕМ ТАЙМЛАЙН ---
             self.frame_data_updated.emit(save_idx, clean_bbox)
@@ -106,11 +284,10 @@ class VideoThread(QThread):
         success, bbox = self.tracker.update(self.last_frame_buffer)
 
         if success:
-            current_frame = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
-            if self.is_paused and current_frame > 0:
-                current_frame -= 1
+            current_frame = self.current_frame_idx
 
             self.tracking_data[current_frame] = bbox
+            self._record_confidence(current_frame)
 
             # --- УВЕДОМЛЯЕМ ТАЙМЛАЙН ---
             self.frame_data_updated.emit(current_frame, bbox)
@@ -124,12 +301,12 @@ class VideoThread(QThread):
         if not self.tracker or self.last_frame_buffer is None:
             return False
 
-        current_frame = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
-        idx_candidates = [current_frame, current_frame - 1]
+        current_frame = self.current_frame_idx
+        idx_candidates = [current_frame, current_frame + 1]
 
         found_bbox = None
         for idx in idx_candidates:
-            if idx in self.tracking_data:
+            if has_size(self.tracking_data.get(idx)):
                 found_bbox = self.tracking_data[idx]
                 break
 
@@ -142,116 +319,317 @@ class VideoThread(QThread):
         return False
 
     def run(self):
+        next_frame_time = None
+
         while self._run_flag:
-            if not self.is_paused:
-                ret, cv_img = self.cap.read()
-                if ret:
-                    self.last_frame_buffer = cv_img
-                    current_frame_idx = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES)) - 1
-
-                    if self.is_tracking_active and self.tracker:
-                        success, bbox = self.tracker.update(cv_img)
-
-                        if success:
-                            self.tracking_data[current_frame_idx] = bbox
-
-                            # --- УВЕДОМЛЯЕМ ТАЙМЛАЙН (Здесь этого не хватало) ---
-                            self.frame_data_updated.emit(current_frame_idx, bbox)
-
-                            self.tracker_update_signal.emit(True, bbox)
-                        else:
-                            # Потеряли объект
-                            self.is_tracking_active = False
-                            self.tracker_update_signal.emit(False, None)
-                            self.is_paused = True
-                            self.tracking_error_signal.emit("YOLO потерял объект. Разметка остановлена.")
-
-                    elif current_frame_idx in self.tracking_data:
-                        bbox = self.tracking_data[current_frame_idx]
-                        self.tracker_update_signal.emit(True, bbox)
-                    else:
-                        self.tracker_update_signal.emit(False, None)
+            if self.is_paused:
+                if self.tracking_worker is not None:
+                    self._finish_tracking_worker()
+                if self._reverse_ready is not None:
+                    self._finish_reverse_step()
+                next_frame_time = None
+                self.msleep(50)
+                continue
+
+            worker = self.tracking_worker
+            if worker is None and self.is_tracking_active and self.tracker:
+                worker = self._start_tracking_worker()
+
+            if worker is not None:
+                self._apply_tracked(worker)
+
+            if worker is not None and worker.isFinished() and (worker.lost_at is not None or self.is_turbo):
+                # Трекер потерял объект или (в турбо) дошел до конца видео
+                self._apply_tracked(worker)
+                self.is_paused = True
+                if worker.lost_at is None:
+                    self.playback_finished.emit()
+                continue
+
+            if self.is_turbo and worker is not None:
+                # В турбо кадры показывает поток трекинга, декодер плеера простаивает
+                next_frame_time = None
+                self.msleep(20)
+                continue
+
+            with self._frame_lock:
+                if not self.is_paused:
+                    self._play_next_frame()
+
+            if self.is_turbo or self.is_paused:
+                next_frame_time = None
+                continue
+
+            # Темп задается монотонными часами: время обработки кадра
+            # (конвертация, показ) вычитается из паузы до следующего кадра
+            now = time.monotonic()
+            if next_frame_time is None or now - next_frame_time > MAX_PLAYBACK_LAG:
+                next_frame_time = now
+            next_frame_time += self.frame_interval
+
+            delay = next_frame_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def _start_tracking_worker(self):
+        """Запускает трекинг со следующего кадра (трекер инициализирован на текущем)"""
+        worker = TrackingWorker(self.video.path, self.tracker, self.current_frame_idx + 1, self.keyframe_index)
+        worker.show_frames = self.is_turbo
+        worker.progress_changed.connect(self.tracking_progress)
+        with self._worker_lock:
+            self.tracking_worker = worker
+        worker.start()
+        return worker
+
+    def _stop_tracking_worker(self):
+        """Останавливает фоновый трекинг; трекер остается на последнем обработанном кадре"""
+        with self._worker_lock:
+            worker, self.tracking_worker = self.tracking_worker, None
+        if worker is not None:
+            worker.stop()
+            # Разметка, которую плеер еще не забрал
+            self._apply_tracked(worker)
+        return worker
+
+    def _finish_tracking_worker(self):
+        """
+        Останавливает трекинг и согласует трекер с показанным кадром.
+        Показ мог уйти вперед трекинга - тогда плеер возвращается
+        на кадр, до которого дошел трекер.
+        """
+        worker = self._stop_tracking_worker()
+        if worker is None:
+            return
+
+        if worker.lost_at is not None:
+            self.is_paused = True
+            self.seek(worker.lost_at)
+            self.tracking_error_signal.emit("YOLO потерял объект. Разметка остановлена.")
+        else:
+            self.seek(min(self.current_frame_idx, worker.last_tracked))
+
+    def _apply_tracked(self, worker: TrackingWorker):
+        """
+        Переносит готовую разметку потока трекинга в tracking_data и confidence_data,
+        в турбо-режиме показывает его последний кадр. Общее состояние плеера
+        меняется только здесь и под _frame_lock, не в потоке трекинга.
+        """
+        results, frame = worker.results.take()
+        if not results and frame is None:
+            return
 
-                    self.change_pixmap_signal.emit(cv_img)
-                    self.frame_changed_signal.emit(current_frame_idx)
+        with self._frame_lock:
+            for frame_idx, bbox, confidence in results:
+                self.tracking_data[frame_idx] = bbox
+                if confidence is None:
+                    self.confidence_data.pop(frame_idx, None)
                 else:
-                    self.is_paused = True
-                    self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-            else:
-                self.msleep(50)
+                    self.confidence_data[frame_idx] = confidence
+
+            if frame is not None and self.is_turbo:
+                cv_img, frame_idx, bbox = frame
+                # Кадр уже скопирован потоком трекинга
+                self.frame_cache.put(frame_idx, cv_img)
+                self.last_frame_buffer = self._emit_frame(cv_img, frame_idx, True, bbox, True)
+                self.current_frame_idx = frame_idx
+                # После выхода из турбо плеер продолжит с этого места
+                self._pending_reader_seek = frame_idx + 1
+
+        for frame_idx, bbox, _ in results:
+            self.frame_data_updated.emit(frame_idx, bbox)
+
+    def _read_next(self):
+        if self._pending_reader_seek is not None:
+            self.reader.seek(self._pending_reader_seek)
+            self._pending_reader_seek = None
+            # Перемотка отменяет задание декодера для шага назад
+            self._reverse_target = None
+        return self.reader.read()
+
+    def _cached_frame(self, frame_index):
+        cv_img = self.frame_cache.get(frame_index)
+        if cv_img is None:
+            cv_img = self.reverse_buffer.get(frame_index)
+        return cv_img
+
+    def _fill_reverse_buffer(self, frame_index):
+        """
+        Ставит декодеру задание: кусок кадров, заканчивающийся на frame_index.
+        Не ждет - шаг назад на frame_index сделает поток плеера, когда кусок будет готов.
+        """
+        start = max(0, frame_index - self.reverse_chunk + 1)
+        if self.keyframe_index is not None:
+            # Кусок не заходит в предыдущую группу кадров: декодирование начнется с ключевого кадра
+            start = max(start, self.keyframe_index.keyframe_before(frame_index))
+
+        self._reverse_target = frame_index
+        self.reader.decode_range_async(start, frame_index,
+                                       lambda frames: self._on_reverse_filled(frame_index, frames))
+        # Пока кусок декодируется, плеер стоит на текущем кадре
+        self._pending_reader_seek = self.current_frame_idx + 1
+
+    def _on_reverse_filled(self, frame_index, frames):
+        """Вызывается из потока декодера; _frame_lock не берется (его держатель может ждать декодер)"""
+        for idx, frame in frames:
+            self.reverse_buffer.put(idx, frame)
+        self._reverse_ready = frame_index
+
+    def _finish_reverse_step(self):
+        """Отложенный шаг назад, когда кусок для него декодирован"""
+        with self._frame_lock:
+            target, self._reverse_ready = self._reverse_ready, None
+            # Пока декодировали, пользователь мог перемотать или пойти вперед
+            if target is None or target != self._reverse_target:
+                return
+            self._reverse_target = None
+            if self.current_frame_idx == target + 1:
+                self.seek(target)
+
+    def _play_next_frame(self):
+        ret, frame_idx, cv_img = self._read_next()
+        if not ret:
+            self.is_paused = True
+            self.reader.seek(0)
+            self.playback_finished.emit()
+            return
+
+        self.current_frame_idx = frame_idx
+        success, bbox = False, None
+
+        # Разметку считает поток трекинга; показываем то, что уже готово
+        if frame_idx in self.tracking_data:
+            success, bbox = True, self.tracking_data[frame_idx]
+
+        self.last_frame_buffer = self._emit_frame(cv_img, frame_idx, success, bbox)
+
+    def _emit_frame(self, cv_img, frame_idx, success, bbox, from_cache=False):
+        if not from_cache:
+            # Кадр из кольцевого буфера будет перезаписан декодером,
+            # поэтому в UI-поток (и в кеш) уходит копия
+            cv_img = cv_img.copy()
+            self.frame_cache.put(frame_idx, cv_img)
 
-            if not self.is_paused:
-                self.msleep(self.current_delay)
+        # Если UI не успел забрать предыдущий кадр, он заменяется новым
+        packet = FramePacket(self._to_display(cv_img), frame_idx, success, bbox)
+        self._last_packet = packet
+        if self.mailbox.post(packet):
+            self.frame_ready.emit()
+        return cv_img
 
     def seek(self, frame_index):
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_index)
-        ret, cv_img = self.cap.read()
-        if ret:
-            self.last_frame_buffer = cv_img
-            self.change_pixmap_signal.emit(cv_img)
-            self.frame_changed_signal.emit(frame_index)
-
-            if frame_index in self.tracking_data:
-                bbox = self.tracking_data[frame_index]
-                self.tracker_update_signal.emit(True, bbox)
-                if self.tracker:
-                    clean_bbox = tuple(map(int, bbox))
-                    self.tracker.init(cv_img, clean_bbox)
-                    self.is_tracking_active = True
+        self._stop_tracking_worker()
+        with self._frame_lock:
+            self._reverse_target = None
+            cv_img = self._cached_frame(frame_index)
+            from_cache = cv_img is not None
+
+            if from_cache:
+                self._pending_reader_seek = frame_index + 1
+                ret = True
             else:
-                self.tracker_update_signal.emit(False, None)
-                self.is_tracking_active = False
-                if self.tracker:
-                    self.tracker.reset()
+                self._pending_reader_seek = frame_index
+                ret, frame_index, cv_img = self._read_next()
+
+            if ret:
+                self.last_frame_buffer = cv_img
+                self.current_frame_idx = frame_index
+
+                if frame_index in self.tracking_data:
+                    bbox = self.tracking_data[frame_index]
+                    self._emit_frame(cv_img, frame_index, True, bbox, from_cache)
+                    if self.tracker and has_size(bbox):
+                        clean_bbox = tuple(map(int, bbox))
+                        self.tracker.init(cv_img, clean_bbox)
+                        self.is_tracking_active = True
+                    elif self.tracker:
+                        # Записан только центр: трекеру нужно новое выделение
+                        self.is_tracking_active = False
+                else:
+                    self._emit_frame(cv_img, frame_index, False, None, from_cache)
+                    self.is_tracking_active = False
+                    if self.tracker:
+                        self.tracker.reset()
 
     def prev_frame(self):
         """Шаг назад на 1 кадр"""
-        if self.is_paused and self.cap.isOpened():
-            current_pos = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
-            target_pos = max(0, current_pos - 2)
+        if not self.is_paused or self.current_frame_idx <= 0:
+            return
 
-            self.seek(target_pos)
+        target = self.current_frame_idx - 1
+        with self._frame_lock:
+            if self._reverse_target is not None:
+                # Предыдущий шаг назад еще ждет декодера
+                return
+            if self._cached_frame(target) is None:
+                # Кадра нет в памяти: шаг будет сделан, когда декодер подготовит кусок
+                self._fill_reverse_buffer(target)
+            else:
+                self.seek(target)
 
     def next_frame(self):
-        if self.is_paused and self.cap.isOpened():
-            ret, cv_img = self.cap.read()
+        if not self.is_paused:
+            return
+        self._finish_tracking_worker()
+
+        with self._frame_lock:
+            ret, current_frame_idx, cv_img = self._read_next()
             if ret:
                 self.last_frame_buffer = cv_img
-                current_frame_idx = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES)) - 1
+                self.current_frame_idx = current_frame_idx
+                success, bbox = False, None
 
                 if self.is_tracking_active and self.tracker:
                     success, bbox = self.tracker.update(cv_img)
                     if success:
                         self.tracking_data[current_frame_idx] = bbox
+                        self._record_confidence(current_frame_idx)
                         self.frame_data_updated.emit(current_frame_idx, bbox)  # <--
-                        self.tracker_update_signal.emit(True, bbox)
                     else:
                         self.is_tracking_active = False
-                        self.tracker_update_signal.emit(False, None)
+                        bbox = None
 
                 elif current_frame_idx in self.tracking_data:
-                    bbox = self.tracking_data[current_frame_idx]
-                    self.tracker_update_signal.emit(True, bbox)
-                    if self.tracker:
+                    success, bbox = True, self.tracking_data[current_frame_idx]
+                    if self.tracker and has_size(bbox):
                         clean_bbox = tuple(map(int, bbox))
                         self.tracker.init(cv_img, clean_bbox)
                         self.is_tracking_active = True
+                    elif self.tracker:
+                        # Записан только центр: трекеру нужно новое выделение
+                        self.is_tracking_active = False
                 else:
-                    self.tracker_update_signal.emit(False, None)
                     self.is_tracking_active = False
                     if self.tracker:
                         self.tracker.reset()
 
-                self.change_pixmap_signal.emit(cv_img)
-                self.frame_changed_signal.emit(current_frame_idx)
+                self._emit_frame(cv_img, current_frame_idx, success, bbox)
+
+    @property
+    def dropped_frames(self) -> int:
+        """Сколько кадров было заменено новыми, не дойдя до экрана"""
+        return self.mailbox.dropped
 
     def stop(self):
         self._run_flag = False
+        self._stop_tracking_worker()
+        self.reader.stop()
         self.wait()
-        self.cap.release()
+        reader_pool.release(self.video.path, self.cap)
+        self.cap = None
 
     def get_tracking_data(self):
         return self.tracking_data
 
-    def set_tracking_data(self, data):
-        self.tracking_data = data
+    def set_tracking_data(self, data, confidence_data: dict = None):
+        self._stop_tracking_worker()
+        with self._frame_lock:
+            self.tracking_data = data
+            self.confidence_data = confidence_data if confidence_data is not None else {}
+
+    def _record_confidence(self, frame_idx: int):
+        """Уверенность последнего update() трекера для кадра (None - старая оценка удаляется)"""
+        confidence = self.tracker.last_confidence
+        if confidence is None:
+            self.confidence_data.pop(frame_idx, None)
+        else:
+            self.confidence_data[frame_idx] = confidence
@@ -23,7 +23,7 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
 )
 
-from src.core import Video
+from src.core import Video, reader_pool
 from src.ui.components.video.video_timeline_simple import FullVideoLoaderThread
 
 MAX_PENDING_REQUESTS = 30
@@ -46,7 +46,7 @@ class FrameRequestThread(QThread):
         self.pending_indices = set()
         self._lock_requests = False
 
-        self.cap = cv2.VideoCapture(self.video_path)
+        self.cap = reader_pool.acquire(self.video_path)
 
     def request_frame(self, index):
         if self._lock_requests:
@@ -128,7 +128,8 @@ class FrameRequestThread(QThread):
     def stop(self):
         self._run_flag = False
         self.wait()
-        self.cap.release()
+        reader_pool.release(self.video_path, self.cap)
+        self.cap = None
 
 
 # --- 2. МОДЕЛЬ ---
@@ -292,11 +293,10 @@ class VideoTimelineWidget(QFrame):
 
         self.thumb_w, self.thumb_h = 160, 90
 
-        cap = cv2.VideoCapture(video.path)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        orig_w = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
-        orig_h = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
-        cap.release()
+        info = reader_pool.probe(video.path)
+        total_frames = info.total_frames
+        orig_w = info.width
+        orig_h = info.height
 
         self.placeholder = QPixmap(self.thumb_w, self.thumb_h)
         self.placeholder.fill(QColor("#333333"))
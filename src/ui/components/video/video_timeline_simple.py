@@ -19,7 +19,7 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
 )
 
-from src.core import Video
+from src.core import Video, reader_pool
 
 
 class FullVideoLoaderThread(QThread):
@@ -35,8 +35,8 @@ class FullVideoLoaderThread(QThread):
         self._run_flag = True
 
     def run(self):
-        cap = cv2.VideoCapture(self.video_path)
-        
+        cap = reader_pool.acquire(self.video_path)
+
         idx = 0
         while self._run_flag:
             ret, frame = cap.read()
@@ -54,7 +54,7 @@ class FullVideoLoaderThread(QThread):
             self.frame_ready.emit(idx, pixmap)
             idx += 1
 
-        cap.release()
+        reader_pool.release(self.video_path, cap)
         self.loading_finished.emit()
 
     def stop(self):
@@ -162,11 +162,10 @@ class VideoTimelineWidget(QFrame):
 
         self.thumb_w, self.thumb_h = 160, 90
 
-        cap = cv2.VideoCapture(str(video.path))
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        orig_w = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
-        orig_h = cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
-        cap.release()
+        info = reader_pool.probe(video.path)
+        total_frames = info.total_frames
+        orig_w = info.width
+        orig_h = info.height
 
         self.placeholder = QPixmap(self.thumb_w, self.thumb_h)
         self.placeholder.fill(QColor("#333333"))
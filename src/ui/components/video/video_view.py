@@ -1,8 +1,9 @@
 import cv2
-from PySide6.QtCore import QPointF, Qt, Signal, Slot
-from PySide6.QtGui import QBrush, QColor, QImage, QPainter, QPen, QPixmap
+import numpy as np
+from PySide6.QtCore import QPointF, QRectF, Qt, Signal, Slot
+from PySide6.QtGui import QBrush, QColor, QImage, QPainter, QPen
 from PySide6.QtWidgets import (
-    QGraphicsPixmapItem,
+    QGraphicsItem,
     QGraphicsRectItem,
     QGraphicsScene,
     QGraphicsView,
@@ -11,6 +12,100 @@ from PySide6.QtWidgets import (
 from src.ui.components.video.graphics_items import EditableGeometryItem
 
 
+class FrameItem(QGraphicsItem):
+    """
+    Слой видео. Рисует кадр прямо из буфера numpy через QImage,
+    без конвертации BGR -> RGB и без создания QPixmap на каждый кадр.
+
+    Если задан исходный размер видео (set_source_size), элемент занимает
+    его в координатах сцены, а кадр (возможно, уменьшенный под окно)
+    растягивается на эту область. Так геометрия и трекер остаются
+    в координатах полного разрешения.
+    """
+
+    # Форматы, которые QImage читает из буфера OpenCV как есть
+    _FORMATS = {
+        1: QImage.Format_Grayscale8,
+        3: QImage.Format_BGR888,
+        4: QImage.Format_ARGB32,  # BGRA в памяти
+    }
+
+    def __init__(self):
+        super().__init__()
+        self._image = None
+        self._buffer = None  # ndarray, на который ссылается QImage
+        self._rect = QRectF()
+        self._source_size = None
+
+    def has_frame(self) -> bool:
+        return self._image is not None
+
+    def frame_size(self):
+        """Размер слоя в координатах сцены"""
+        return int(self._rect.width()), int(self._rect.height())
+
+    def set_source_size(self, width: int, height: int) -> bool:
+        self._source_size = (width, height) if width > 0 and height > 0 else None
+        if self._source_size:
+            return self._set_rect(*self._source_size)
+        if self._image is not None:
+            return self._set_rect(self._image.width(), self._image.height())
+        return False
+
+    def set_frame(self, cv_img: np.ndarray) -> bool:
+        """Показывает кадр. Возвращает True, если изменился размер слоя."""
+        channels = 1 if cv_img.ndim == 2 else cv_img.shape[2]
+        fmt = self._FORMATS.get(channels)
+        if fmt is None or cv_img.dtype != np.uint8:
+            # Нестандартный кадр - единственный случай, когда нужна конвертация
+            cv_img = self._to_bgr8(cv_img, channels)
+            fmt = QImage.Format_BGR888
+        elif not cv_img.flags["C_CONTIGUOUS"]:
+            cv_img = np.ascontiguousarray(cv_img)
+
+        h, w = cv_img.shape[:2]
+        self._buffer = cv_img
+        self._image = QImage(cv_img.data, w, h, cv_img.strides[0], fmt)
+
+        size_changed = self._set_rect(*(self._source_size or (w, h)))
+        self.update()
+        return size_changed
+
+    @staticmethod
+    def _to_bgr8(cv_img: np.ndarray, channels: int) -> np.ndarray:
+        """Кадр любого типа и числа каналов -> непрерывный BGR uint8"""
+        if cv_img.dtype != np.uint8:
+            # float в [0, 1] растягивается до 0-255, остальное обрезается по диапазону uint8
+            if np.issubdtype(cv_img.dtype, np.floating) and cv_img.max(initial=0.0) <= 1.0:
+                cv_img = cv_img * 255.0
+            cv_img = np.clip(cv_img, 0, 255).astype(np.uint8)
+        if channels == 4:
+            cv_img = cv2.cvtColor(cv_img, cv2.COLOR_BGRA2BGR)
+        elif channels == 1:
+            cv_img = cv2.cvtColor(cv_img.reshape(cv_img.shape[:2]), cv2.COLOR_GRAY2BGR)
+        elif channels != 3:
+            # 2 или больше 4 каналов: первые три (или первый как серый)
+            cv_img = cv_img[..., :3] if channels > 3 else cv2.cvtColor(cv_img[..., 0], cv2.COLOR_GRAY2BGR)
+        return np.ascontiguousarray(cv_img, dtype=np.uint8)
+
+    def _set_rect(self, w, h) -> bool:
+        if (w, h) == self.frame_size():
+            return False
+        self.prepareGeometryChange()
+        self._rect = QRectF(0, 0, w, h)
+        return True
+
+    def boundingRect(self):
+        return self._rect
+
+    def paint(self, painter, option, widget=None):
+        if self._image is None:
+            return
+        if self._image.width() != self._rect.width():
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.drawImage(self._rect, self._image)
+
+
 class VideoGraphicsView(QGraphicsView):
     # --- СИГНАЛЫ ---
     tracker_region_selected = Signal(tuple)
@@ -19,6 +114,7 @@ class VideoGraphicsView(QGraphicsView):
     delete_requested = Signal()
     creation_cancelled = Signal()
     scene_clicked = Signal(QPointF)
+    display_size_changed = Signal(int, int)  # размер области видео в пикселях экрана
 
     def __init__(self):
         super().__init__()
@@ -26,9 +122,9 @@ class VideoGraphicsView(QGraphicsView):
         self.setScene(self.scene)
 
         # Слой видео
-        self.pixmap_item = QGraphicsPixmapItem()
-        self.pixmap_item.setZValue(-100)
-        self.scene.addItem(self.pixmap_item)
+        self.frame_item = FrameItem()
+        self.frame_item.setZValue(-100)
+        self.scene.addItem(self.frame_item)
 
         # Зеленый квадрат (Трекер)
         self.tracker_rect_item = QGraphicsRectItem()
@@ -55,23 +151,31 @@ class VideoGraphicsView(QGraphicsView):
 
         self.scene.selectionChanged.connect(self._on_selection_changed)
 
+    def set_source_size(self, width: int, height: int):
+        """Исходное разрешение видео (координаты сцены), даже если кадры приходят уменьшенными"""
+        if self.frame_item.set_source_size(width, height):
+            self._refit()
+
     def update_image(self, cv_img):
         """Обновление изображения из потока"""
         if cv_img is None:
             return
 
-        # Конвертация BGR -> RGB
-        rgb = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb.shape
-        bytes_per_line = ch * w
-        qimg = QImage(rgb.data, w, h, bytes_per_line, QImage.Format_RGB888)
+        # Сцену и масштаб пересчитываем только при смене разрешения
+        if self.frame_item.set_frame(cv_img):
+            self._refit()
 
-        # Обновляем размер сцены под размер видео
+    def _refit(self):
+        w, h = self.frame_item.frame_size()
         self.scene.setSceneRect(0, 0, w, h)
-        self.pixmap_item.setPixmap(QPixmap.fromImage(qimg))
+        self.fitInView(self.frame_item, Qt.KeepAspectRatio)
+        self._emit_display_size()
 
-        # ВАЖНО: Подгоняем видео под текущий размер окна
-        self.fitInView(self.pixmap_item, Qt.KeepAspectRatio)
+    def _emit_display_size(self):
+        ratio = self.devicePixelRatioF()
+        self.display_size_changed.emit(
+            int(self.viewport().width() * ratio), int(self.viewport().height() * ratio)
+        )
 
     # --- ИСПРАВЛЕНИЕ: ОБРАБОТКА ИЗМЕНЕНИЯ РАЗМЕРА ОКНА ---
     def resizeEvent(self, event):
@@ -80,8 +184,9 @@ class VideoGraphicsView(QGraphicsView):
         Пересчитываем масштаб видео.
         """
         super().resizeEvent(event)
-        if self.pixmap_item.pixmap() and not self.pixmap_item.pixmap().isNull():
-            self.fitInView(self.pixmap_item, Qt.KeepAspectRatio)
+        if self.frame_item.has_frame():
+            self.fitInView(self.frame_item, Qt.KeepAspectRatio)
+        self._emit_display_size()
 
     def update_tracker_box(self, success, bbox):
         if success and bbox:
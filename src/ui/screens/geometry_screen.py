@@ -1,6 +1,5 @@
 import math
 
-import cv2
 from PySide6.QtCore import QPointF, Qt, Slot
 from PySide6.QtGui import QFont
 from PySide6.QtWidgets import (
@@ -11,6 +10,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from src.core import reader_pool
 from src.core.project import Project
 from src.services.geometry_storage import GeometryStorageService
 from src.ui.components.ruler_dialog import RulerInputDialog
@@ -101,9 +101,8 @@ class ProjectGeometryWidget(QWidget):
         sorted_videos = sorted(self.project.videos, key=lambda v: v.path.name)
         first_video = sorted_videos[0]
         self.current_video_path = first_video.path
-        cap = cv2.VideoCapture(str(self.current_video_path))
-        ret, frame = cap.read()
-        cap.release()
+        with reader_pool.lease(self.current_video_path) as cap:
+            ret, frame = cap.read()
         if ret:
             self.view.update_image(frame)
 
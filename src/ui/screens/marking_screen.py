@@ -1,6 +1,5 @@
 import math
 
-import cv2
 from PySide6.QtCore import QPointF, Qt, QThread, QTimer, Signal, Slot
 from PySide6.QtGui import QKeySequence, QShortcut
 from PySide6.QtWidgets import (
@@ -15,6 +14,7 @@ from PySide6.QtWidgets import (
 # Core
 from src.core import Video
 from src.core.project import Project
+from src.cv.motion_gate import MOTION_THRESHOLD
 
 # Services
 from src.services.geometry_storage import GeometryStorageService
@@ -43,7 +43,7 @@ class VideoMarkingWidget(QWidget):
         super().__init__()
         self.video = video
         self.project = project
-        self.storage_service = GeometryStorageService(project.path)
+        self.storage_service = GeometryStorageService(project.path, project.track_storage, project.gap_filling)
 
         # Per-video масштаб (0 = используется проектный)
         self._video_scale_factor = 0.0
@@ -123,6 +123,15 @@ class VideoMarkingWidget(QWidget):
         tracker_page.model_changed.connect(thread.set_tracker_model)
         view.tracker_region_selected.connect(thread.init_tracker_manually)
         tracker_page.manual_setup_toggled.connect(self._on_manual_tracker_toggled)
+        thread.set_tracking_scale(*self.project.tracking_scale)
+        thread.set_inference(self.project.inference)
+        tracker_page.set_scale(*self.project.tracking_scale)
+        tracker_page.scale_changed.connect(self._on_tracking_scale_changed)
+        tracker_page.set_max_gap(self.project.gap_filling[0])
+        tracker_page.max_gap_changed.connect(self._on_max_gap_changed)
+        thread.set_motion_threshold(self.project.motion_threshold)
+        tracker_page.set_motion_gate(self.project.motion_threshold > 0)
+        tracker_page.motion_gate_toggled.connect(self._on_motion_gate_toggled)
         view.tracker_region_selected.connect(self._on_tracker_region_selected)
 
         # Передаём масштаб в статистику
@@ -146,6 +155,7 @@ class VideoMarkingWidget(QWidget):
         # 4. Статистика
         self.stats_thread = QThread()
         self.stats_worker = StatisticsWorker()
+        self.stats_worker.gap_filling = self.project.gap_filling
         self.stats_worker.moveToThread(self.stats_thread)
         self.request_stats_calculation.connect(self.stats_worker.process)
         self.stats_worker.calculation_finished.connect(self._on_stats_ready)
@@ -370,10 +380,6 @@ class VideoMarkingWidget(QWidget):
     def _check_completion_status(self):
         if self.btn_status.isChecked():
             return
-        if not hasattr(self.player.thread, "total_frames"):
-            self.player.thread.total_frames = int(
-                self.player.thread.cap.get(cv2.CAP_PROP_FRAME_COUNT)
-            )
         if len(self.player.thread.tracking_data) >= self.player.thread.total_frames - 5:
             self.btn_status.blockSignals(True)
             self.btn_status.setChecked(True)
@@ -388,7 +394,7 @@ class VideoMarkingWidget(QWidget):
             self,
         )
         if dialog.exec():
-            self.player.thread.tracking_data = {}
+            self.player.thread.set_tracking_data({})
             self.player.thread.is_tracking_active = False
             if self.player.thread.tracker:
                 self.player.thread.tracker.reset()
@@ -430,7 +436,7 @@ class VideoMarkingWidget(QWidget):
     @Slot(int)
     def _on_tab_changed_check_stats(self, index):
         if index == 2:
-            current_frame = int(self.player.thread.cap.get(cv2.CAP_PROP_POS_FRAMES))
+            current_frame = self.player.thread.current_frame_idx
             self._trigger_stats_calculation(current_frame)
 
     @Slot(int)
@@ -458,6 +464,29 @@ class VideoMarkingWidget(QWidget):
         else:
             self.player.view.set_tracker_setup_mode(False)
 
+    @Slot(float, int)
+    def _on_tracking_scale_changed(self, scale, max_side):
+        # Масштаб общий для проекта: им же пользуется пакетный трекинг
+        self.project.tracking_settings = {**self.project.tracking_settings, "scale": scale, "max_side": max_side}
+        self.project.save_config()
+        self.player.thread.set_tracking_scale(scale, max_side or None)
+
+    @Slot(int)
+    def _on_max_gap_changed(self, max_gap):
+        self.project.tracking_settings = {**self.project.tracking_settings, "max_gap": max_gap}
+        self.project.save_config()
+        self.storage_service.gap_filling = self.project.gap_filling
+        self.stats_worker.gap_filling = self.project.gap_filling
+        current_frame = self.player.thread.current_frame_idx
+        self._trigger_stats_calculation(current_frame)
+
+    @Slot(bool)
+    def _on_motion_gate_toggled(self, enabled):
+        threshold = MOTION_THRESHOLD if enabled else 0.0
+        self.project.tracking_settings = {**self.project.tracking_settings, "motion_threshold": threshold}
+        self.project.save_config()
+        self.player.thread.set_motion_threshold(threshold)
+
     @Slot(tuple)
     def _on_tracker_region_selected(self, bbox):
         self.player.thread.init_tracker_manually(bbox)
@@ -470,11 +499,12 @@ class VideoMarkingWidget(QWidget):
         max_frame = max(tracking_data.keys()) if tracking_data else 0
         zones_snapshot = StatisticsService.prepare_geometry_snapshot(items)
         _, zones_stats_result = StatisticsService.calculate(
-            tracking_data, zones_snapshot, fps, max_frame
+            tracking_data, zones_snapshot, fps, max_frame, *self.project.gap_filling
         )
         is_finished = self.btn_status.isChecked()
         self.storage_service.save(
-            self.video.path, items, tracking_data, zones_stats_result, is_finished
+            self.video.path, items, tracking_data, zones_stats_result, is_finished,
+            self.player.thread.confidence_data
         )
 
     def load_data(self):
@@ -493,9 +523,11 @@ class VideoMarkingWidget(QWidget):
             geom_page.add_existing_item(item)
             item.set_locked(not is_enabled)
         if tracking_data:
-            self.player.thread.set_tracking_data(tracking_data)
+            self.player.thread.set_tracking_data(
+                tracking_data, self.storage_service.load_confidence(self.video.path)
+            )
             self.timeline.model.set_tracking_data_map(tracking_data)
-            current_frame = int(self.player.thread.cap.get(cv2.CAP_PROP_POS_FRAMES))
+            current_frame = self.player.thread.current_frame_idx
             if current_frame in tracking_data:
                 bbox = tracking_data[current_frame]
                 self.player.view.update_tracker_box(True, bbox)
@@ -505,10 +537,8 @@ class VideoMarkingWidget(QWidget):
         tracking_data = self.player.thread.tracking_data
         geometry_items = self.right_panel.geometry_page.get_all_items()
 
-        cap = cv2.VideoCapture(str(self.video.path))
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        cap.release()
+        info = self.video.info
+        width, height = info.width, info.height
 
         video_size = (width, height)
         export_size = (
@@ -537,12 +567,10 @@ class VideoMarkingWidget(QWidget):
     def _on_trajectory_clicked(self):
         geometry_items = self.right_panel.geometry_page.get_all_items()
         tracking_data = self.player.thread.tracking_data
-        current_frame = int(self.player.thread.cap.get(cv2.CAP_PROP_POS_FRAMES))
+        current_frame = self.player.thread.current_frame_idx
 
-        cap = cv2.VideoCapture(str(self.video.path))
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        cap.release()
+        info = self.video.info
+        width, height = info.width, info.height
 
         export_settings = self.project.export_settings or {}
         compass_settings = self.project.compass_settings or {}
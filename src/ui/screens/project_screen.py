@@ -8,7 +8,7 @@ from PySide6.QtWidgets import (QStackedWidget, QMainWindow, QWidget, QHBoxLayout
                                QFrame, QVBoxLayout, QLabel, QScrollArea, QButtonGroup, QFileDialog, QMenu)
 
 from src.config import get_resource_path
-from src.core import Video
+from src.core import Video, reader_pool
 from src.core.project import Project
 from src.services.geometry_storage import GeometryStorageService
 from src.ui.components import ModernButton, FlowLayout
@@ -410,6 +410,9 @@ class ProjectWindow(QMainWindow):
         if hasattr(self, 'statistics_screen'):
             self.statistics_screen.cleanup()
 
+        # Закрываем свободные декодеры проекта
+        reader_pool.close_all()
+
         event.accept()
         super().closeEvent(event)
 
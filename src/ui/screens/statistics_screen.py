@@ -2,7 +2,6 @@ import csv
 import math
 from pathlib import Path
 
-import cv2
 from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtGui import QColor
 from PySide6.QtWidgets import (
@@ -21,6 +20,7 @@ from PySide6.QtWidgets import (
 
 from src.core.mor_parser.morris_file import MorrisFile
 from src.core.project import Project
+from src.services.statistics_service import StatisticsService
 
 
 class StatisticsLoader(QThread):
@@ -54,10 +54,10 @@ class StatisticsLoader(QThread):
             else:
                 sf = project_sf
 
-            calibrated = sf > 0
-
             row_data = {
                 "name": video.path.name,
+                # Несколько животных: имя трека (у каждого трека своя строка)
+                "track": "",
                 "is_marked": False,
                 "total_time": 0.0,
                 "total_dist": None,
@@ -68,96 +68,64 @@ class StatisticsLoader(QThread):
 
             if mor_path.exists():
                 try:
-                    cap = cv2.VideoCapture(str(video.path))
-                    fps = cap.get(cv2.CAP_PROP_FPS)
+                    fps = video.info.fps
                     if not fps or math.isnan(fps):
                         fps = 30.0
-                    cap.release()
 
                     mor = MorrisFile(str(mor_path))
                     mor.load()
 
-                    active_zones = []
-                    for stat in mor.stats_blocks:
-                        if getattr(stat, "is_active", True):
-                            all_zone_names.add(stat.name)
-                            active_zones.append(
-                                {
-                                    "name": stat.name,
-                                    "geom": stat.geometry,
-                                    "time": 0.0,
-                                    "dist_px": 0.0,
-                                }
-                            )
-
-                    total_dist_px = 0.0
-                    total_frames = 0
-                    prev_center = None
-                    frame_time = 1.0 / fps
-
-                    for block in mor.sequence.blocks:
-                        total_frames += len(block.rects)
-                        for rect in block.rects:
-                            cx = rect[0] + rect[2] / 2
-                            cy = rect[1] + rect[3] / 2
-                            step_dist = 0.0
-                            if prev_center:
-                                step_dist = math.hypot(
-                                    cx - prev_center[0], cy - prev_center[1]
-                                )
-                                total_dist_px += step_dist
-                            for zone in active_zones:
-                                if zone["geom"].contains(cx, cy):
-                                    zone["time"] += frame_time
-                                    zone["dist_px"] += step_dist
-                            prev_center = (cx, cy)
-                        prev_center = None
+                    zones_snapshot = StatisticsService.prepare_stat_blocks_snapshot(mor.stats_blocks)
+                    all_zone_names.update(zone["name"] for zone in zones_snapshot)
 
                     row_data["is_marked"] = mor.get_marked_status()
-                    row_data["total_time"] = total_frames / fps
-
-                    if calibrated:
-                        row_data["total_dist"] = total_dist_px / sf
-                    else:
-                        row_data["total_dist"] = None
-
-                    for zone in active_zones:
-                        zone_time = zone["time"]
-                        if calibrated:
-                            zone_dist = zone["dist_px"] / sf
-                        else:
-                            zone_dist = None
-
-                        pct_time = (
-                            (zone_time / row_data["total_time"] * 100)
-                            if row_data["total_time"] > 0
-                            else 0
-                        )
-                        if (
-                            calibrated
-                            and row_data["total_dist"]
-                            and row_data["total_dist"] > 0
-                        ):
-                            pct_dist = zone_dist / row_data["total_dist"] * 100
-                        else:
-                            pct_dist = None
-
-                        row_data["zones"][zone["name"]] = {
-                            "time": zone_time,
-                            "dist": zone_dist,
-                            "pct_time": pct_time,
-                            "pct_dist": pct_dist,
-                        }
+                    track_ids = [track_id for track_id in sorted(mor.tracks)
+                                 if track_id == MorrisFile.MAIN_TRACK or mor.tracks[track_id].blocks]
+                    track_rows = []
+                    for track_id in track_ids:
+                        track_row = dict(row_data)
+                        if len(track_ids) > 1:
+                            track_row["track"] = mor.get_track_name(track_id)
+                        track_row.update(self._track_stats(mor.tracks[track_id].to_dict(), zones_snapshot, fps, sf))
+                        track_rows.append(track_row)
+                    rows.extend(track_rows)
+                    row_data = None
 
                 except Exception as e:
                     print(f"Error calculating stats for {mor_path}: {e}")
 
-            rows.append(row_data)
+            if row_data is not None:
+                rows.append(row_data)
             self.progress.emit(int((i + 1) / total_vids * 100))
 
         sorted_zones = sorted(list(all_zone_names))
         self.finished.emit(rows, sorted_zones)
 
+    def _track_stats(self, tracking_data: dict, zones_snapshot: list, fps: float, sf: float) -> dict:
+        """
+        Время, дистанция и зоны одного трека - тем же StatisticsService.calculate,
+        что и в экране разметки (с заполнением пропусков из настроек проекта).
+        Дистанции в метрах, если задан масштаб sf, иначе None.
+        """
+        calibrated = sf > 0
+        max_frame = max(tracking_data) if tracking_data else 0
+        global_stats, zones_stats = StatisticsService.calculate(
+            tracking_data, zones_snapshot, fps, max_frame, *self.project.gap_filling
+        )
+
+        total_time = global_stats["total_time"]
+        total_dist = global_stats["total_distance"] / sf if calibrated else None
+        zones = {}
+        for name, zone in zones_stats.items():
+            zone_dist = zone["dist"] / sf if calibrated else None
+            zones[name] = {
+                "time": zone["time"],
+                "dist": zone_dist,
+                "pct_time": zone["time"] / total_time * 100 if total_time > 0 else 0,
+                "pct_dist": zone_dist / total_dist * 100 if calibrated and total_dist else None,
+            }
+        return {"total_time": total_time, "total_dist": total_dist, "zones": zones}
+
 
 class ProjectStatisticsWidget(QWidget):
     video_requested = Signal(str)
@@ -167,6 +135,7 @@ class ProjectStatisticsWidget(QWidget):
         self.project = project
         self.rows_data = []
         self.zone_columns = []
+        self.has_tracks = False
         self.loader = None
 
         layout = QVBoxLayout(self)
@@ -289,10 +258,12 @@ class ProjectStatisticsWidget(QWidget):
         self.zone_columns = unique_zones
 
         calibrated = self.project.is_calibrated
+        # Колонка трека - только если в проекте есть видео с несколькими животными
+        self.has_tracks = any(row["track"] for row in rows)
 
         # Заголовки
         dist_label = "Дист., м" if calibrated else "Дист."
-        headers = ["Видео", "Размечено", "Время, с", dist_label]
+        headers = ["Видео"] + (["Трек"] if self.has_tracks else []) + ["Размечено", "Время, с", dist_label]
         for z in unique_zones:
             headers.append(f"Время, с ({z})")
             headers.append(f"{'Дист., м' if calibrated else 'Дист.'} ({z})")
@@ -312,6 +283,10 @@ class ProjectStatisticsWidget(QWidget):
             self.table.setItem(i, col, name_item)
             col += 1
 
+            if self.has_tracks:
+                self.table.setItem(i, col, QTableWidgetItem(row["track"] or "-"))
+                col += 1
+
             status_txt = "Да" if row["is_marked"] else "Нет"
             item_status = QTableWidgetItem(status_txt)
             item_status.setForeground(
@@ -373,7 +348,8 @@ class ProjectStatisticsWidget(QWidget):
             with open(path, "w", newline="", encoding="utf-8-sig") as f:
                 writer = csv.writer(f, delimiter=";")
 
-                headers = ["Video", "Is Marked", "Total Time (s)", f"Total {dist_h}"]
+                headers = ["Video"] + (["Track"] if self.has_tracks else []) + [
+                    "Is Marked", "Total Time (s)", f"Total {dist_h}"]
                 for z in self.zone_columns:
                     headers.append(f"Time (s) [{z}]")
                     headers.append(f"{dist_h} [{z}]")
@@ -382,8 +358,7 @@ class ProjectStatisticsWidget(QWidget):
                 writer.writerow(headers)
 
                 for row in self.rows_data:
-                    csv_row = [
-                        row["name"],
+                    csv_row = [row["name"]] + ([row["track"]] if self.has_tracks else []) + [
                         "Yes" if row["is_marked"] else "No",
                         f"{row['total_time']:.3f}".replace(".", ","),
                     ]
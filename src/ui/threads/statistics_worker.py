@@ -6,6 +6,11 @@ class StatisticsWorker(QObject):
     # Сигнал завершения: (global_stats, zones_stats)
     calculation_finished = Signal(dict, dict)
 
+    def __init__(self):
+        super().__init__()
+        # (max_gap, method) - заполнение коротких пропусков трека перед расчетом
+        self.gap_filling = (0, "linear")
+
     @Slot(dict, list, float, int)
     def process(self, tracking_data, active_zones, fps, current_frame):
         """
@@ -16,7 +21,8 @@ class StatisticsWorker(QObject):
                 tracking_data,
                 active_zones,
                 fps,
-                current_frame
+                current_frame,
+                *self.gap_filling
             )
             self.calculation_finished.emit(g_stats, z_stats)
         except Exception as e:
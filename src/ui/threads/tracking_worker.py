@@ -0,0 +1,124 @@
+import threading
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+from src.core import reader_pool
+from src.core.frame_buffer import DecodeAheadReader
+from src.core.tracker import track_batches
+
+# Сколько кадров декодер готовит заранее, пока трекер занят
+DECODE_AHEAD_FRAMES = 8
+# Как часто (сек) сообщать, до какого кадра дошел трекинг
+PROGRESS_INTERVAL = 0.1
+# Кадры для показа (турбо-режим) отдаются не чаще этого интервала (сек)
+SHOW_FRAME_INTERVAL = 1.0 / 30
+
+
+class TrackedFrames:
+    """
+    Результаты потока трекинга для потока плеера.
+    Разметка копится по порядку и забирается целиком; кадр для показа -
+    только последний (как в FrameMailbox).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results = []
+        self._frame = None
+
+    def post(self, frame_idx: int, bbox, confidence):
+        with self._lock:
+            self._results.append((frame_idx, bbox, confidence))
+
+    def post_frame(self, cv_img, frame_idx: int, bbox):
+        with self._lock:
+            self._frame = (cv_img, frame_idx, bbox)
+
+    def take(self):
+        """([(frame_idx, bbox, confidence), ...], (cv_img, frame_idx, bbox) или None)"""
+        with self._lock:
+            results, self._results = self._results, []
+            frame, self._frame = self._frame, None
+            return results, frame
+
+
+class TrackingWorker(QThread):
+    """
+    Трекинг в отдельном потоке, независимо от показа видео.
+
+    У потока свой захват из пула и свой буфер декодирования, поэтому
+    скорость трекера не ограничивает плеер, а декодирование идет
+    параллельно с трекером. Кадры обрабатываются подряд начиная
+    со start_frame, пока поток не остановят, не кончится видео
+    или трекер не потеряет объект.
+
+    Трекер должен быть инициализирован на кадре start_frame - 1;
+    пока поток работает, трекер принадлежит ему. Разметка и кадры для показа
+    не пишутся в общее состояние плеера, а кладутся в results (TrackedFrames):
+    их забирает поток плеера.
+    """
+
+    # Последний кадр, до которого дошел трекинг
+    progress_changed = Signal(int)
+
+    def __init__(self, video_path, tracker, start_frame: int, keyframe_index=None,
+                 results: TrackedFrames = None):
+        super().__init__()
+        self.video_path = video_path
+        self.tracker = tracker
+        self.start_frame = max(0, start_frame)
+        self.keyframe_index = keyframe_index
+        # (кадр, bbox, уверенность трекера или None) по порядку + последний кадр для показа
+        self.results = results if results is not None else TrackedFrames()
+        # Отдавать ли кадры для показа (турбо-режим); можно менять на ходу
+        self.show_frames = False
+
+        self.last_tracked = self.start_frame - 1
+        self.lost_at = None
+        self.reached_end = False
+        self._run_flag = True
+
+    def run(self):
+        info = reader_pool.probe(self.video_path)
+        cap = reader_pool.acquire(self.video_path)
+        reader = DecodeAheadReader(cap, DECODE_AHEAD_FRAMES, (info.height, info.width, 3))
+        reader.set_keyframe_index(self.keyframe_index)
+        reader.seek(self.start_frame)
+        reader.start()
+
+        last_progress = 0.0
+        last_show = 0.0
+        try:
+            # YOLO обрабатывает кадры пачками (один проход сети на пачку)
+            for frame_idx, cv_img, success, bbox, confidence in track_batches(reader, self.tracker):
+                if not self._run_flag:
+                    break
+                if not success:
+                    self.lost_at = frame_idx
+                    break
+
+                self.results.post(frame_idx, bbox, confidence)
+                self.last_tracked = frame_idx
+
+                now = time.monotonic()
+                if self.show_frames and now - last_show >= SHOW_FRAME_INTERVAL:
+                    last_show = now
+                    # Кадр из кольцевого буфера будет перезаписан декодером - отдается копия
+                    self.results.post_frame(cv_img.copy(), frame_idx, bbox)
+
+                if now - last_progress >= PROGRESS_INTERVAL:
+                    last_progress = now
+                    self.progress_changed.emit(frame_idx)
+            else:
+                self.reached_end = True
+        finally:
+            reader.stop()
+            reader_pool.release(self.video_path, cap)
+
+        self.progress_changed.emit(self.last_tracked)
+
+    def stop(self):
+        """Останавливает трекинг и ждет завершения потока"""
+        self._run_flag = False
+        self.wait()